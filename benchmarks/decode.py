@@ -0,0 +1,30 @@
+import json
+import timeit
+
+from twitfetch._json import JSON_BACKENDS, get_decoder
+from benchmarks.parse import build_response
+
+def main() -> None:
+    """
+    Time decoding timeline bodies with every installed JSON backend against the stdlib.
+    """
+
+    for entries in (20, 200, 2000):
+        body = json.dumps(build_response(entries=entries)).encode()
+        number = max(1, 2000 // entries)
+
+        timings = {}
+        for backend in JSON_BACKENDS:
+            try:
+                decode = get_decoder(backend=backend)
+            except ImportError:
+                continue
+            timings[backend] = timeit.timeit(lambda: decode(body), number=number) / number
+
+        print(f'{entries:>5} entries  {len(body) / 1024:8.1f} KB  ' + '  '.join(
+            f'{backend} {seconds * 1000:7.2f} ms ({timings["json"] / seconds:.1f}x)'
+            for backend, seconds in timings.items()
+        ))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import copy
+import json
+import os
+import timeit
+
+from twitfetch._constants import GeneralKeys
+from twitfetch._parse import parse_tweets_response
+from twitfetch._utils import find_key_in_dict
+
+FIXTURE = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    'tests', 'fixtures', 'elonmusk', 'UserTweets', 'initial.json'
+)
+
+def build_response(entries: int, first_id: int = 10 ** 18) -> dict:
+    """
+    Build a UserTweets response holding a given number of tweet entries by repeating
+    the entries of a recorded page with fresh tweet IDs, counting down from first_id.
+    """
+
+    with open(FIXTURE) as f:
+        response = json.load(f)
+
+    timeline = response['data']['user']['result']['timeline_v2']['timeline']
+    add_entries = timeline['instructions'][-1]
+    templates = [e for e in add_entries['entries'] if e['entryId'].startswith('tweet-')]
+
+    built = []
+    for i in range(entries):
+        entry = copy.deepcopy(templates[i % len(templates)])
+        result = entry['content']['itemContent']['tweet_results']['result']
+        result['rest_id'] = result['legacy']['id_str'] = str(first_id - i)
+        built.append(entry)
+
+    add_entries['entries'] = built + [e for e in add_entries['entries'] if e['entryId'].startswith('cursor-')]
+    return response
+
+def walk_every_legacy(response: dict) -> int:
+    """
+    Previous approach: search the whole response for instructions, entries and every legacy key.
+    """
+
+    count = 0
+    instructions = find_key_in_dict(obj=response, key=GeneralKeys.INSTRUCTIONS)
+    for entry in find_key_in_dict(obj=instructions, key=GeneralKeys.ENTRIES):
+        count += len(find_key_in_dict(obj=entry, key=GeneralKeys.LEGACY))
+    return count
+
+def main() -> None:
+    """
+    Time the targeted parser against full walks of the response on small, typical and huge pages.
+    """
+
+    for entries in (20, 200, 2000):
+        response = build_response(entries=entries)
+        number = max(1, 2000 // entries)
+
+        walk = timeit.timeit(lambda: walk_every_legacy(response), number=number) / number
+        parse = timeit.timeit(
+            lambda: parse_tweets_response(tweets=[response], users=['elonmusk'], do_remove_retweets=True),
+            number=number
+        ) / number
+
+        print(
+            f'{entries:>5} entries  '
+            f'legacy walk {walk * 1000:8.2f} ms  '
+            f'targeted parse {parse * 1000:8.2f} ms  '
+            f'({walk / parse:.1f}x)'
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+from typing import Callable, Dict, List, Optional
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from playwright.sync_api import sync_playwright
+
+from twitfetch._constants import Endpoints, GeneralKeys
+from twitfetch._data_structures import GraphQLOperation
+from twitfetch._graphql import GraphQLClient, GraphQLSession
+from twitfetch._parse import parse_tweets_response
+from twitfetch._replay import fixture_key, StandInServer
+from twitfetch._utils import find_key_in_dict, parse_json
+from benchmarks.parse import build_response
+
+# Timeline sizes in tweet entries per page
+SIZES = {'small': 20, 'typical': 200, 'huge': 2000}
+
+# Pages of the paginated fetch benchmark
+FETCH_PAGES = 10
+
+class RecordedResponse:
+    """
+    Recorded GraphQL body exposing the parts of a playwright Response parse_json reads.
+    """
+    def __init__(self, url: str, body: bytes):
+        self.url = url
+        self._body = body
+
+    def body(self) -> bytes:
+        return self._body
+
+def measure(call: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """
+    Time a call and trace the peak memory it allocates.
+
+    Returns:
+        Dict[str, float]: The best wall time in seconds out of the repeats and the peak bytes.
+    """
+
+    call()
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'seconds': best, 'peak_bytes': peak}
+
+def _write_timeline(directory: str, entries: int) -> None:
+    """
+    Write a UserTweets timeline of FETCH_PAGES pages chained by bottom cursors, followed
+    by a page without tweets pointing back to itself.
+    """
+
+    operation_dir = os.path.join(directory, Endpoints.UserTweets.value)
+    os.makedirs(operation_dir)
+
+    cursor = None
+    for page in range(FETCH_PAGES + 1):
+        response = build_response(
+            entries=entries if page < FETCH_PAGES else 0,
+            first_id=10 ** 18 - page * entries
+        )
+
+        next_cursor = f'page-{page + 1}' if page < FETCH_PAGES else cursor
+        for entry in find_key_in_dict(obj=response, key=GeneralKeys.ENTRIES)[0]:
+            if entry[GeneralKeys.ENTRY_ID].startswith('cursor-bottom'):
+                entry[GeneralKeys.CONTENT][GeneralKeys.VALUE] = next_cursor
+
+        with open(os.path.join(operation_dir, f'{fixture_key(cursor)}.json'), 'w') as f:
+            json.dump(response, f)
+        cursor = next_cursor
+
+def _session() -> GraphQLSession:
+    session = GraphQLSession()
+    session.bearer_token = 'Bearer AAAA'
+    session.csrf_token = 'csrf'
+    session.operations[Endpoints.UserTweets.value] = GraphQLOperation(
+        name=Endpoints.UserTweets.value,
+        query_id='V7H0Ap3_Hh2FyS75OCDO3Q',
+        variables={'count': 20},
+        features={}
+    )
+    return session
+
+def run_parse(repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Benchmark finding keys, decoding and parsing single pages of every size.
+    """
+
+    results = {}
+
+    for size, entries in SIZES.items():
+        response = build_response(entries=entries)
+        recorded = [RecordedResponse(url='UserTweets', body=json.dumps(response).encode())]
+
+        results[f'find_key_in_dict/{size}'] = measure(
+            lambda: find_key_in_dict(obj=response, key=GeneralKeys.LEGACY), repeat=repeat
+        )
+        results[f'parse_json/{size}'] = measure(lambda: parse_json(responses=recorded), repeat=repeat)
+        results[f'parse_tweets_response/{size}'] = measure(
+            lambda: parse_tweets_response(tweets=[response], users=['elonmusk'], do_remove_retweets=True),
+            repeat=repeat
+        )
+
+    return results
+
+def run_fetch(repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Benchmark paginated fetches against the stand-in GraphQL API, from request to parsed tweets.
+    """
+
+    results = {}
+    playwright = sync_playwright().start()
+    request = playwright.request.new_context()
+
+    try:
+        for size, entries in SIZES.items():
+            with tempfile.TemporaryDirectory() as directory:
+                _write_timeline(directory=directory, entries=entries)
+
+                with StandInServer(directory, rate_limit=10 ** 9) as server:
+                    client = GraphQLClient(request=request, session=_session(), base_url=server.url)
+
+                    def fetch() -> None:
+                        pages = client.pages(endpoint=Endpoints.UserTweets, variables={'userId': '44196397'})
+                        for page in pages:
+                            parse_tweets_response(tweets=[page], users=['elonmusk'], do_remove_retweets=True)
+
+                    results[f'paginated_fetch/{size}'] = measure(fetch, repeat=repeat)
+    finally:
+        request.dispose()
+        playwright.stop()
+
+    return results
+
+def run_login(replay_dir: str, username: str, password: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Benchmark logging in against a recorded session, requires Chromium.
+    """
+
+    from twitfetch.fetch import TwitFetch
+
+    def login() -> None:
+        TwitFetch(
+            login_username=username,
+            login_password=password,
+            headless=True,
+            replay_dir=replay_dir
+        ).close()
+
+    return {'login': measure(login, repeat=repeat)}
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float
+) -> List[str]:
+    """
+    Find the benchmarks that got slower or allocate more than the tolerance allows.
+    """
+
+    regressions = []
+
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+
+        for metric in ('seconds', 'peak_bytes'):
+            before, after = baseline[name][metric], result[metric]
+            if before and after > before * (1 + tolerance):
+                regressions.append(f'{name} {metric}: {before:.6g} -> {after:.6g} (+{after / before - 1:.0%})')
+
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the benchmark suite, optionally saving results or checking them against a baseline.
+    """
+
+    parser = argparse.ArgumentParser(description='Benchmark the parse and fetch pipeline.')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--save', help='write the results to a JSON file')
+    parser.add_argument('--compare', help='compare against results saved earlier')
+    parser.add_argument('--tolerance', type=float, default=0.1)
+    parser.add_argument('--replay-dir', help='recorded session to benchmark logging in against')
+    parser.add_argument('--username')
+    parser.add_argument('--password')
+    args = parser.parse_args(argv)
+
+    results = run_parse(repeat=args.repeat)
+    results.update(run_fetch(repeat=args.repeat))
+    if args.replay_dir is not None:
+        results.update(run_login(
+            replay_dir=args.replay_dir,
+            username=args.username,
+            password=args.password,
+            repeat=args.repeat
+        ))
+
+    for name, result in results.items():
+        print(f"{name:<32} {result['seconds'] * 1000:10.3f} ms  {result['peak_bytes'] / 1024:10.1f} KB peak")
+
+    if args.save is not None:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            regressions = compare(results=results, baseline=json.load(f), tolerance=args.tolerance)
+
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if regressions:
+            return 1
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+from datetime import datetime
+import timeit
+
+from twitfetch._timestamps import parse_created_at, snowflake_to_datetime, TimeWindow
+
+CREATED = 'Mon Nov 20 18:30:00 +0000 2023'
+TWEET_ID = 1726669233976246272
+
+def main() -> None:
+    """
+    Time creation date parsing with strptime against the fixed format parser and the
+    snowflake decoder, and per-tweet datetime comparisons against ID windows on a page.
+    """
+
+    number = 100000
+
+    timings = {
+        'strptime': lambda: datetime.strptime(CREATED, '%a %b %d %H:%M:%S %z %Y'),
+        'parse_created_at': lambda: parse_created_at(created=CREATED),
+        'snowflake_to_datetime': lambda: snowflake_to_datetime(tweet_id=TWEET_ID)
+    }
+    for name, call in timings.items():
+        seconds = timeit.timeit(call, number=number) / number
+        print(f'{name:<22} {seconds * 1e6:6.2f} us per tweet')
+
+    ids = [TWEET_ID - i * (1 << 32) for i in range(20)]
+    created = [snowflake_to_datetime(tweet_id=tweet_id) for tweet_id in ids]
+    time_start, time_end = created[-1], created[0]
+    window = TimeWindow(time_start=time_start, time_end=time_end)
+
+    # Both sides select the tweets within the window and tell whether the page passed its start
+    compare = timeit.timeit(
+        lambda: ([i for i, c in enumerate(created) if time_start <= c <= time_end], min(created) < time_start),
+        number=number // 10
+    ) / (number // 10)
+    select = timeit.timeit(lambda: window.select(tweet_ids=ids), number=number // 10) / (number // 10)
+    print(f'20 tweet page window    datetimes {compare * 1e6:6.2f} us  IDs {select * 1e6:6.2f} us')
+
+if __name__ == "__main__":
+    main()
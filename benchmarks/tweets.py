@@ -0,0 +1,64 @@
+from dataclasses import dataclass
+import gc
+import tracemalloc
+from typing import Callable
+
+from twitfetch._parse import parse_tweets_batch, parse_tweets_response
+from benchmarks.parse import build_response
+
+@dataclass
+class DictTweet:
+    """
+    Previous representation: a plain dataclass with string IDs and an ISO creation string.
+    """
+
+    user_name: str
+    user_id: str
+    tweet_id: str
+    created: str
+    content: str
+
+def measure(build: Callable[[], object]) -> int:
+    """
+    Bytes still allocated by the object returned from a build function.
+    """
+
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return size
+
+def main() -> None:
+    """
+    Compare the memory held per tweet by each representation, contents and user names being
+    shared with the response so only the per-tweet overhead is counted.
+    """
+
+    entries = 50000
+    pages = [build_response(entries=entries)]
+    tweets = parse_tweets_response(tweets=pages, users=['elonmusk'])
+
+    representations = {
+        'dict dataclass': lambda: [
+            DictTweet(
+                user_name=tweet.user_name,
+                user_id=str(tweet.user_id),
+                tweet_id=str(tweet.tweet_id),
+                created=tweet.created.isoformat(),
+                content=str(tweet.content)
+            )
+            for tweet in tweets
+        ],
+        'slotted Tweet': lambda: parse_tweets_response(tweets=pages, users=['elonmusk']),
+        'TweetBatch': lambda: parse_tweets_batch(tweets=pages, users=['elonmusk'])
+    }
+
+    for name, build in representations.items():
+        size = measure(build=build)
+        print(f'{name:<15} {size / len(tweets):8.1f} bytes per tweet')
+
+if __name__ == "__main__":
+    main()
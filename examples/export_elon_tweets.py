@@ -0,0 +1,33 @@
+import json
+
+from twitfetch import JSONLSink, SQLiteSink
+from twitfetch.fetch import TwitFetch
+
+def main(username: str, password: str) -> None:
+    """
+    Export Elon Musk's latest Tweets to a JSONL file and a SQLite database.
+    """
+
+    twit_fetch = TwitFetch(
+        login_username=username,
+        login_password=password,
+        tweet_limit=1000
+    )
+
+    # Tweets are written page by page, the SQLite table never holds a tweet twice
+    with JSONLSink('elonmusk.jsonl') as jsonl, SQLiteSink('tweets.db') as sqlite:
+        exported = twit_fetch.export_user_tweets(account='elonmusk', sinks=[jsonl, sqlite])
+
+    twit_fetch.close()
+    print(f'exported {exported} tweets')
+
+if __name__ == "__main__":
+
+    # Load in username and password from config.json
+    with open('config.json') as f:
+        config = json.load(f)
+
+    main(
+        username=config['username'],
+        password=config['password']
+    )
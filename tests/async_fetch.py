@@ -0,0 +1,315 @@
+from unittest import mock
+import asyncio
+import json
+import os
+import time
+import unittest
+
+from playwright.async_api import TimeoutError, async_playwright
+
+from twitfetch.async_fetch import AsyncTwitFetch
+from twitfetch._async_browser import AsyncPlaywrightBrowser
+from twitfetch.errors import GraphQLRequestError, InvalidLoginError, LoginTimeoutError
+from twitfetch._parse import find_next_cursor
+from twitfetch._ratelimit import RateLimiter
+from tests.stand_in import FIXTURES, StandInAsyncDOMPage, StandInServer
+
+class _Expectation:
+    """
+    Stand-in for the response expectation of a playwright page.
+    """
+    def __init__(self, page):
+        self._page = page
+
+    async def __aenter__(self) -> '_Expectation':
+        self._page.response = None
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        pass
+
+    @property
+    async def value(self):
+        if self._page.response is None:
+            raise TimeoutError('no timeline page was requested')
+        return self._page.response
+
+class StandInPage:
+    """
+    Stand-in for a playwright page whose timeline pages are requested from a stand-in
+    server, the next page being requested on every scroll.
+    """
+    def __init__(self, request, url: str, csrf_token: str):
+        self._request = request
+        self._url = url
+        self._csrf_token = csrf_token
+        self._cursor = None
+        self._last = None
+        self.response = None
+
+    def expect_response(self, matches, timeout):
+        return _Expectation(page=self)
+
+    async def load(self, first: bool) -> None:
+        # A rejected page is requested again with the same cursor
+        if not first and self._last.status == 200:
+            body = json.loads(await self._last.body())
+            self._cursor = find_next_cursor(response=body, cursor=self._cursor)
+            if self._cursor is None:
+                return
+
+        variables = {'userId': '44196397', 'count': 20}
+        if self._cursor is not None:
+            variables['cursor'] = self._cursor
+
+        self._last = await self._request.get(
+            f'{self._url}/V7H0Ap3_Hh2FyS75OCDO3Q/UserTweets',
+            params={'variables': json.dumps(variables)},
+            headers={'authorization': 'Bearer AAAA', 'x-csrf-token': self._csrf_token}
+        )
+        self.response = self._last
+
+class StandInAsyncBrowser:
+    """
+    Stand-in for the async browser of an AsyncTwitFetch, opening stand-in pages.
+    """
+    def __init__(self, request, url: str, csrf_token: str = 'csrf'):
+        self._request = request
+        self._url = url
+        self._csrf_token = csrf_token
+
+    async def new_page(self) -> StandInPage:
+        return StandInPage(request=self._request, url=self._url, csrf_token=self._csrf_token)
+
+    async def close_page(self, page) -> None:
+        pass
+
+    async def go_to_page(self, url, page, wait_for_tweet=False) -> None:
+        await page.load(first=True)
+
+    async def scroll_down(self, page, to_bottom=False) -> None:
+        await page.load(first=False)
+
+class StandInLoginBrowser:
+    """
+    Stand-in for the async browser of an AsyncTwitFetch logging in, on a page rendering the
+    page sources given, one per input typed into.
+    """
+    def __init__(self, *page_sources: str):
+        self._page_sources = list(page_sources)
+        self.page = StandInAsyncDOMPage(page_source=self._page_sources.pop(0))
+        self.typed = []
+
+    async def go_to_page(self, url) -> None:
+        pass
+
+    async def wait_for_element(self, selector, timeout) -> None:
+        pass
+
+    async def mark_element(self, selector, marker) -> None:
+        pass
+
+    async def type_input(self, text, selector) -> None:
+        self.typed.append((text, selector))
+
+    async def wait_for_change(self, gone, present, timeout) -> None:
+        self.page = StandInAsyncDOMPage(page_source=self._page_sources.pop(0))
+
+class StandInClosable:
+    """
+    Stand-in for a playwright object being closed or stopped, failing if told to.
+    """
+    def __init__(self, fail: bool = False):
+        self._fail = fail
+        self.closed = 0
+
+    async def close(self) -> None:
+        self.closed += 1
+        if self._fail:
+            raise RuntimeError('target closed')
+
+    async def stop(self) -> None:
+        await self.close()
+
+class StandInStartingBrowser:
+    """
+    Stand-in for the async browser of an AsyncTwitFetch being started, recording its closing.
+    """
+    def __init__(self, **options):
+        self.closed = False
+
+    async def start(self) -> None:
+        pass
+
+    async def clear_storage_state(self) -> None:
+        pass
+
+    async def exit_browser(self) -> None:
+        self.closed = True
+
+class TestAsyncLogin(unittest.TestCase):
+    """
+    Test logging in asynchronously on a stand-in browser.
+    """
+
+    def _login(self, *page_sources: str) -> tuple:
+        """
+        Login on pages rendering the page sources given, returning the browser and the error.
+        """
+
+        fetch = AsyncTwitFetch(login_username='user', login_password='password')
+        fetch._browser = StandInLoginBrowser(*page_sources)
+
+        try:
+            asyncio.run(fetch.twitter_login())
+        except Exception as e:
+            return fetch._browser, e
+        return fetch._browser, None
+
+    def test_login(self):
+        """
+        This test case checks that the username and password are typed into the inputs found.
+        """
+
+        browser, error = self._login(
+            '<input class="r-30o5oe  username">',
+            '<input class="r-30o5oe password">',
+            '<div></div>'
+        )
+
+        self.assertIsNone(error)
+        self.assertEqual(
+            browser.typed,
+            [('user', 'input[class="r-30o5oe username"]'), ('password', 'input[class="r-30o5oe password"]')]
+        )
+
+    def test_login_errors(self):
+        """
+        This test case checks that an alert raises the invalid login and a missing input the
+        login timeout.
+        """
+
+        browser, error = self._login('<input class="username">', '<div role="alert">Wrong</div>')
+        self.assertIsInstance(error, InvalidLoginError)
+
+        browser, error = self._login('<div></div>')
+        self.assertIsInstance(error, LoginTimeoutError)
+        self.assertEqual(browser.typed, [])
+
+    def test_failed_start_closes(self):
+        """
+        This test case checks that the browser is closed again when the login fails on start.
+        """
+
+        browsers = []
+
+        def launch(**options):
+            browsers.append(StandInStartingBrowser(**options))
+            return browsers[-1]
+
+        async def enter():
+            async with AsyncTwitFetch(login_username='user', login_password='password'):
+                pass
+
+        with mock.patch('twitfetch.async_fetch.AsyncPlaywrightBrowser', launch), \
+                mock.patch.object(AsyncTwitFetch, 'twitter_login', side_effect=InvalidLoginError()):
+            with self.assertRaises(InvalidLoginError):
+                asyncio.run(enter())
+
+        self.assertTrue(browsers[0].closed)
+
+    def test_exit_half_started_browser(self):
+        """
+        This test case checks that a browser closes whatever was started, even when closing
+        its context fails, and that closing twice does nothing.
+        """
+
+        browser = AsyncPlaywrightBrowser()
+        browser.context, browser.browser, browser._playwright = None, StandInClosable(), StandInClosable()
+        chromium, playwright = browser.browser, browser._playwright
+
+        asyncio.run(browser.exit_browser())
+        asyncio.run(browser.exit_browser())
+        self.assertEqual((chromium.closed, playwright.closed), (1, 1))
+
+        browser.context, browser.browser, browser._playwright = StandInClosable(fail=True), chromium, playwright
+        with self.assertRaises(RuntimeError):
+            asyncio.run(browser.exit_browser())
+        self.assertEqual((chromium.closed, playwright.closed), (2, 2))
+
+class TestAsyncTwitFetch(unittest.TestCase):
+    """
+    Test scrolling through timelines asynchronously against a stand-in GraphQL server.
+    """
+
+    def _fetch(self, server: StandInServer, csrf_token: str = 'csrf') -> tuple:
+        """
+        Load the user timeline served by a stand-in server, returning the tweets or the error.
+        """
+
+        async def run():
+            async with async_playwright() as playwright:
+                request = await playwright.request.new_context()
+
+                # The clock runs ahead of the announced resets, so nothing waits for a window
+                fetch = AsyncTwitFetch(
+                    login_username='user',
+                    login_password='password',
+                    tweet_limit=1000,
+                    rate_limiter=RateLimiter(backoff_base=0.01, clock=lambda: time.time() + 10)
+                )
+                fetch._browser = StandInAsyncBrowser(request=request, url=server.url, csrf_token=csrf_token)
+
+                try:
+                    return await fetch.user_tweets(account='elonmusk'), None
+                except Exception as e:
+                    return None, e
+                finally:
+                    await request.dispose()
+
+        return asyncio.run(run())
+
+    def test_scroll_through_timeline(self):
+        """
+        This test case checks that every page of a timeline is loaded until the timeline ends.
+        """
+
+        with StandInServer(os.path.join(FIXTURES, 'elonmusk')) as server:
+            tweets, error = self._fetch(server=server)
+
+        self.assertIsNone(error)
+        self.assertEqual(len(server.requests), 3)
+        self.assertTrue(tweets)
+        self.assertEqual(len({tweet.tweet_id for tweet in tweets}), len(tweets))
+
+    def test_rate_limited_page_retried(self):
+        """
+        This test case checks that a rate limited page is requested again rather than parsed.
+        """
+
+        with StandInServer(os.path.join(FIXTURES, 'elonmusk')) as server:
+            expected, _ = self._fetch(server=server)
+
+        with StandInServer(os.path.join(FIXTURES, 'elonmusk'), rate_limited=1) as server:
+            tweets, error = self._fetch(server=server)
+
+        self.assertIsNone(error)
+        self.assertEqual(len(server.requests), 4)
+        self.assertNotIn('cursor', server.requests[1])
+        self.assertEqual(tweets, expected)
+
+    def test_rejected_page_raises(self):
+        """
+        This test case checks that a page rejected for another reason than the rate limit
+        raises rather than being parsed as an empty page.
+        """
+
+        with StandInServer(os.path.join(FIXTURES, 'elonmusk')) as server:
+            tweets, error = self._fetch(server=server, csrf_token='')
+
+        self.assertIsNone(tweets)
+        self.assertIsInstance(error, GraphQLRequestError)
+        self.assertEqual(error.error_code, 403)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,222 @@
+from unittest import mock
+import threading
+import unittest
+
+from playwright.sync_api import TimeoutError
+
+from twitfetch.errors import PageLoadTimeoutError
+from twitfetch._browser import PlaywrightBrowser
+from twitfetch._browser_manager import BrowserManager, shared_browser_manager
+from twitfetch._profile import BrowserProfile
+
+class StandInContext:
+    """
+    Stand-in for a playwright browser context.
+    """
+    def __init__(self, storage_state=None, record_har_path=None):
+        self.storage_state = storage_state
+        self.record_har_path = record_har_path
+        self.pages = [StandInPage(), StandInPage()]
+        self.closed = False
+
+    def new_page(self):
+        return StandInPage()
+
+    def close(self):
+        self.closed = True
+
+class StandInPage:
+    """
+    Stand-in for a playwright page, recording the timeouts it is given. Loads finish unless
+    the page is told to hang.
+    """
+    def __init__(self, hang: bool = False):
+        self.url = 'about:blank'
+        self.hang = hang
+        self.timeouts = []
+        self.keyboard = mock.Mock()
+        self.closed = False
+
+    def goto(self, url, wait_until, timeout):
+        self.timeouts.append(timeout)
+        if self.hang:
+            raise TimeoutError('page.goto: Timeout exceeded')
+        self.url = url
+
+    def wait_for_load_state(self, state, timeout):
+        self.timeouts.append(timeout)
+        if self.hang:
+            raise TimeoutError('page.wait_for_load_state: Timeout exceeded')
+
+    def type(self, selector, text):
+        pass
+
+    def close(self):
+        self.closed = True
+
+class StandInBrowser:
+    """
+    Stand-in for Chromium, launched or connected to over CDP.
+    """
+    def __init__(self, **options):
+        self.options = options
+        self.closed = False
+
+    def new_context(self, storage_state=None, record_har_path=None):
+        return StandInContext(storage_state=storage_state, record_har_path=record_har_path)
+
+    def close(self):
+        self.closed = True
+
+class StandInPlaywright:
+    """
+    Stand-in for the Playwright driver, counting the browsers it launches.
+    """
+    def __init__(self):
+        self.chromium = self
+        self.launched = []
+        self.stopped = False
+
+    def start(self):
+        return self
+
+    def launch(self, headless, args):
+        self.launched.append(StandInBrowser(headless=headless, args=args))
+        return self.launched[-1]
+
+    def connect_over_cdp(self, endpoint_url):
+        self.launched.append(StandInBrowser(cdp_url=endpoint_url))
+        return self.launched[-1]
+
+    def stop(self):
+        self.stopped = True
+
+class TestBrowserManager(unittest.TestCase):
+    """
+    Test sharing one browser between fetchers and keeping contexts warm.
+    """
+
+    def setUp(self):
+        self._playwright = StandInPlaywright()
+        patcher = mock.patch('twitfetch._browser_manager.sync_playwright', return_value=self._playwright)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_launch_once(self):
+        """
+        This test case checks that Chromium is launched once with the switches of the manager,
+        or connected to over CDP, and stopped on close.
+        """
+
+        profile = BrowserProfile()
+        manager = BrowserManager(headless=True, profile=profile)
+
+        browser = manager.start()
+        self.assertIs(manager.start(), browser)
+        self.assertEqual(browser.options, {'headless': True, 'args': list(profile.launch_args)})
+
+        context = manager.new_context(storage_state={'cookies': []}, record_har='run.har')
+        self.assertEqual((context.storage_state, context.record_har_path), ({'cookies': []}, 'run.har'))
+
+        manager.close()
+        self.assertTrue(browser.closed)
+        self.assertTrue(self._playwright.stopped)
+        self.assertIsNone(manager.browser)
+
+        with BrowserManager(cdp_url='http://localhost:9222') as connected:
+            self.assertEqual(connected.browser.options, {'cdp_url': 'http://localhost:9222'})
+        self.assertEqual(len(self._playwright.launched), 2)
+
+    def test_warm_contexts(self):
+        """
+        This test case checks that contexts released under a key are handed out again with
+        their pages closed, and that the least recently released ones are closed first.
+        """
+
+        manager = BrowserManager(max_warm=2)
+        first, second, third, replaced = (manager.new_context() for _ in range(4))
+
+        manager.release(context=first, key='first')
+        self.assertTrue(all(page.closed for page in first.pages))
+        self.assertFalse(first.closed)
+
+        manager.release(context=second, key='second')
+        manager.release(context=third, key='third')
+        self.assertTrue(first.closed)
+        self.assertIsNone(manager.acquire(key='first'))
+
+        # Releasing under a key already held closes the previous context
+        manager.release(context=replaced, key='second')
+        self.assertTrue(second.closed)
+        self.assertIs(manager.acquire(key='second'), replaced)
+        self.assertIsNone(manager.acquire(key='second'))
+
+        # Contexts released without a key are closed
+        throwaway = manager.new_context()
+        manager.release(context=throwaway)
+        self.assertTrue(throwaway.closed)
+
+        manager.close()
+        self.assertTrue(third.closed)
+
+    def test_shared_per_thread(self):
+        """
+        This test case checks that threads get a shared manager of their own per launch options.
+        """
+
+        manager = shared_browser_manager(headless=True)
+        self.assertIs(shared_browser_manager(headless=True), manager)
+        self.assertIsNot(shared_browser_manager(headless=False), manager)
+
+        others = []
+        thread = threading.Thread(target=lambda: others.append(shared_browser_manager(headless=True)))
+        thread.start()
+        thread.join()
+        self.assertIsNot(others[0], manager)
+
+class TestPlaywrightBrowser(unittest.TestCase):
+    """
+    Test waiting for pages of a browser opened on a stand-in manager.
+    """
+
+    def test_load_timeouts(self):
+        """
+        This test case checks that pages are waited for with the timeout configured, and that
+        a page that never loads raises rather than being carried on with.
+        """
+
+        manager = mock.Mock(acquire=mock.Mock(return_value=None), new_context=lambda **options: StandInContext())
+        browser = PlaywrightBrowser(timeout=1500, manager=manager)
+
+        browser.go_to_page(url='https://twitter.com/home')
+        browser.type_input(text='user', selector='input')
+        self.assertEqual(browser.page.timeouts, [1500, 1500])
+
+        browser.page.hang = True
+        with self.assertRaises(PageLoadTimeoutError) as context:
+            browser.type_input(text='user', selector='input')
+        self.assertEqual(context.exception.additional_data, 'https://twitter.com/home')
+
+        with self.assertRaises(PageLoadTimeoutError) as context:
+            browser.go_to_page(url='https://twitter.com/i/flow/login')
+        self.assertEqual(str(context.exception), 'page load timed out: https://twitter.com/i/flow/login did not load within 1.5s')
+
+    def test_recycle_after_timelines(self):
+        """
+        This test case checks that the page is replaced after the number of timelines given,
+        other navigations not being counted.
+        """
+
+        manager = mock.Mock(acquire=mock.Mock(return_value=None), new_context=lambda **options: StandInContext())
+        browser = PlaywrightBrowser(manager=manager, recycle_after=2)
+        first = browser.page
+
+        for url in ('https://twitter.com/i/flow/login', 'https://twitter.com/home', 'https://twitter.com/home'):
+            browser.go_to_page(url=url)
+
+        self.assertEqual([browser.recycle_if_needed() for _ in range(3)], [False, False, True])
+        self.assertTrue(first.closed)
+        self.assertIsNot(browser.page, first)
+
+if __name__ == "__main__":
+    unittest.main()
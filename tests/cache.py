@@ -0,0 +1,101 @@
+import json
+import os
+import tempfile
+import unittest
+
+from twitfetch._cache import ResponseCache
+from twitfetch._parse import find_next_cursor
+from tests.stand_in import FIXTURES, fixture_key
+
+USER_TWEETS = os.path.join(FIXTURES, 'elonmusk', 'UserTweets')
+
+class TestResponseCache(unittest.TestCase):
+    """
+    Test caching decoded timeline pages.
+    """
+
+    def setUp(self):
+        self._now = 1000.0
+        self._opened = 0
+        self._loaded = 0
+
+    def _clock(self) -> float:
+        return self._now
+
+    def _timeline(self):
+        """
+        Walk the recorded UserTweets timeline as a fetch would.
+        """
+
+        self._opened += 1
+        cursor = None
+
+        while True:
+            with open(os.path.join(USER_TWEETS, f'{fixture_key(cursor)}.json')) as f:
+                page = [json.load(f)]
+            self._loaded += 1
+            yield page
+
+            cursor = find_next_cursor(response=page[-1], cursor=cursor)
+            if cursor is None:
+                return
+
+    def test_lru_and_ttl(self):
+        """
+        This test case checks that the least recently used page is evicted first and that
+        pages expire after the TTL.
+        """
+
+        cache = ResponseCache(ttl=60, max_entries=2, clock=self._clock)
+        cache.put(endpoint='UserTweets', source='elonmusk', cursor=None, page=[{'page': 0}])
+        cache.put(endpoint='UserTweets', source='elonmusk', cursor='a', page=[{'page': 1}])
+        self.assertEqual(cache.get(endpoint='UserTweets', source='ElonMusk', cursor=None), [{'page': 0}])
+
+        cache.put(endpoint='UserTweets', source='elonmusk', cursor='b', page=[{'page': 2}])
+        self.assertIsNone(cache.get(endpoint='UserTweets', source='elonmusk', cursor='a'))
+        self.assertEqual(cache.stats.evictions, 1)
+
+        self._now += 60
+        self.assertIsNone(cache.get(endpoint='UserTweets', source='elonmusk', cursor=None))
+        self.assertEqual((cache.stats.hits, cache.stats.misses, cache.stats.expired), (1, 2, 1))
+
+    def test_timeline_from_disk(self):
+        """
+        This test case checks that a timeline walked once is served from disk by another
+        cache within the TTL, and loaded again once stale.
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResponseCache(ttl=60, directory=directory, clock=self._clock)
+            first = list(cache.pages(endpoint='UserTweets', source='elonmusk', open_pages=self._timeline))
+
+            cache = ResponseCache(ttl=60, directory=directory, clock=self._clock)
+            second = list(cache.pages(endpoint='UserTweets', source='elonmusk', open_pages=self._timeline))
+
+            self.assertEqual(first, second)
+            self.assertEqual(self._opened, 1)
+            self.assertEqual(cache.stats.disk_hits, len(first))
+
+            self._now += 60
+            third = list(cache.pages(endpoint='UserTweets', source='elonmusk', open_pages=self._timeline))
+            self.assertEqual(third, first)
+            self.assertEqual(self._opened, 2)
+
+    def test_partial_miss(self):
+        """
+        This test case checks that pages served from the cache are not served twice when
+        a later page has to be loaded.
+        """
+
+        first = list(self._timeline())
+
+        # Only the first page is cached, so the walk falls back to the timeline after it
+        cache = ResponseCache(ttl=60, clock=self._clock)
+        cache.put(endpoint='UserTweets', source='elonmusk', cursor=None, page=first[0])
+
+        second = list(cache.pages(endpoint='UserTweets', source='elonmusk', open_pages=self._timeline))
+        self.assertEqual(second, first)
+        self.assertEqual(cache.stats.hits, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+
+from twitfetch._callback import endpoint_matcher, operation_name, ResponseCapture
+from twitfetch._constants import Endpoints
+from tests.graphql import URL_USER_TWEETS
+
+class StoredResponse:
+    """
+    Stand-in for a playwright response already received.
+    """
+    def __init__(self, url: str, status: int = 200, content: bytes = b'{}'):
+        self.url = url
+        self.status = status
+        self.headers = {}
+        self._content = content
+
+    def body(self) -> bytes:
+        return self._content
+
+class EventTarget:
+    """
+    Stand-in for a page emitting response events.
+    """
+    def __init__(self):
+        self.listeners = []
+
+    def on(self, event, handler):
+        self.listeners.append(handler)
+
+    def remove_listener(self, event, handler):
+        self.listeners.remove(handler)
+
+    def emit(self, response):
+        for handler in self.listeners:
+            handler(response)
+
+class TestResponseCapture(unittest.TestCase):
+    """
+    Test capturing the responses of a GraphQL operation.
+    """
+
+    def test_matching(self):
+        """
+        This test case checks that operations are matched by name rather than by substring.
+        """
+
+        replies_url = URL_USER_TWEETS.replace('/UserTweets?', '/UserTweetsAndReplies?')
+
+        self.assertEqual(operation_name(url=URL_USER_TWEETS), 'UserTweets')
+        self.assertIsNone(operation_name(url='https://twitter.com/elonmusk'))
+
+        matches = endpoint_matcher(endpoint=Endpoints.UserTweets)
+        self.assertTrue(matches(StoredResponse(url=URL_USER_TWEETS)))
+        self.assertFalse(matches(StoredResponse(url=replies_url)))
+
+    def test_scoped_and_bounded(self):
+        """
+        This test case checks that the listener only lives within the scope, that bodies
+        are copied and that the queue drops the oldest responses once full.
+        """
+
+        target = EventTarget()
+
+        with ResponseCapture(target=target, endpoint=Endpoints.UserTweets, max_pending=2) as capture:
+            self.assertEqual(len(target.listeners), 1)
+
+            target.emit(StoredResponse(url='https://twitter.com/elonmusk'))
+            for index in range(3):
+                target.emit(StoredResponse(url=URL_USER_TWEETS, content=f'{{"page": {index}}}'.encode()))
+            target.emit(StoredResponse(url=URL_USER_TWEETS, status=429))
+
+            captured = capture.drain()
+            self.assertEqual([response.status for response in captured], [200, 429])
+            self.assertEqual(captured[0].body(), b'{"page": 2}')
+            self.assertEqual(capture.drain(), [])
+
+        self.assertEqual(target.listeners, [])
+        self.assertEqual(
+            (capture.stats.matched, capture.stats.ignored, capture.stats.dropped, capture.stats.bytes_received),
+            (4, 1, 2, 33)
+        )
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,291 @@
+from types import SimpleNamespace
+from unittest import mock
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from twitfetch._cache import ResponseCache
+from twitfetch._constants import Endpoints
+from twitfetch._data_structures import CapturedResponse, CaptureStats
+from twitfetch._paginate import TimelinePaginator
+from twitfetch._parse import find_next_cursor
+from twitfetch._sinks import SQLiteSink
+from twitfetch._worker import TimelineWorker
+from twitfetch.errors import InvalidLoginError, LoginTimeoutError, ResponseDroppedError
+from twitfetch.fetch import TwitFetch
+from tests.stand_in import FIXTURES, fixture_key, offline_fetch, StandInBrowser, StandInDOMPage
+
+URL_USER_TWEETS = 'https://twitter.com/i/api/graphql/V7H0Ap3_Hh2FyS75OCDO3Q/UserTweets'
+
+def _timeline() -> list:
+    """
+    Load the recorded pages of the user timeline, following their cursors.
+    """
+
+    pages, cursor = [], None
+
+    while True:
+        with open(os.path.join(FIXTURES, 'elonmusk', 'UserTweets', f'{fixture_key(cursor)}.json')) as f:
+            page = json.load(f)
+        pages.append([page])
+
+        cursor = find_next_cursor(response=page, cursor=cursor)
+        if cursor is None:
+            return pages
+
+class StandInWorker:
+    """
+    Stand-in for a timeline worker finishing every timeline on its first poll, with the
+    source as its only tweet.
+    """
+    def __init__(self, page, **options):
+        self.page = page
+        self.source = None
+        self.tweets = []
+        self.error = None
+
+    def start(self, source, url, endpoint, users, paginator, timeout):
+        if source == 'broken':
+            raise RuntimeError('navigation failed')
+
+        self.source = source
+        self.tweets = [source]
+
+    def poll(self):
+        return True
+
+    def stop(self):
+        pass
+
+class StandInCapture:
+    """
+    Stand-in for the response capture of a timeline worker, handing out the responses queued.
+    The capture opened last is kept on the class.
+    """
+    opened = None
+
+    def __init__(self, target, endpoint, rate_limiter, metrics):
+        self.queued = []
+        self.stats = CaptureStats()
+
+    def open(self):
+        StandInCapture.opened = self
+        return self
+
+    def drain(self):
+        drained, self.queued = self.queued, []
+        return drained
+
+    def close(self):
+        pass
+
+class TestLogin(unittest.TestCase):
+    """
+    Test logging in on a stand-in browser.
+    """
+
+    def test_failed_login_closes(self):
+        """
+        This test case checks that the browser and the state store are closed again when
+        the login fails.
+        """
+
+        browsers = []
+
+        def launch(**options):
+            browsers.append(StandInBrowser(**options))
+            return browsers[-1]
+
+        with tempfile.TemporaryDirectory() as directory, \
+                mock.patch('twitfetch.fetch.PlaywrightBrowser', launch), \
+                mock.patch('twitfetch.fetch.HighWaterMarkStore') as store, \
+                mock.patch.object(TwitFetch, 'twitter_login', side_effect=InvalidLoginError()):
+            with self.assertRaises(InvalidLoginError):
+                TwitFetch(
+                    login_username='user',
+                    login_password='password',
+                    state_path=os.path.join(directory, 'state.db')
+                )
+
+        self.assertTrue(browsers[0].closed)
+        store.return_value.close.assert_called_once_with()
+
+    def test_missing_input(self):
+        """
+        This test case checks that a login input gone before it is typed into raises the
+        login timeout rather than an error of the browser.
+        """
+
+        fetch = offline_fetch()
+        fetch._browser = SimpleNamespace(
+            page=StandInDOMPage(page_source='<div></div>'),
+            go_to_page=lambda url: None,
+            wait_for_element=lambda selector, timeout: None,
+            type_input=mock.Mock()
+        )
+
+        with self.assertRaises(LoginTimeoutError) as context:
+            fetch.twitter_login()
+
+        self.assertEqual(context.exception.additional_data, 'username')
+        fetch._browser.type_input.assert_not_called()
+
+class TestTimelineWorkers(unittest.TestCase):
+    """
+    Test loading several timelines at once on a stand-in browser.
+    """
+
+    def test_results_per_account(self):
+        """
+        This test case checks that every account given gets a result of its own, in the order
+        given, duplicates included.
+        """
+
+        fetch = offline_fetch()
+
+        with mock.patch('twitfetch.fetch.TimelineWorker', StandInWorker):
+            results = fetch.user_tweets_many(accounts=['first', 'second', 'first', 'broken'], concurrency=2)
+
+        self.assertEqual([result.source for result in results], ['first', 'second', 'first', 'broken'])
+        self.assertEqual([result.tweets for result in results[:3]], [['first'], ['second'], ['first']])
+        self.assertIsNot(results[0], results[2])
+        self.assertIsInstance(results[3].error, RuntimeError)
+        fetch.close()
+
+    def test_cached_timelines(self):
+        """
+        This test case checks that timelines fresh in the cache are served without a page.
+        """
+
+        cache = ResponseCache()
+        list(cache.pages(endpoint='UserTweets', source='elonmusk', open_pages=lambda: (page for page in _timeline())))
+        fetch = offline_fetch(tweet_limit=100, cache=cache)
+
+        with mock.patch('twitfetch.fetch.TimelineWorker', StandInWorker):
+            results = fetch.user_tweets_many(accounts=['ElonMusk', 'other'])
+
+        expected = list(fetch._iter_tweets(
+            pages=(page for page in _timeline()), endpoint=Endpoints.UserTweets, users=['elonmusk']
+        ))
+        self.assertEqual(results[0].tweets, expected)
+        self.assertEqual(results[1].tweets, ['other'])
+        fetch.close()
+
+    def test_worker_caches_pages(self):
+        """
+        This test case checks that the pages a worker loads are cached like a fetch would.
+        """
+
+        cache = ResponseCache()
+        page = SimpleNamespace(goto=lambda url, **options: None, evaluate=lambda script: None)
+        worker = TimelineWorker(page=page, scroll_timeout=0, scroll_retries=0, cache=cache)
+        pages = _timeline()
+
+        with mock.patch('twitfetch._worker.ResponseCapture', StandInCapture):
+            worker.start(
+                source='elonmusk',
+                url='https://twitter.com/elonmusk',
+                endpoint=Endpoints.UserTweets,
+                users=['elonmusk'],
+                paginator=TimelinePaginator(tweet_limit=100),
+                timeout=20
+            )
+
+            for responses in pages:
+                StandInCapture.opened.queued = [
+                    CapturedResponse(url=URL_USER_TWEETS, status=200, content=json.dumps(response).encode())
+                    for response in responses
+                ]
+                self.assertFalse(worker.poll())
+
+            self.assertTrue(worker.poll())
+            worker.stop()
+
+        def reload():
+            raise AssertionError('the timeline was loaded again')
+
+        self.assertEqual(list(cache.pages(endpoint='UserTweets', source='elonmusk', open_pages=reload)), pages)
+        self.assertEqual(len(worker.tweets), 6)
+
+    def test_worker_fails_on_dropped_pages(self):
+        """
+        This test case checks that a timeline whose pages were dropped by the capture ends
+        with an error rather than skipping their tweets.
+        """
+
+        page = SimpleNamespace(goto=lambda url, **options: None, evaluate=lambda script: None)
+        worker = TimelineWorker(page=page, scroll_timeout=0, scroll_retries=0)
+        responses = _timeline()[0]
+
+        with mock.patch('twitfetch._worker.ResponseCapture', StandInCapture):
+            worker.start(
+                source='elonmusk',
+                url='https://twitter.com/elonmusk',
+                endpoint=Endpoints.UserTweets,
+                users=['elonmusk'],
+                paginator=TimelinePaginator(tweet_limit=100),
+                timeout=20
+            )
+
+            StandInCapture.opened.queued = [
+                CapturedResponse(url=URL_USER_TWEETS, status=200, content=json.dumps(response).encode())
+                for response in responses
+            ]
+            StandInCapture.opened.stats.dropped = 1
+
+            self.assertTrue(worker.poll())
+            worker.stop()
+
+        self.assertIsInstance(worker.error, ResponseDroppedError)
+        self.assertEqual(worker.tweets, [])
+
+class TestExport(unittest.TestCase):
+    """
+    Test streaming timelines to sinks on a stand-in browser.
+    """
+
+    def test_export_matches_iteration(self):
+        """
+        This test case checks that exporting writes the tweets iteration hands out, including
+        tweets without content, and advances the mark to the newest one.
+        """
+
+        pages = _timeline()
+        entry = pages[0][0]['data']['user']['result']['timeline_v2']['timeline']['instructions'][2]['entries'][2]
+        del entry['content']['itemContent']['tweet_results']['result']['legacy']['full_text']
+        mark_key = (Endpoints.UserTweets, 'elonmusk')
+
+        with tempfile.TemporaryDirectory() as directory:
+            fetch = offline_fetch(tweet_limit=100, state_path=os.path.join(directory, 'state.db'))
+
+            expected = list(fetch._iter_tweets(pages=(page for page in pages), endpoint=Endpoints.UserTweets, users=['elonmusk']))
+            self.assertIn('', [tweet.content for tweet in expected])
+
+            with SQLiteSink(os.path.join(directory, 'tweets.db')) as sink:
+                exported = fetch._export(
+                    pages=(page for page in pages),
+                    endpoint=Endpoints.UserTweets,
+                    users=['elonmusk'],
+                    sinks=[sink],
+                    mark_key=mark_key
+                )
+
+            connection = sqlite3.connect(os.path.join(directory, 'tweets.db'))
+            rows = connection.execute('SELECT tweet_id, created, content FROM tweets ORDER BY tweet_id DESC').fetchall()
+            connection.close()
+
+            self.assertEqual(exported, len(expected))
+            self.assertEqual(
+                rows,
+                [(tweet.tweet_id, int(tweet.created.timestamp()), tweet.content) for tweet in expected]
+            )
+            self.assertEqual(
+                fetch._state_store.get(endpoint='UserTweets', source='elonmusk').tweet_id,
+                expected[0].tweet_id
+            )
+            fetch.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import os
+import unittest
+
+from playwright.sync_api import sync_playwright
+
+from twitfetch.errors import GraphQLRequestError
+from twitfetch._constants import Endpoints
+from twitfetch._data_structures import GraphQLOperation
+from twitfetch._graphql import (
+    GraphQLClient,
+    GraphQLSession,
+    parse_operation
+)
+from tests.stand_in import FIXTURES, StandInServer
+
+URL_USER_TWEETS = (
+    'https://twitter.com/i/api/graphql/V7H0Ap3_Hh2FyS75OCDO3Q/UserTweets'
+    '?variables=%7B%22userId%22%3A%2244196397%22%2C%22count%22%3A20%7D'
+    '&features=%7B%22responsive_web_graphql_timeline_navigation_enabled%22%3Atrue%7D'
+)
+
+def _session() -> GraphQLSession:
+    """
+    Build a session as if captured from the Twitter app.
+    """
+
+    session = GraphQLSession()
+    session.bearer_token = 'Bearer AAAA'
+    session.csrf_token = 'csrf'
+    session.operations = {
+        Endpoints.UserByScreenName.value: GraphQLOperation(
+            name='UserByScreenName',
+            query_id='G3KGOASz96M-Qu0nwmGXNg',
+            variables={'withSafetyModeUserFields': True},
+            features={}
+        ),
+        Endpoints.UserTweets.value: parse_operation(url=URL_USER_TWEETS),
+        Endpoints.ListLatestTweetsTimeline.value: GraphQLOperation(
+            name='ListLatestTweetsTimeline',
+            query_id='2TemLyqrMpTeAmysdbnVqw',
+            variables={'count': 20},
+            features={}
+        )
+    }
+    return session
+
+class TestGraphQLClient(unittest.TestCase):
+    """
+    Test direct GraphQL requests against recorded responses.
+    """
+
+    def setUp(self):
+        self._playwright = sync_playwright().start()
+        self._request = self._playwright.request.new_context()
+
+    def tearDown(self):
+        self._request.dispose()
+        self._playwright.stop()
+
+    def test_parse_operation(self):
+        """
+        This test case checks that operation templates are extracted from request URLs.
+        """
+
+        operation = parse_operation(url=URL_USER_TWEETS)
+
+        self.assertEqual(operation.name, 'UserTweets')
+        self.assertEqual(operation.query_id, 'V7H0Ap3_Hh2FyS75OCDO3Q')
+        self.assertEqual(operation.variables, {'userId': '44196397', 'count': 20})
+        self.assertIsNone(parse_operation(url='https://twitter.com/elonmusk'))
+
+    def test_follow_cursors(self):
+        """
+        This test case checks that pages are requested until the timeline runs out.
+        """
+
+        with StandInServer(os.path.join(FIXTURES, 'elonmusk')) as server:
+            client = GraphQLClient(request=self._request, session=_session(), base_url=server.url)
+
+            user_id = client.user_id(screen_name='elonmusk')
+            pages = list(client.pages(endpoint=Endpoints.UserTweets, variables={'userId': user_id}))
+
+        self.assertEqual(user_id, '44196397')
+        self.assertEqual(len(pages), 3)
+
+        cursors = [request.get('cursor') for request in server.requests[1:]]
+        self.assertIsNone(cursors[0])
+        self.assertTrue(all(cursors[1:]))
+
+    def test_follow_list_cursors(self):
+        """
+        This test case checks that list timelines are paginated by list ID.
+        """
+
+        fixtures_dir = os.path.join(FIXTURES, 'list_1539453138322673664')
+        with StandInServer(fixtures_dir) as server:
+            client = GraphQLClient(request=self._request, session=_session(), base_url=server.url)
+            pages = list(client.pages(
+                endpoint=Endpoints.ListLatestTweetsTimeline,
+                variables={'listId': '1539453138322673664'}
+            ))
+
+        self.assertEqual(len(pages), 3)
+        self.assertTrue(all(request['listId'] == '1539453138322673664' for request in server.requests))
+
+    def test_missing_credentials(self):
+        """
+        This test case checks that rejected requests raise an error.
+        """
+
+        session = _session()
+        session.csrf_token = ''
+
+        with StandInServer(os.path.join(FIXTURES, 'elonmusk')) as server:
+            client = GraphQLClient(request=self._request, session=session, base_url=server.url)
+
+            with self.assertRaises(GraphQLRequestError):
+                client.user_id(screen_name='elonmusk')
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import os
+import time
+import unittest
+
+from playwright.sync_api import sync_playwright
+
+from twitfetch._graphql import GraphQLClient
+from twitfetch._metrics import Metrics, OpenTelemetryHook, timed
+from twitfetch._ratelimit import RateLimiter
+from tests.graphql import _session
+from tests.stand_in import FIXTURES, StandInServer
+
+class FakeInstrument:
+    """
+    Stand-in for an OpenTelemetry counter or histogram.
+    """
+    def __init__(self):
+        self.values = []
+
+    def add(self, value, attributes=None):
+        self.values.append((value, attributes))
+
+    record = add
+
+class FakeMeter:
+    """
+    Stand-in for an OpenTelemetry meter.
+    """
+    def __init__(self):
+        self.instruments = {}
+
+    def create_counter(self, name, **kwargs):
+        return self.instruments.setdefault(name, FakeInstrument())
+
+    def create_histogram(self, name, **kwargs):
+        return self.instruments.setdefault(name, FakeInstrument())
+
+class TestMetrics(unittest.TestCase):
+    """
+    Test collecting and exporting metrics.
+    """
+
+    def test_collect_and_export(self):
+        """
+        This test case checks that counters and observations are aggregated per label set,
+        handed to hooks and rendered for Prometheus.
+        """
+
+        events = []
+        metrics = Metrics(hooks=[events.append])
+
+        metrics.increment('responses', endpoint='UserTweets', status='200')
+        metrics.increment('responses', endpoint='UserTweets', status='200')
+        metrics.increment('bytes_received', 512, endpoint='UserTweets')
+        metrics.observe('parse_seconds', 0.25, endpoint='UserTweets')
+        metrics.observe('parse_seconds', 0.75, endpoint='UserTweets')
+
+        self.assertEqual(metrics.counters[('responses', (('endpoint', 'UserTweets'), ('status', '200')))], 2)
+        summary = metrics.summaries[('parse_seconds', (('endpoint', 'UserTweets'),))]
+        self.assertEqual((summary.count, summary.total, summary.minimum, summary.maximum), (2, 1.0, 0.25, 0.75))
+        self.assertEqual(len(events), 5)
+
+        exposition = metrics.to_prometheus()
+        self.assertIn('# TYPE twitfetch_responses_total counter', exposition)
+        self.assertIn('twitfetch_responses_total{endpoint="UserTweets",status="200"} 2', exposition)
+        self.assertIn('twitfetch_bytes_received_total{endpoint="UserTweets"} 512', exposition)
+        self.assertIn('twitfetch_parse_seconds_count{endpoint="UserTweets"} 2', exposition)
+        self.assertIn('twitfetch_parse_seconds_sum{endpoint="UserTweets"} 1', exposition)
+
+    def test_disabled_and_opentelemetry(self):
+        """
+        This test case checks that timing without metrics measures nothing, and that
+        measurements are forwarded to an OpenTelemetry meter.
+        """
+
+        self.assertIs(timed(None, 'scroll_seconds'), timed(None, 'navigation_seconds'))
+
+        meter = FakeMeter()
+        metrics = Metrics(hooks=[OpenTelemetryHook(meter=meter)])
+        with timed(metrics, 'scroll_seconds'):
+            time.sleep(0.01)
+        metrics.increment('tweets', 20, endpoint='UserTweets')
+
+        [(seconds, _)] = meter.instruments['twitfetch_scroll_seconds'].values
+        self.assertGreaterEqual(seconds, 0.01)
+        self.assertEqual(meter.instruments['twitfetch_tweets'].values, [(20, {'endpoint': 'UserTweets'})])
+
+    def test_graphql_client_metrics(self):
+        """
+        This test case checks that direct GraphQL requests report responses, bytes and retries.
+        """
+
+        playwright = sync_playwright().start()
+        request = playwright.request.new_context()
+        metrics = Metrics()
+
+        try:
+            with StandInServer(os.path.join(FIXTURES, 'elonmusk'), rate_limited=1) as server:
+                client = GraphQLClient(
+                    request=request,
+                    session=_session(),
+                    base_url=server.url,
+                    rate_limiter=RateLimiter(backoff_base=0.01, backoff_max=0.01, sleep=lambda _: None),
+                    metrics=metrics
+                )
+                client.user_id(screen_name='elonmusk')
+        finally:
+            request.dispose()
+            playwright.stop()
+
+        labels = (('endpoint', 'UserByScreenName'),)
+        self.assertEqual(metrics.counters[('retries', labels + (('reason', 'rate_limited'),))], 1)
+        self.assertEqual(metrics.counters[('responses', labels + (('status', '429'),))], 1)
+        self.assertEqual(metrics.counters[('responses', labels + (('status', '200'),))], 1)
+        self.assertGreater(metrics.counters[('bytes_received', labels)], 0)
+        self.assertEqual(metrics.summaries[('request_seconds', labels)].count, 2)
+
+if __name__ == "__main__":
+    unittest.main()
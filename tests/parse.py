@@ -0,0 +1,303 @@
+from datetime import datetime, timezone
+import asyncio
+import json
+import os
+import unittest
+
+from twitfetch._constants import LOGIN, LOGIN_ERROR
+from twitfetch._parse import (
+    AsyncPageDOM,
+    find_bottom_cursor,
+    find_entry_newest_ids,
+    find_timeline_entries,
+    iter_tweet_results,
+    PageDOM,
+    parse_tweets_batch,
+    parse_tweets_response
+)
+from twitfetch.errors import ResponseDecodeError
+from twitfetch._json import get_decoder
+from twitfetch._paginate import TimelinePaginator
+from twitfetch._timestamps import (
+    datetime_to_snowflake,
+    parse_created_at,
+    snowflake_to_datetime,
+    TimeWindow
+)
+from twitfetch._utils import decode_json, find_key_in_dict
+from tests.stand_in import FIXTURES, StandInAsyncDOMPage, StandInDOMPage
+
+def _load(name: str, source: str = 'elonmusk', operation: str = 'UserTweets') -> dict:
+    """
+    Load a recorded timeline page.
+    """
+
+    with open(os.path.join(FIXTURES, source, operation, f'{name}.json')) as f:
+        return json.load(f)
+
+class TestParseTweets(unittest.TestCase):
+    """
+    Test parsing of GraphQL timeline responses.
+    """
+
+    def test_parse_user_tweets(self):
+        """
+        This test case checks that tweets are parsed newest first without pinned tweets or retweets.
+        """
+
+        tweets = parse_tweets_response(
+            tweets=[_load('initial')],
+            users=['ElonMusk'],
+            do_remove_retweets=True
+        )
+
+        self.assertEqual(
+            [tweet.content for tweet in tweets],
+            ['Latest thought', 'Second thought', "Yesterday's news"]
+        )
+        self.assertTrue(all(tweet.user_id == 44196397 for tweet in tweets))
+        self.assertEqual(tweets[0].created, datetime(2023, 11, 20, 18, 30, tzinfo=timezone.utc))
+
+    def test_parse_batch(self):
+        """
+        This test case checks that a batch holds the same tweets as the parsed rows.
+        """
+
+        pages = [_load('initial'), _load('initial', 'list_1539453138322673664', 'ListLatestTweetsTimeline')]
+
+        batch = parse_tweets_batch(tweets=pages[:1], do_remove_retweets=True)
+        batch = parse_tweets_batch(tweets=pages[1:], do_remove_retweets=True, batch=batch)
+
+        self.assertEqual(batch.to_tweets(), parse_tweets_response(tweets=pages, do_remove_retweets=True))
+        self.assertEqual(batch.to_dicts()[0]['tweet_id'], batch.tweet_ids[0])
+
+    def test_keep_retweets(self):
+        """
+        This test case checks that retweets are kept unless removal is requested.
+        """
+
+        tweets = parse_tweets_response(tweets=[_load('initial')], users=['elonmusk'])
+        self.assertEqual(len(tweets), 4)
+
+    def test_filter_users(self):
+        """
+        This test case checks that tweets of other accounts are dropped.
+        """
+
+        tweets = parse_tweets_response(tweets=[_load('initial')], users=['SpaceX'])
+        self.assertEqual(tweets, [])
+
+    def test_parse_list_tweets(self):
+        """
+        This test case checks that list timelines keep every member unless filtered.
+        """
+
+        response = _load('initial', 'list_1539453138322673664', 'ListLatestTweetsTimeline')
+
+        tweets = parse_tweets_response(tweets=[response], do_remove_retweets=True)
+        self.assertEqual(len(tweets), 5)
+        self.assertEqual({tweet.user_name for tweet in tweets}, {'NASA', 'SpaceX', 'elonmusk'})
+
+        tweets = parse_tweets_response(tweets=[response], users=['nasa'])
+        self.assertEqual([tweet.user_name for tweet in tweets], ['NASA', 'NASA'])
+
+    def test_fallback_walker(self):
+        """
+        This test case checks that tweets are still found when the response moves off the known schema.
+        """
+
+        response = _load('initial')
+        instructions = response['data']['user']['result']['timeline_v2']['timeline']['instructions']
+        moved = {'data': {'profile': {'timeline': {'instructions': instructions}}}}
+
+        self.assertEqual(
+            [result['rest_id'] for result in iter_tweet_results(response=moved)],
+            [result['rest_id'] for result in iter_tweet_results(response=response)]
+        )
+
+    def test_bottom_cursor(self):
+        """
+        This test case checks that the cursor to the next page is found.
+        """
+
+        entries = find_timeline_entries(response=_load('initial'))
+        self.assertEqual(find_bottom_cursor(entries=entries), 'DAABCgABF__elonmusk_page2_AAAA')
+
+    def test_find_key_in_dict(self):
+        """
+        This test case checks that nested values are found in document order.
+        """
+
+        obj = {'a': {'k': 1, 'b': [{'k': 2}, {'c': {'k': 3}}]}, 'k': 0, 'd': [{'k': None}]}
+        self.assertEqual(find_key_in_dict(obj=obj, key='k'), [1, 2, 3])
+
+class TestTimestamps(unittest.TestCase):
+    """
+    Test creation date parsing and time windows over tweet IDs.
+    """
+
+    def test_parse_created_at(self):
+        """
+        This test case checks that creation dates are parsed like strptime would.
+        """
+
+        dates = (
+            'Mon Nov 20 18:30:00 +0000 2023',
+            'Sat Feb 29 00:00:59 +0000 2020',
+            'Tue Jan 02 23:05:01 -0130 2024'
+        )
+
+        for created in dates:
+            self.assertEqual(
+                parse_created_at(created=created),
+                datetime.strptime(created, '%a %b %d %H:%M:%S %z %Y')
+            )
+
+    def test_snowflake(self):
+        """
+        This test case checks that tweet IDs carry their creation date.
+        """
+
+        tweets = parse_tweets_response(tweets=[_load('initial')])
+
+        for tweet in tweets:
+            self.assertEqual(snowflake_to_datetime(tweet_id=tweet.tweet_id).replace(microsecond=0), tweet.created)
+            self.assertLessEqual(datetime_to_snowflake(moment=tweet.created), tweet.tweet_id)
+
+    def test_time_window(self):
+        """
+        This test case checks that pages are filtered by the time window in one pass.
+        """
+
+        tweets = parse_tweets_response(tweets=[_load('initial')], users=['elonmusk'], do_remove_retweets=True)
+        created = [tweet.created for tweet in tweets]
+
+        window = TimeWindow(time_start=created[1], time_end=created[1])
+        self.assertEqual(window.select(tweet_ids=[tweet.tweet_id for tweet in tweets]), ([1], True))
+
+        batch = parse_tweets_batch(tweets=[_load('initial')], users=['elonmusk'], do_remove_retweets=True)
+        selected, _ = TimeWindow(time_end=created[1]).select(tweet_ids=batch.tweet_ids)
+        self.assertEqual(batch.take(selected).to_tweets(), tweets[1:])
+
+        paginator = TimelinePaginator(tweet_limit=100, time_start=created[1])
+        self.assertEqual(paginator.feed(tweets=tweets), tweets[:2])
+        self.assertTrue(paginator.done)
+
+    def test_conversation_module(self):
+        """
+        This test case checks that a thread root older than the time window neither drops the
+        newer replies listed after it nor ends pagination, while an older entry does.
+        """
+
+        response = _load('initial', 'elonmusk_thread')
+        tweets = parse_tweets_response(tweets=[response], users=['elonmusk'])
+        self.assertEqual(
+            [tweet.content for tweet in tweets],
+            ['Latest thought', 'Thread start', 'Thread update', 'Older thought']
+        )
+
+        newest_ids = find_entry_newest_ids(responses=[response])
+        self.assertEqual(newest_ids, [tweets[0].tweet_id, tweets[2].tweet_id, tweets[3].tweet_id])
+
+        time_start = datetime(2023, 11, 20, tzinfo=timezone.utc)
+        paginator = TimelinePaginator(tweet_limit=100, time_start=time_start)
+        self.assertEqual(paginator.feed(tweets=tweets, newest_ids=newest_ids), [tweets[0], tweets[2]])
+        self.assertTrue(paginator.done)
+
+        # Without the older entry, the next page may still hold tweets within the window
+        paginator = TimelinePaginator(tweet_limit=100, time_start=time_start)
+        self.assertEqual(paginator.feed(tweets=tweets[:3], newest_ids=newest_ids[:2]), [tweets[0], tweets[2]])
+        self.assertFalse(paginator.done)
+
+        # The same holds for the high-water mark of an incremental fetch
+        paginator = TimelinePaginator(tweet_limit=100, since_id=tweets[3].tweet_id)
+        self.assertEqual(paginator.feed(tweets=tweets[:3], newest_ids=newest_ids[:2]), [tweets[0], tweets[2]])
+        self.assertFalse(paginator.done)
+
+class TestPageDOM(unittest.TestCase):
+    """
+    Test querying the DOM of a live page for the login flow.
+    """
+
+    PAGE_SOURCE = '<form><input class="r-30o5oe  r-1niwhzg" name="text"><div role="alert">Wrong</div></form>'
+
+    def test_find_attribute(self):
+        """
+        This test case checks that the attribute of the login input is found and turned into
+        a selector without changing the element searched for.
+        """
+
+        dom = PageDOM(page=StandInDOMPage(page_source=self.PAGE_SOURCE))
+        element = dom.find_attribute(element=LOGIN)
+
+        self.assertEqual(element.attribute_value, 'r-30o5oe r-1niwhzg')
+        self.assertIsNone(LOGIN.attribute_value)
+        self.assertEqual(dom.css_selector(element=element), 'input[class="r-30o5oe r-1niwhzg"]')
+        self.assertIsNotNone(dom.find_element(element=element))
+        self.assertTrue(dom.exists(element=LOGIN_ERROR))
+
+    def test_missing_element(self):
+        """
+        This test case checks that elements missing from the page have no attribute value.
+        """
+
+        dom = PageDOM(page=StandInDOMPage(page_source='<div></div>'))
+
+        self.assertIsNone(dom.find_attribute(element=LOGIN).attribute_value)
+        self.assertIsNone(dom.find_element(element=LOGIN))
+        self.assertFalse(dom.exists(element=LOGIN_ERROR))
+
+    def test_async_page(self):
+        """
+        This test case checks that the asyncio counterpart finds the same elements.
+        """
+
+        async def query():
+            dom = AsyncPageDOM(page=StandInAsyncDOMPage(page_source=self.PAGE_SOURCE))
+            element = await dom.find_attribute(element=LOGIN)
+            return element, await dom.find_element(element=element), await dom.exists(element=LOGIN_ERROR)
+
+        element, found, alert = asyncio.run(query())
+
+        self.assertEqual(element.attribute_value, 'r-30o5oe r-1niwhzg')
+        self.assertIsNone(LOGIN.attribute_value)
+        self.assertIsNotNone(found)
+        self.assertTrue(alert)
+
+class TestDecodeJSON(unittest.TestCase):
+    """
+    Test decoding of GraphQL response bodies.
+    """
+
+    def test_backends_agree(self):
+        """
+        This test case checks that every installed backend decodes bodies identically.
+        """
+
+        with open(os.path.join(FIXTURES, 'elonmusk', 'UserTweets', 'initial.json'), 'rb') as f:
+            body = f.read()
+
+        expected = decode_json(body=body, url='initial.json', decode=get_decoder(backend='json'))
+
+        for backend in ('orjson', 'msgspec'):
+            try:
+                decode = get_decoder(backend=backend)
+            except ImportError:
+                continue
+            self.assertEqual(decode_json(body=body, url='initial.json', decode=decode), expected)
+
+        with self.assertRaises(ValueError):
+            get_decoder(backend='yaml')
+
+    def test_malformed_body(self):
+        """
+        This test case checks that malformed bodies raise a structured error.
+        """
+
+        with self.assertRaises(ResponseDecodeError) as context:
+            decode_json(body=b'<html>rate limited</html>', url='https://twitter.com/i/api/graphql')
+
+        self.assertEqual(context.exception.additional_data, 'https://twitter.com/i/api/graphql')
+
+if __name__ == "__main__":
+    unittest.main()
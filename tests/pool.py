@@ -0,0 +1,99 @@
+from unittest import mock
+import unittest
+
+from twitfetch.errors import InvalidLoginError, NoSessionAvailableError, RateLimitError
+from twitfetch.pool import TwitFetchPool
+from twitfetch._data_structures import Credentials, SessionState
+
+class StandInFetch:
+    """
+    Stand-in for the TwitFetch session of a pool, returning the username and account of
+    every fetch. Logging in as 'invalid' fails, fetching as 'limited' is rate limited.
+    """
+    def __init__(self, login_username, login_password, rate_limiter, browser_manager, **options):
+        if login_username == 'invalid':
+            raise InvalidLoginError()
+
+        self.username = login_username
+        self.options = options
+        self.closed = False
+
+    def user_tweets(self, account, incremental=False):
+        if self.username == 'limited':
+            raise RateLimitError(endpoint='UserTweets', retries=3)
+        return [(self.username, account)]
+
+    def close(self):
+        self.closed = True
+
+def _pool(*usernames: str, **options) -> TwitFetchPool:
+    """
+    Build a pool of stand-in sessions logged in as usernames.
+    """
+
+    with mock.patch('twitfetch.pool.TwitFetch', StandInFetch):
+        return TwitFetchPool(
+            credentials=[Credentials(username=username, password='password') for username in usernames],
+            **options
+        )
+
+class TestTwitFetchPool(unittest.TestCase):
+    """
+    Test spreading fetches across the sessions of a pool.
+    """
+
+    def test_round_robin(self):
+        """
+        This test case checks that fetches go to the sessions in turn and options reach
+        every session.
+        """
+
+        with _pool('first', 'second', tweet_limit=5) as pool:
+            tweets = [pool.user_tweets(account=account) for account in ('a', 'b', 'c')]
+            self.assertEqual(tweets, [[('first', 'a')], [('second', 'b')], [('first', 'c')]])
+
+            results = pool.user_tweets_many(accounts=['d', 'e'])
+            self.assertEqual([result.source for result in results], ['d', 'e'])
+            self.assertTrue(all(result.error is None for result in results))
+
+            self.assertEqual([health.fetches for health in pool.health], [3, 2])
+            self.assertEqual(pool._sessions[0].fetch.options, {'tweet_limit': 5})
+
+    def test_failed_sessions_sit_out(self):
+        """
+        This test case checks that sessions with invalid credentials are evicted and rate
+        limited sessions sit out while fetches move on to the other sessions.
+        """
+
+        with _pool('invalid', 'limited', 'healthy') as pool:
+            self.assertEqual(
+                [health.state for health in pool.health],
+                [SessionState.INVALID, SessionState.ACTIVE, SessionState.ACTIVE]
+            )
+
+            self.assertEqual(pool.user_tweets(account='a'), [('healthy', 'a')])
+            self.assertEqual(pool.health[1].state, SessionState.RATE_LIMITED)
+            self.assertIsInstance(pool.health[1].last_error, RateLimitError)
+            self.assertGreater(pool.health[1].available_at, 0)
+
+            self.assertEqual(pool.user_tweets(account='b'), [('healthy', 'b')])
+
+    def test_no_session_available(self):
+        """
+        This test case checks that a pool with no session logged in cannot be created.
+        """
+
+        with self.assertRaises(NoSessionAvailableError):
+            _pool('invalid', 'invalid')
+
+    def test_pooled_options_rejected(self):
+        """
+        This test case checks that the options the pool sets for every session cannot be passed.
+        """
+
+        for option in ('rate_limiter', 'browser_manager'):
+            with self.assertRaises(ValueError):
+                _pool('first', **{option: object()})
+
+if __name__ == "__main__":
+    unittest.main()
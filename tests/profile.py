@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+import asyncio
+import unittest
+
+from twitfetch._profile import BrowserProfile, ResourceBlocker
+
+class TestResourceBlocker(unittest.TestCase):
+    """
+    Test which requests a lightweight browser profile lets through.
+    """
+
+    def test_blocks(self):
+        """
+        This test case checks that media and third party hosts are blocked while the app and API are not.
+        """
+
+        blocker = ResourceBlocker(profile=BrowserProfile())
+
+        self.assertFalse(blocker.blocks('document', 'https://twitter.com/elonmusk'))
+        self.assertFalse(blocker.blocks('script', 'https://abs.twimg.com/responsive-web/client-web/main.js'))
+        self.assertFalse(blocker.blocks('fetch', 'https://x.com/i/api/graphql/abc/UserTweets'))
+        self.assertTrue(blocker.blocks('image', 'https://pbs.twimg.com/media/abc.jpg'))
+        self.assertTrue(blocker.blocks('script', 'https://www.google-analytics.com/analytics.js'))
+        self.assertTrue(blocker.blocks('script', 'https://nottwitter.com/app.js'))
+        self.assertFalse(blocker.blocks('other', 'https://twitter.com/i/api/1.1/onboarding/task.json'))
+
+        self.assertEqual(blocker.stats.requests_allowed, 4)
+        self.assertEqual(blocker.stats.requests_blocked, 3)
+        self.assertEqual(blocker.stats.blocked_by_type, {'image': 1, 'script': 2})
+
+        blocker.reset()
+        self.assertEqual(blocker.stats.requests_blocked, 0)
+
+    def test_bytes_received(self):
+        """
+        This test case checks that the body bytes actually received are counted, whether or
+        not the response announced a content-length.
+        """
+
+        blocker = ResourceBlocker(profile=BrowserProfile())
+        sizes = {'requestBodySize': 0, 'requestHeadersSize': 300, 'responseBodySize': 2048, 'responseHeadersSize': 400}
+
+        async def async_sizes():
+            return sizes
+
+        blocker.record_request(SimpleNamespace(sizes=lambda: sizes))
+        asyncio.run(blocker.record_request_async(SimpleNamespace(sizes=async_sizes)))
+
+        self.assertEqual(blocker.stats.bytes_received, 4096)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import time
+import unittest
+
+from playwright.sync_api import sync_playwright
+
+from twitfetch.errors import RateLimitError
+from twitfetch._graphql import GraphQLClient
+from twitfetch._ratelimit import RateLimiter
+from tests.graphql import _session
+from tests.stand_in import FIXTURES, StandInServer
+
+class TestRateLimiter(unittest.TestCase):
+    """
+    Test pacing requests from the rate limit headers of responses.
+    """
+
+    def test_pacing(self):
+        """
+        This test case checks that requests are spread out once the budget runs low and
+        wait for the reset once it is spent.
+        """
+
+        limiter = RateLimiter(clock=lambda: 1000.0)
+        self.assertEqual(limiter.delay(endpoint='UserTweets'), 0.0)
+
+        headers = {'x-rate-limit-limit': '100', 'x-rate-limit-reset': '1060'}
+
+        limiter.update(endpoint='UserTweets', headers={**headers, 'x-rate-limit-remaining': '50'})
+        self.assertEqual(limiter.delay(endpoint='UserTweets'), 0.0)
+
+        limiter.update(endpoint='UserTweets', headers={**headers, 'x-rate-limit-remaining': '10'})
+        self.assertEqual(limiter.delay(endpoint='UserTweets'), 6.0)
+
+        limiter.update(endpoint='UserTweets', headers={**headers, 'x-rate-limit-remaining': '0'})
+        self.assertEqual(limiter.delay(endpoint='UserTweets'), 60.0)
+        self.assertEqual(limiter.delay(endpoint='ListLatestTweetsTimeline'), 0.0)
+
+    def test_backoff_honors_reset(self):
+        """
+        This test case checks that retries never come before the announced reset.
+        """
+
+        limiter = RateLimiter(backoff_base=1.0, clock=lambda: 1000.0)
+        limiter.update(endpoint='UserTweets', headers={
+            'x-rate-limit-limit': '100',
+            'x-rate-limit-remaining': '0',
+            'x-rate-limit-reset': '1300'
+        })
+
+        self.assertEqual(limiter.backoff(endpoint='UserTweets', attempt=0), 300.0)
+        self.assertLessEqual(limiter.backoff(endpoint='Unknown', attempt=10), 90.0)
+
+class TestRateLimitedRequests(unittest.TestCase):
+    """
+    Test retrying rate limited GraphQL requests.
+    """
+
+    def setUp(self):
+        self._playwright = sync_playwright().start()
+        self._request = self._playwright.request.new_context()
+        self._sleeps = []
+        self._now = time.time()
+
+    def tearDown(self):
+        self._request.dispose()
+        self._playwright.stop()
+
+    def _sleep(self, seconds: float) -> None:
+        self._sleeps.append(seconds)
+        self._now += seconds
+
+    def _client(self, server: StandInServer, max_retries: int) -> GraphQLClient:
+        limiter = RateLimiter(max_retries=max_retries, clock=lambda: self._now, sleep=self._sleep)
+        return GraphQLClient(
+            request=self._request,
+            session=_session(),
+            base_url=server.url,
+            rate_limiter=limiter
+        )
+
+    def test_retry_after_backoff(self):
+        """
+        This test case checks that rejected requests are retried after backing off.
+        """
+
+        with StandInServer(os.path.join(FIXTURES, 'elonmusk'), rate_limited=2) as server:
+            user_id = self._client(server=server, max_retries=3).user_id(screen_name='elonmusk')
+
+        self.assertEqual(user_id, '44196397')
+        self.assertEqual(len(server.requests), 3)
+        self.assertEqual(len(self._sleeps), 2)
+
+    def test_retries_exhausted(self):
+        """
+        This test case checks that requests still rejected after every retry raise an error.
+        """
+
+        with StandInServer(os.path.join(FIXTURES, 'elonmusk'), rate_limited=5) as server:
+            with self.assertRaises(RateLimitError):
+                self._client(server=server, max_retries=1).user_id(screen_name='elonmusk')
+
+        self.assertEqual(len(server.requests), 2)
+
+if __name__ == "__main__":
+    unittest.main()
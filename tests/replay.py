@@ -0,0 +1,57 @@
+import filecmp
+import json
+import os
+import tempfile
+import unittest
+from urllib.parse import urlencode
+
+from playwright.sync_api import sync_playwright
+
+from twitfetch._replay import FixtureRecorder
+from tests.stand_in import FIXTURES, fixture_key, StandInServer
+
+class TestFixtureRecorder(unittest.TestCase):
+    """
+    Test recording GraphQL bodies as fixtures the stand-in serves back.
+    """
+
+    def setUp(self):
+        self._playwright = sync_playwright().start()
+        self._request = self._playwright.request.new_context()
+
+    def tearDown(self):
+        self._request.dispose()
+        self._playwright.stop()
+
+    def test_record_replay(self):
+        """
+        This test case checks that recorded bodies land where the stand-in looks them up.
+        """
+
+        source = os.path.join(FIXTURES, 'elonmusk')
+        cursor = 'DAABCgABF__elonmusk_page2_AAAA'
+
+        with tempfile.TemporaryDirectory() as directory, StandInServer(source) as server:
+            recorder = FixtureRecorder(directory=directory)
+
+            for variables in ({'userId': '44196397'}, {'userId': '44196397', 'cursor': cursor}):
+                query = urlencode({'variables': json.dumps(variables), 'features': '{}'})
+                response = self._request.get(
+                    f'{server.url}/V7H0Ap3_Hh2FyS75OCDO3Q/UserTweets?{query}',
+                    headers={'authorization': 'Bearer AAAA', 'x-csrf-token': 'csrf'}
+                )
+                recorder.callback(response)
+
+            recorder.record_page(name='login_username', page_source='<input autocomplete="username">')
+
+            for key in ('initial', fixture_key(cursor)):
+                self.assertTrue(filecmp.cmp(
+                    os.path.join(directory, 'UserTweets', f'{key}.json'),
+                    os.path.join(source, 'UserTweets', f'{key}.json'),
+                    shallow=False
+                ))
+            self.assertEqual(len(recorder.recorded), 3)
+            self.assertTrue(os.path.exists(os.path.join(directory, 'pages', 'login_username.html')))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+from unittest import mock
+import json
+import os
+import tempfile
+import unittest
+
+from twitfetch.errors import InvalidLoginError
+from twitfetch._batch import TweetBatch
+from twitfetch._data_structures import Credentials, JobKind
+from twitfetch._parse import parse_tweets_response
+from twitfetch._queue import SQLiteWorkQueue
+from twitfetch._sinks import JSONLSink
+from twitfetch.runner import _work, ShardedRunner, run_worker
+from tests.stand_in import FIXTURES
+
+class _ExportingFetch:
+    """
+    Stand-in session exporting the recorded user timeline for every account but 'broken'.
+    """
+    def __init__(self, tweets):
+        self._tweets = tweets
+
+    def export_user_tweets(self, account, sinks, incremental=False):
+        if account == 'broken':
+            raise RuntimeError('timeline never loaded')
+
+        for sink in sinks:
+            sink.write(batch=TweetBatch.from_tweets(self._tweets))
+            sink.flush()
+        return len(self._tweets)
+
+class TestShardedRunner(unittest.TestCase):
+    """
+    Test leasing jobs from the work queue and merging the shards of a run.
+    """
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._now = 1000.0
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self._directory.name, name)
+
+    def test_lease_retry_and_expiry(self):
+        """
+        This test case checks that leases are exclusive, failed jobs are retried after a delay
+        until out of attempts, and expired leases are handed out again.
+        """
+
+        queue = SQLiteWorkQueue(path=self._path('queue.db'), max_attempts=2, retry_delay=10, clock=lambda: self._now)
+        self.assertEqual(queue.add(kind=JobKind.USER, sources=['elonmusk', 'nasa']), 2)
+        self.assertEqual(queue.add(kind=JobKind.USER, sources=['elonmusk', 'ElonMusk']), 0)
+
+        first = queue.lease(worker='a', lease_seconds=60)
+        second = queue.lease(worker='b', lease_seconds=60)
+        self.assertEqual((first.source, second.source), ('elonmusk', 'nasa'))
+        self.assertIsNone(queue.lease(worker='c'))
+
+        # The job comes back once the retry delay has passed
+        self.assertTrue(queue.fail(job=first, error='timed out'))
+        self.assertIsNone(queue.lease(worker='c'))
+        self._now += 10
+        retry = queue.lease(worker='c', lease_seconds=60)
+        self.assertEqual((retry.source, retry.attempts), ('elonmusk', 2))
+
+        # The worker whose lease expired can no longer complete the job
+        self._now += 60
+        taken = queue.lease(worker='a', lease_seconds=60)
+        self.assertEqual(taken.source, 'nasa')
+        self.assertFalse(queue.complete(job=second, tweets=5))
+        self.assertTrue(queue.complete(job=taken, tweets=5))
+
+        # The retry ran out of attempts once its lease expired
+        self.assertFalse(queue.fail(job=retry, error='timed out'))
+        stats = queue.stats()
+        self.assertEqual((stats.pending, stats.leased, stats.done, stats.failed), (0, 0, 1, 1))
+        self.assertEqual(stats.outstanding, 0)
+
+        # Finished jobs are queued again
+        self.assertEqual(queue.add(kind=JobKind.USER, sources=['elonmusk', 'nasa']), 2)
+        self.assertEqual(queue.stats().pending, 2)
+        queue.close()
+
+    def test_workers_merge_shards(self):
+        """
+        This test case checks that workers drain the queue and the shards are merged without
+        tweets exported twice.
+        """
+
+        with open(os.path.join(FIXTURES, 'elonmusk', 'UserTweets', 'initial.json')) as f:
+            tweets = parse_tweets_response(tweets=[json.load(f)], users=['elonmusk'], do_remove_retweets=True)
+
+        with ShardedRunner(
+            queue_path=self._path('queue.db'),
+            output_dir=self._path('shards'),
+            credentials=[Credentials(username='user', password='password')],
+            max_attempts=1
+        ) as runner:
+            self.assertEqual(runner.add(accounts=['elonmusk', 'broken', 'ElonMusk']), 2)
+
+            fetch = _ExportingFetch(tweets=tweets)
+            for worker in ('a', 'b'):
+                with JSONLSink(os.path.join(self._path('shards'), f'{worker}.jsonl')) as sink:
+                    run_worker(queue=runner.queue, fetch=fetch, sinks=[sink], worker=worker, poll_interval=0)
+
+            stats = runner.stats
+            self.assertEqual((stats.done, stats.failed), (1, 1))
+
+            workers = runner.queue.worker_stats()
+            self.assertEqual([(worker.worker, worker.jobs, worker.failures) for worker in workers], [('a', 1, 1)])
+            self.assertEqual(workers[0].tweets, len(tweets))
+
+            self.assertEqual(len(runner.shards()), 2)
+            self.assertEqual(list(runner.tweets()), tweets)
+
+            with JSONLSink(self._path('merged.jsonl')) as merged:
+                self.assertEqual(runner.export(sinks=[merged]), len(tweets))
+
+    def test_failed_login_opens_nothing(self):
+        """
+        This test case checks that a worker process whose login fails leaves no queue open.
+        """
+
+        with mock.patch('twitfetch.runner.TwitFetch', side_effect=InvalidLoginError()), \
+                mock.patch('twitfetch.runner.SQLiteWorkQueue') as queue:
+            with self.assertRaises(InvalidLoginError):
+                _work(
+                    queue_path=self._path('queue.db'),
+                    worker='a',
+                    shard=self._path('a.jsonl'),
+                    credentials=Credentials(username='user', password='password'),
+                    options={},
+                    lease_seconds=60,
+                    incremental=False,
+                    max_attempts=1,
+                    retry_delay=0
+                )
+
+        queue.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
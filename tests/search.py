@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta, timezone
+import json
+import os
+import unittest
+from urllib.parse import parse_qs, urlparse
+
+from twitfetch._parse import parse_tweets_response
+from twitfetch._search import merge_search_results, plan_search, search_url
+from tests.stand_in import FIXTURES
+
+class TestSearch(unittest.TestCase):
+    """
+    Test planning and merging of time-sliced searches.
+    """
+
+    def test_plan_slices(self):
+        """
+        This test case checks that slices cover the window newest first without gaps or overlaps.
+        """
+
+        start = datetime(2023, 11, 1, tzinfo=timezone.utc)
+        end = datetime(2023, 11, 20, tzinfo=timezone.utc)
+
+        slices = plan_search(account='elonmusk', time_start=start, time_end=end, slice_days=7)
+
+        self.assertEqual(len(slices), 3)
+        self.assertEqual(slices[0].until, end + timedelta(seconds=1))
+        self.assertEqual(slices[-1].since, start)
+        for newer, older in zip(slices, slices[1:]):
+            self.assertEqual(newer.since, older.until)
+
+        self.assertEqual(
+            slices[-1].query,
+            f'from:elonmusk since_time:{int(start.timestamp())} until_time:{int(slices[-1].until.timestamp())}'
+        )
+        self.assertEqual(parse_qs(urlparse(search_url(slices[0].query)).query)['q'], [slices[0].query])
+
+        with self.assertRaises(ValueError):
+            plan_search(account='elonmusk', time_start=None)
+
+    def test_merge_results(self):
+        """
+        This test case checks that tweets found by several slices are kept once, oldest first,
+        up to the limit of newest tweets.
+        """
+
+        with open(os.path.join(FIXTURES, 'elonmusk', 'UserTweets', 'initial.json')) as f:
+            page = json.load(f)
+
+        # Serve the user timeline fixture as a search timeline
+        search = {'data': {'search_by_raw_query': {
+            'search_timeline': page['data']['user']['result']['timeline_v2']
+        }}}
+        tweets = parse_tweets_response(tweets=[search], do_remove_retweets=True)
+        self.assertEqual(tweets, parse_tweets_response(tweets=[page], do_remove_retweets=True))
+
+        merged = merge_search_results(results=[tweets[:2], tweets[1:]])
+        self.assertEqual(merged, sorted(tweets, key=lambda tweet: tweet.tweet_id))
+
+        limited = merge_search_results(results=[tweets[:2], tweets[1:]], tweet_limit=2)
+        self.assertEqual(limited, merged[-2:])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import tempfile
+import time
+import unittest
+
+from twitfetch._session import SessionStore, is_state_expired
+
+def _state(expires: float) -> dict:
+    """
+    Build a storage state holding an authentication cookie.
+    """
+
+    return {
+        'cookies': [
+            {'name': 'ct0', 'value': 'csrf', 'expires': -1},
+            {'name': 'auth_token', 'value': 'token', 'expires': expires}
+        ],
+        'origins': []
+    }
+
+class TestSessionStore(unittest.TestCase):
+    """
+    Test saving and reusing logged in sessions.
+    """
+
+    def test_state_expired(self):
+        """
+        This test case checks that states without a live authentication cookie are expired.
+        """
+
+        self.assertFalse(is_state_expired(state=_state(expires=time.time() + 3600)))
+        self.assertFalse(is_state_expired(state=_state(expires=-1)))
+        self.assertTrue(is_state_expired(state=_state(expires=time.time() - 1)))
+        self.assertTrue(is_state_expired(state={'cookies': [], 'origins': []}))
+
+    def test_save_and_load(self):
+        """
+        This test case checks that states are saved per account and expired states are ignored.
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+            store = SessionStore(directory=directory)
+            state = _state(expires=time.time() + 3600)
+
+            store.save(username='first', state=state)
+            store.save(username='second', state=_state(expires=time.time() - 1))
+
+            self.assertEqual(store.load(username='first'), state)
+            self.assertIsNone(store.load(username='second'))
+            self.assertIsNone(store.load(username='third'))
+
+            if os.name == 'posix':
+                self.assertEqual(os.stat(store._path(username='first')).st_mode & 0o777, 0o600)
+
+            store.delete(username='first')
+            self.assertIsNone(store.load(username='first'))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+from datetime import datetime, timezone
+
+from twitfetch._batch import TweetBatch
+from twitfetch._data_structures import Tweet
+from twitfetch._sinks import JSONLSink, open_sink, ParquetSink, SQLiteSink
+
+try:
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+def _batch(first_id: int, count: int, content: str = 'tweet') -> TweetBatch:
+    return TweetBatch.from_tweets(tweets=[
+        Tweet(
+            user_name='elonmusk',
+            user_id=44196397,
+            tweet_id=first_id - index,
+            created=datetime(2023, 11, 20, 18, 30, tzinfo=timezone.utc),
+            content=f'{content} {index}'
+        )
+        for index in range(count)
+    ])
+
+class TestSinks(unittest.TestCase):
+    """
+    Test writing tweets to disk in batches.
+    """
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self._directory.name, name)
+
+    def test_jsonl(self):
+        """
+        This test case checks that tweets are buffered until a batch is full and every
+        tweet is written once the sink is closed.
+        """
+
+        with JSONLSink(self._path('tweets.jsonl'), batch_size=3) as sink:
+            sink.write(batch=_batch(first_id=100, count=2))
+            self.assertEqual(sink.written, 0)
+            sink.write(batch=_batch(first_id=50, count=2))
+            self.assertEqual(sink.written, 4)
+            sink.write(batch=_batch(first_id=10, count=1))
+
+        with open(self._path('tweets.jsonl'), encoding='utf-8') as f:
+            rows = [json.loads(line) for line in f]
+
+        self.assertEqual([row['tweet_id'] for row in rows], [100, 99, 50, 49, 10])
+        self.assertEqual(rows[0]['created'], 1700505000)
+        self.assertEqual(sink.written, 5)
+
+    def test_jsonl_flush_syncs(self):
+        """
+        This test case checks that flushed tweets are on disk before the sink is closed.
+        """
+
+        with JSONLSink(self._path('tweets.jsonl'), batch_size=100) as sink, \
+                mock.patch('twitfetch._sinks.os.fsync') as fsync:
+            sink.write(batch=_batch(first_id=100, count=2))
+            sink.flush()
+
+            fsync.assert_called_once_with(sink._file.fileno())
+            with open(self._path('tweets.jsonl'), encoding='utf-8') as f:
+                self.assertEqual(len(f.readlines()), 2)
+
+    def test_sqlite_upsert(self):
+        """
+        This test case checks that tweets written again replace the stored row.
+        """
+
+        with open_sink(self._path('tweets.db'), batch_size=2) as sink:
+            self.assertIsInstance(sink, SQLiteSink)
+            sink.write(batch=_batch(first_id=100, count=3))
+            sink.write(batch=_batch(first_id=101, count=3, content='edited'))
+
+            # Shards written before contents were normalized may hold none
+            batch = _batch(first_id=97, count=1)
+            batch.contents = [None]
+            sink.write(batch=batch)
+
+        connection = sqlite3.connect(self._path('tweets.db'))
+        rows = connection.execute('SELECT tweet_id, content FROM tweets ORDER BY tweet_id DESC').fetchall()
+        connection.close()
+
+        self.assertEqual(
+            rows,
+            [(101, 'edited 0'), (100, 'edited 1'), (99, 'edited 2'), (98, 'tweet 2'), (97, None)]
+        )
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_parquet(self):
+        """
+        This test case checks that every batch is written as a row group.
+        """
+
+        with ParquetSink(self._path('tweets.parquet'), batch_size=2) as sink:
+            sink.write(batch=_batch(first_id=100, count=3))
+
+        parquet_file = pyarrow.parquet.ParquetFile(self._path('tweets.parquet'))
+        self.assertEqual(parquet_file.metadata.num_row_groups, 2)
+        self.assertEqual(parquet_file.read().column('tweet_id').to_pylist(), [100, 99, 98])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+from types import SimpleNamespace
+from unittest import mock
+import os
+
+from bs4 import BeautifulSoup
+
+from twitfetch.fetch import TwitFetch
+from twitfetch._replay import fixture_key, StandInServer
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+class StandInBrowser:
+    """
+    Stand-in for the playwright browser of a TwitFetch, for tests feeding timeline pages
+    straight to the fetcher.
+    """
+    def __init__(self, **options):
+        self.options = options
+        self.context = SimpleNamespace(request=None)
+        self.page = SimpleNamespace(wait_for_timeout=lambda timeout: None)
+        self.warm = False
+        self.resource_blocker = None
+        self.closed = False
+
+    def listen(self, event, handler):
+        pass
+
+    def new_page(self):
+        return SimpleNamespace()
+
+    def close_page(self, page):
+        pass
+
+    def clear_storage_state(self):
+        pass
+
+    def storage_state(self):
+        return {}
+
+    def exit_browser(self):
+        self.closed = True
+
+class StandInDOMPage:
+    """
+    Stand-in for a playwright page answering the DOM queries of PageDOM from page source.
+    """
+    def __init__(self, page_source: str):
+        self._soup = BeautifulSoup(page_source, 'html.parser')
+
+    def evaluate(self, script, arg):
+        # Attribute lookups pass the selector along with the attribute, existence checks alone
+        if isinstance(arg, str):
+            return self._soup.select_one(arg) is not None
+
+        found = self._soup.select_one(arg[0])
+        value = None if found is None else found.get(arg[1])
+        return ' '.join(value) if isinstance(value, list) else value
+
+    def query_selector(self, selector):
+        return self._soup.select_one(selector)
+
+class StandInAsyncDOMPage(StandInDOMPage):
+    """
+    Asyncio counterpart of StandInDOMPage.
+    """
+    async def evaluate(self, script, arg):
+        return super().evaluate(script, arg)
+
+    async def query_selector(self, selector):
+        return super().query_selector(selector)
+
+def offline_fetch(**options) -> TwitFetch:
+    """
+    Build a TwitFetch on a stand-in browser, skipping the login.
+    """
+
+    with mock.patch('twitfetch.fetch.PlaywrightBrowser', StandInBrowser), \
+            mock.patch.object(TwitFetch, 'twitter_login'):
+        return TwitFetch(login_username='user', login_password='password', **options)
+
+__all__ = [
+    'FIXTURES',
+    'fixture_key',
+    'offline_fetch',
+    'StandInAsyncDOMPage',
+    'StandInBrowser',
+    'StandInDOMPage',
+    'StandInServer'
+]
@@ -0,0 +1,122 @@
+import json
+import os
+import tempfile
+import unittest
+
+from twitfetch._constants import Endpoints
+from twitfetch._data_structures import HighWaterMark
+from twitfetch._paginate import TimelinePaginator
+from twitfetch._parse import parse_tweets_response
+from twitfetch._state import HighWaterMarkStore
+from tests.stand_in import FIXTURES, offline_fetch
+
+class TestIncrementalFetching(unittest.TestCase):
+    """
+    Test stopping at the newest tweet seen by a previous fetch.
+    """
+
+    def test_store_only_advances(self):
+        """
+        This test case checks that marks are kept per timeline and never move backwards.
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+            store = HighWaterMarkStore(path=os.path.join(directory, 'state.db'))
+
+            store.update(endpoint='UserTweets', source='ElonMusk', mark=HighWaterMark(tweet_id=200))
+            store.update(endpoint='UserTweets', source='elonmusk', mark=HighWaterMark(tweet_id=100))
+
+            self.assertEqual(store.get(endpoint='UserTweets', source='elonmusk').tweet_id, 200)
+            self.assertIsNone(store.get(endpoint='ListLatestTweetsTimeline', source='elonmusk'))
+
+            # Worker processes sharing the database do not block each other's reads
+            self.assertEqual(store._connection.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+            store.close()
+
+    def test_stop_at_seen_tweet(self):
+        """
+        This test case checks that pagination stops at the first tweet already seen.
+        """
+
+        with open(os.path.join(FIXTURES, 'elonmusk', 'UserTweets', 'initial.json')) as f:
+            tweets = parse_tweets_response(tweets=[json.load(f)], users=['elonmusk'])
+
+        paginator = TimelinePaginator(tweet_limit=100, since_id=tweets[2].tweet_id)
+        accepted = paginator.feed(tweets=tweets)
+
+        self.assertEqual(accepted, tweets[:2])
+        self.assertTrue(paginator.done)
+
+    def test_mark_kept_on_failure(self):
+        """
+        This test case checks that the mark only advances once the whole timeline has been
+        handed out.
+        """
+
+        with open(os.path.join(FIXTURES, 'elonmusk', 'UserTweets', 'initial.json')) as f:
+            page = json.load(f)
+
+        def pages(fail: bool):
+            yield [page]
+            if fail:
+                raise RuntimeError('timeline stopped loading')
+
+        mark_key = (Endpoints.UserTweets, 'elonmusk')
+
+        with tempfile.TemporaryDirectory() as directory:
+            fetch = offline_fetch(tweet_limit=100, state_path=os.path.join(directory, 'state.db'))
+
+            tweets = fetch._iter_tweets(
+                pages=pages(fail=True), endpoint=Endpoints.UserTweets, users=['elonmusk'], mark_key=mark_key
+            )
+            with self.assertRaises(RuntimeError):
+                list(tweets)
+            self.assertIsNone(fetch._state_store.get(endpoint='UserTweets', source='elonmusk'))
+
+            # A caller stopping early leaves the mark alone too
+            tweets = fetch._iter_tweets(
+                pages=pages(fail=False), endpoint=Endpoints.UserTweets, users=['elonmusk'], mark_key=mark_key
+            )
+            newest = next(tweets)
+            tweets.close()
+            self.assertIsNone(fetch._state_store.get(endpoint='UserTweets', source='elonmusk'))
+
+            list(fetch._iter_tweets(
+                pages=pages(fail=False), endpoint=Endpoints.UserTweets, users=['elonmusk'], mark_key=mark_key
+            ))
+            self.assertEqual(fetch._state_store.get(endpoint='UserTweets', source='elonmusk').tweet_id, newest.tweet_id)
+            fetch.close()
+
+    def test_limit_keeps_new_tweets(self):
+        """
+        This test case checks that the tweet limit only cuts short the first fetch of a
+        timeline, later fetches returning every tweet newer than the mark.
+        """
+
+        with open(os.path.join(FIXTURES, 'elonmusk', 'UserTweets', 'initial.json')) as f:
+            page = json.load(f)
+
+        tweets = parse_tweets_response(tweets=[page], users=['elonmusk'], do_remove_retweets=True)
+        mark_key = (Endpoints.UserTweets, 'elonmusk')
+
+        def poll(fetch):
+            return list(fetch._iter_tweets(
+                pages=(pages for pages in [[page]]), endpoint=Endpoints.UserTweets, users=['elonmusk'], mark_key=mark_key
+            ))
+
+        with tempfile.TemporaryDirectory() as directory:
+            fetch = offline_fetch(tweet_limit=1, state_path=os.path.join(directory, 'first.db'))
+            self.assertEqual(poll(fetch), tweets[:1])
+            fetch.close()
+
+            # Two tweets arrived since the previous fetch
+            fetch = offline_fetch(tweet_limit=1, state_path=os.path.join(directory, 'state.db'))
+            fetch._state_store.update(endpoint='UserTweets', source='elonmusk', mark=HighWaterMark(tweet_id=tweets[2].tweet_id))
+
+            self.assertEqual(poll(fetch), tweets[:2])
+            self.assertEqual(poll(fetch), [])
+            self.assertEqual(fetch._state_store.get(endpoint='UserTweets', source='elonmusk').tweet_id, tweets[0].tweet_id)
+            fetch.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+from twitfetch._batch import TweetBatch
+from twitfetch._browser_manager import BrowserManager, shared_browser_manager
+from twitfetch._cache import ResponseCache
+from twitfetch._metrics import Metrics
+from twitfetch._profile import BrowserProfile
+from twitfetch._ratelimit import RateLimiter
+from twitfetch._sinks import (
+    JSONLSink,
+    open_sink,
+    ParquetSink,
+    read_jsonl,
+    SQLiteSink,
+    TweetSink
+)
+from twitfetch._timestamps import TimeWindow
+
+__all__ = [
+    'BrowserManager',
+    'BrowserProfile',
+    'JSONLSink',
+    'Metrics',
+    'open_sink',
+    'ParquetSink',
+    'RateLimiter',
+    'read_jsonl',
+    'ResponseCache',
+    'shared_browser_manager',
+    'SQLiteSink',
+    'TimeWindow',
+    'TweetBatch',
+    'TweetSink'
+]
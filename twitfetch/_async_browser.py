@@ -0,0 +1,203 @@
+from typing import Optional
+
+from playwright.async_api import (
+    async_playwright,
+    Browser,
+    BrowserContext,
+    Page,
+    Playwright,
+    TimeoutError
+)
+
+from twitfetch.errors import PageLoadTimeoutError
+from twitfetch._constants import TWEET_ARTICLE
+from twitfetch._profile import BrowserProfile, ResourceBlocker
+
+class AsyncPlaywrightBrowser:
+    """
+    Asyncio counterpart of PlaywrightBrowser, started with start().
+    """
+    def __init__(
+        self,
+        headless: bool = False,
+        timeout: int = 10000,
+        storage_state: Optional[dict] = None,
+        profile: Optional[BrowserProfile] = None,
+        record_har: Optional[str] = None,
+        replay_har: Optional[str] = None
+    ):
+        self._headless = headless
+        self._timeout = timeout
+        self._storage_state = storage_state
+        self._profile = profile
+        self._record_har = record_har
+        self._replay_har = replay_har
+        self.resource_blocker: Optional[ResourceBlocker] = None
+
+        self._playwright: Optional[Playwright] = None
+        self.browser: Optional[Browser] = None
+        self.context: Optional[BrowserContext] = None
+        self.page: Optional[Page] = None
+
+    async def start(self) -> None:
+        """
+        Launch the browser and open the main page.
+        """
+
+        self._playwright = await async_playwright().start()
+        self.browser = await self._playwright.chromium.launch(
+            headless=self._headless,
+            args=[] if self._profile is None else list(self._profile.launch_args)
+        )
+
+        self.context = await self.browser.new_context(
+            storage_state=self._storage_state,
+            record_har_path=self._record_har
+        )
+
+        # Requests missing from the archive are aborted rather than sent to Twitter
+        if self._replay_har is not None:
+            await self.context.route_from_har(self._replay_har, not_found='abort')
+
+        if self._profile is not None:
+            self.resource_blocker = ResourceBlocker(profile=self._profile)
+            await self.context.route('**/*', self.resource_blocker.handle_async)
+            self.context.on('requestfinished', self.resource_blocker.record_request_async)
+
+        self.page = await self.context.new_page()
+
+    async def _wait_for_load(self) -> None:
+        """
+        Wait until the document of the main page has finished loading.
+        """
+
+        try:
+            await self.page.wait_for_load_state('load', timeout=self._timeout)
+        except TimeoutError:
+            raise PageLoadTimeoutError(url=self.page.url, timeout=self._timeout / 1000)
+
+    async def wait_for_element(self, selector: str, timeout: Optional[int] = None) -> None:
+        """
+        Wait until an element matching the selector is attached to the page.
+        """
+
+        await self.page.wait_for_selector(
+            selector,
+            state='attached',
+            timeout=self._timeout if timeout is None else timeout
+        )
+
+    async def mark_element(self, selector: str, marker: str) -> None:
+        """
+        Set a marker attribute on the first element matching the selector.
+        """
+
+        await self.page.eval_on_selector(
+            selector, '(e, marker) => e.setAttribute(marker, "")', marker
+        )
+
+    async def wait_for_change(self, gone: str, present: str, timeout: Optional[int] = None) -> None:
+        """
+        Wait until either no element matches one selector or an element matches another.
+        """
+
+        await self.page.wait_for_function(
+            '([gone, present]) => !document.querySelector(gone) || !!document.querySelector(present)',
+            arg=[gone, present],
+            timeout=self._timeout if timeout is None else timeout
+        )
+
+    async def type_input(self, text: str, selector: str) -> None:
+        """
+        Type in an input and hit the enter button.
+        """
+
+        await self.page.type(selector, text)
+        await self.page.keyboard.press('Enter')
+        await self._wait_for_load()
+
+    async def go_to_page(self, url: str, page: Optional[Page] = None, wait_for_tweet: bool = False) -> None:
+        """
+        Navigate a page, the main page by default, to a webpage.
+        """
+
+        page = self.page if page is None else page
+        try:
+            await page.goto(url, wait_until='load', timeout=self._timeout)
+        except TimeoutError:
+            raise PageLoadTimeoutError(url=url, timeout=self._timeout / 1000)
+
+        if wait_for_tweet:
+            await page.wait_for_selector(
+                f'{TWEET_ARTICLE.tag}[{TWEET_ARTICLE.attribute}="{TWEET_ARTICLE.attribute_value}"]',
+                timeout=self._timeout
+            )
+
+    async def scroll_down(self, page: Optional[Page] = None, to_bottom: bool = False) -> None:
+        """
+        Scroll down a page, the main page by default, either slightly or all the way down.
+        """
+
+        if to_bottom:
+            action = 'window.scrollTo(0, document.body.scrollHeight)'
+        else:
+            action = 'window.scrollBy(0, 1000)'
+
+        await (self.page if page is None else page).evaluate(action)
+
+    async def new_page(self) -> Page:
+        """
+        Open another page sharing the cookies of the browser context.
+        """
+
+        return await self.context.new_page()
+
+    async def close_page(self, page: Page) -> None:
+        """
+        Close a page opened with new_page.
+        """
+
+        await page.close()
+
+    async def storage_state(self) -> dict:
+        """
+        Retrieve the cookies and local storage of the browser context.
+        """
+
+        return await self.context.storage_state()
+
+    async def clear_storage_state(self) -> None:
+        """
+        Remove the cookies of the browser context.
+        """
+
+        await self.context.clear_cookies()
+
+    async def exit_browser(self) -> None:
+        """
+        Close the browser instance, saving the HAR archive when recording, and stop playwright.
+        Whatever start() got to is closed, closing twice does nothing.
+        """
+
+        context, browser, playwright = self.context, self.browser, self._playwright
+        self.context, self.browser, self._playwright, self.page = None, None, None, None
+
+        # Chromium and Playwright are stopped even if closing the context failed
+        try:
+            if context is not None:
+                await context.close()
+        finally:
+            try:
+                if browser is not None:
+                    await browser.close()
+            finally:
+                if playwright is not None:
+                    await playwright.stop()
+
+    async def page_to_dom(self) -> str:
+        """
+        Convert the webpage to DOM.
+        """
+
+        content = await self.page.content()
+        return content
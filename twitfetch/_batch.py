@@ -0,0 +1,146 @@
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, TYPE_CHECKING
+
+from twitfetch._data_structures import Tweet
+from twitfetch.typing import Tweets
+
+# numpy is optional, only imported by to_numpy when called
+if TYPE_CHECKING:
+    import numpy
+
+class TweetBatch:
+    """
+    Columnar container of tweets. IDs and creation times are kept in packed 64-bit arrays
+    and strings in plain lists, so that holding millions of tweets costs a few objects per
+    tweet instead of a full Tweet each. Rows are only materialized when read.
+
+    Attributes:
+        user_names (List[str]): The user name of the account of each tweet.
+        user_ids (array): The user ID of the account of each tweet.
+        tweet_ids (array): The ID of each tweet.
+        created (array): The creation time of each tweet in UTC epoch seconds.
+        contents (List[str]): The content of each tweet.
+    """
+    def __init__(self):
+        self.user_names: List[str] = []
+        self.user_ids = array('q')
+        self.tweet_ids = array('q')
+        self.created = array('q')
+        self.contents: List[str] = []
+
+    @classmethod
+    def from_tweets(cls, tweets: Tweets) -> 'TweetBatch':
+        """
+        Build a batch from tweets.
+        """
+
+        batch = cls()
+        for tweet in tweets:
+            batch.append(
+                user_name=tweet.user_name,
+                user_id=tweet.user_id,
+                tweet_id=tweet.tweet_id,
+                created=int(tweet.created.timestamp()),
+                content=tweet.content
+            )
+        return batch
+
+    def append(self, user_name: str, user_id: int, tweet_id: int, created: int, content: str) -> None:
+        """
+        Append a tweet given its fields, the creation time being in UTC epoch seconds.
+        """
+
+        self.user_names.append(user_name)
+        self.user_ids.append(user_id)
+        self.tweet_ids.append(tweet_id)
+        self.created.append(created)
+        self.contents.append(content)
+
+    def extend(self, batch: 'TweetBatch') -> None:
+        """
+        Append every tweet of another batch.
+        """
+
+        self.user_names.extend(batch.user_names)
+        self.user_ids.extend(batch.user_ids)
+        self.tweet_ids.extend(batch.tweet_ids)
+        self.created.extend(batch.created)
+        self.contents.extend(batch.contents)
+
+    def take(self, indices: List[int]) -> 'TweetBatch':
+        """
+        Build a batch of the rows at the given indices, e.g. those selected by a TimeWindow.
+        """
+
+        batch = TweetBatch()
+        batch.user_names = [self.user_names[index] for index in indices]
+        batch.user_ids = array('q', (self.user_ids[index] for index in indices))
+        batch.tweet_ids = array('q', (self.tweet_ids[index] for index in indices))
+        batch.created = array('q', (self.created[index] for index in indices))
+        batch.contents = [self.contents[index] for index in indices]
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.tweet_ids)
+
+    def __getitem__(self, index: int) -> Tweet:
+        return Tweet(
+            user_name=self.user_names[index],
+            user_id=self.user_ids[index],
+            tweet_id=self.tweet_ids[index],
+            created=datetime.fromtimestamp(self.created[index], tz=timezone.utc),
+            content=self.contents[index]
+        )
+
+    def __iter__(self) -> Iterator[Tweet]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def to_tweets(self) -> Tweets:
+        """
+        Materialize every row as a Tweet.
+        """
+
+        return list(self)
+
+    def to_dicts(self) -> List[dict]:
+        """
+        Convert every row to a dictionary keyed by Tweet field, creation times staying epoch seconds.
+        """
+
+        return [
+            {
+                'user_name': user_name,
+                'user_id': user_id,
+                'tweet_id': tweet_id,
+                'created': created,
+                'content': content
+            }
+            for user_name, user_id, tweet_id, created, content in zip(
+                self.user_names, self.user_ids, self.tweet_ids, self.created, self.contents
+            )
+        ]
+
+    def to_numpy(self) -> Dict[str, 'numpy.ndarray']:
+        """
+        Convert the columns to NumPy arrays without copying the numeric columns,
+        requires numpy to be installed.
+
+        Returns:
+            Dict[str, numpy.ndarray]: The arrays keyed by Tweet field, creation times
+                being datetime64 seconds.
+        """
+
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError('TweetBatch.to_numpy requires numpy, install it with `pip install numpy`')
+
+        return {
+            'user_name': numpy.array(self.user_names, dtype=object),
+            'user_id': numpy.frombuffer(self.user_ids, dtype=numpy.int64),
+            'tweet_id': numpy.frombuffer(self.tweet_ids, dtype=numpy.int64),
+            'created': numpy.frombuffer(self.created, dtype=numpy.int64).view('datetime64[s]'),
+            'content': numpy.array(self.contents, dtype=object)
+        }
@@ -1,31 +1,126 @@
-import time
+from typing import Callable, List, Optional, Tuple
 
 from playwright.sync_api import (
+    BrowserContext,
     Page,
-    sync_playwright, 
     TimeoutError
 )
 
+from twitfetch.errors import PageLoadTimeoutError
+from twitfetch._browser_manager import BrowserManager
 from twitfetch._constants import TWEET_ARTICLE
+from twitfetch._metrics import Metrics, timed
+from twitfetch._profile import BrowserProfile, ResourceBlocker
 
 class PlaywrightBrowser:
     """
     Playwright browsing interface with helper methods.
+
+    When a profile is given, requests it does not need are aborted and Chromium is launched
+    with its switches. Every request can be recorded to a HAR archive, or served from one
+    recorded earlier so that runs are reproducible offline. When metrics are given, the
+    seconds spent navigating, waiting and scrolling are observed.
+
+    Without a manager, the browser starts Playwright and Chromium of its own and stops them
+    on exit. With one, it only opens a context, taking the warm context kept under its
+    context key if any, and hands it back on exit. Chromium then runs with the headless
+    setting and launch switches the manager was created with, whatever is passed here.
+
+    The page can be swapped for a fresh one after a number of timelines or once its
+    JavaScript heap outgrows a threshold.
     """
     def __init__(
         self,
         headless: bool = False,
-        delay: float = 0.5,
-        timeout: int = 10000
+        timeout: int = 10000,
+        storage_state: Optional[dict] = None,
+        profile: Optional[BrowserProfile] = None,
+        record_har: Optional[str] = None,
+        replay_har: Optional[str] = None,
+        metrics: Optional[Metrics] = None,
+        manager: Optional[BrowserManager] = None,
+        context_key: Optional[str] = None,
+        recycle_after: Optional[int] = None,
+        max_page_memory: Optional[int] = None
     ):
-        self._delay = delay
         self._timeout = timeout
-        self.browser = (
-            sync_playwright().start()
-            .chromium.launch(headless=headless)
+        self._metrics = metrics
+        self._recycle_after = recycle_after
+        self._max_page_memory = max_page_memory
+        self._timelines = 0
+        self._listeners: List[Tuple[str, Callable]] = []
+
+        self._owns_manager = manager is None
+        self.manager = BrowserManager(headless=headless, profile=profile) if manager is None else manager
+        self.browser = self.manager.start()
+
+        # Contexts recording or replaying an archive are never shared
+        self._context_key = None
+        if not self._owns_manager and record_har is None and replay_har is None:
+            self._context_key = context_key
+
+        context = None if self._context_key is None else self.manager.acquire(key=self._context_key)
+        self.warm = context is not None
+        self.context: BrowserContext = context if context is not None else self.manager.new_context(
+            storage_state=storage_state,
+            record_har=record_har
         )
 
-        self.page: Page = self.browser.new_page()
+        # Requests missing from the archive are aborted rather than sent to Twitter
+        if replay_har is not None:
+            self.context.route_from_har(replay_har, not_found='abort')
+
+        self.resource_blocker: Optional[ResourceBlocker] = None
+        if profile is not None:
+            self.resource_blocker = ResourceBlocker(profile=profile)
+            self.context.route('**/*', self.resource_blocker.handle)
+            self.listen(event='requestfinished', handler=self.resource_blocker.record_request)
+
+        self.page: Page = self.context.new_page()
+
+    def listen(self, event: str, handler: Callable) -> None:
+        """
+        Register a handler of a browser context event, removed again on exit.
+        """
+
+        self.context.on(event, handler)
+        self._listeners.append((event, handler))
+
+    def page_memory(self) -> Optional[int]:
+        """
+        The bytes of JavaScript heap used by the page, None if Chromium does not report it.
+        """
+
+        return self.page.evaluate('performance.memory ? performance.memory.usedJSHeapSize : null')
+
+    def recycle_page(self) -> None:
+        """
+        Replace the page with a fresh one sharing the cookies of the browser context.
+        """
+
+        page = self.page
+        self.page = self.context.new_page()
+        page.close()
+        self._timelines = 0
+
+    def recycle_if_needed(self) -> bool:
+        """
+        Called before loading a timeline, replace the page once it has loaded recycle_after
+        timelines or holds too much memory. Other navigations, e.g. logging in, do not count.
+
+        Returns:
+            bool: Whether the page was replaced.
+        """
+
+        recycle = self._recycle_after is not None and self._timelines >= self._recycle_after
+        if not recycle and self._max_page_memory is not None:
+            memory = self.page_memory()
+            recycle = memory is not None and memory > self._max_page_memory
+
+        if recycle:
+            self.recycle_page()
+        self._timelines += 1
+        return recycle
 
     def refresh(self) -> None:
         """
@@ -37,15 +132,14 @@ class PlaywrightBrowser:
 
     def _wait_for_load(self) -> None:
         """
-        Function used to wait some time until DOM is loaded. 
+        Wait until the document of the page has finished loading.
         """
 
-        try:
-            self.page.wait_for_load_state("domcontentloaded", timeout=self._timeout)
-            self.page.wait_for_function("document.readyState === 'complete'")
-            time.sleep(self._delay)
-        except TimeoutError:
-            pass
+        with timed(self._metrics, 'wait_seconds', kind='load'):
+            try:
+                self.page.wait_for_load_state('load', timeout=self._timeout)
+            except TimeoutError:
+                raise PageLoadTimeoutError(url=self.page.url, timeout=self._timeout / 1000)
 
     def scroll_down(self, to_bottom: bool = False) -> None:
         """
@@ -57,8 +151,39 @@ class PlaywrightBrowser:
         else:
             action = 'window.scrollBy(0, 1000)'
 
-        self.page.evaluate(action)
-        self.page.wait_for_timeout(2000)
+        with timed(self._metrics, 'scroll_seconds'):
+            self.page.evaluate(action)
+
+    def wait_for_element(self, selector: str, timeout: Optional[int] = None) -> None:
+        """
+        Wait until an element matching the selector is attached to the page.
+        """
+
+        with timed(self._metrics, 'wait_seconds', kind='element'):
+            self.page.wait_for_selector(
+                selector,
+                state='attached',
+                timeout=self._timeout if timeout is None else timeout
+            )
+
+    def mark_element(self, selector: str, marker: str) -> None:
+        """
+        Set a marker attribute on the first element matching the selector.
+        """
+
+        self.page.eval_on_selector(selector, '(e, marker) => e.setAttribute(marker, "")', marker)
+
+    def wait_for_change(self, gone: str, present: str, timeout: Optional[int] = None) -> None:
+        """
+        Wait until either no element matches one selector or an element matches another.
+        """
+
+        with timed(self._metrics, 'wait_seconds', kind='change'):
+            self.page.wait_for_function(
+                '([gone, present]) => !document.querySelector(gone) || !!document.querySelector(present)',
+                arg=[gone, present],
+                timeout=self._timeout if timeout is None else timeout
+            )
 
     def click_on_selection(self, selector: str) -> None:
         """
@@ -82,15 +207,18 @@ class PlaywrightBrowser:
         Navigate to a webpage.
         """
 
-        self.page.goto(url, wait_until='load', timeout=20000)
+        with timed(self._metrics, 'navigation_seconds'):
+            try:
+                self.page.goto(url, wait_until='load', timeout=self._timeout)
+            except TimeoutError:
+                raise PageLoadTimeoutError(url=url, timeout=self._timeout / 1000)
 
         if wait_for_tweet:
-            self.page.wait_for_selector(
-                f'{TWEET_ARTICLE.tag}[{TWEET_ARTICLE.attribute}="{TWEET_ARTICLE.attribute_value}"]',
-                timeout=self._timeout
-            )
-        else:
-            self._wait_for_load()
+            with timed(self._metrics, 'wait_seconds', kind='tweet'):
+                self.page.wait_for_selector(
+                    f'{TWEET_ARTICLE.tag}[{TWEET_ARTICLE.attribute}="{TWEET_ARTICLE.attribute_value}"]',
+                    timeout=self._timeout
+                )
 
     def go_back_page(self) -> None:
         """
@@ -98,14 +226,56 @@ class PlaywrightBrowser:
         """
 
         self.page.go_back()
-        self.page.wait_for_timeout(2000)
+        self._wait_for_load()
+
+    def new_page(self) -> Page:
+        """
+        Open another page sharing the cookies of the browser context.
+        """
+
+        return self.context.new_page()
+
+    def close_page(self, page: Page) -> None:
+        """
+        Close a page opened with new_page.
+        """
+
+        page.close()
+
+    def storage_state(self) -> dict:
+        """
+        Retrieve the cookies and local storage of the browser context.
+        """
+
+        return self.context.storage_state()
+
+    def clear_storage_state(self) -> None:
+        """
+        Remove the cookies of the browser context.
+        """
+
+        self.context.clear_cookies()
 
     def exit_browser(self) -> None:
         """
-        Close the browser instance.
+        Close the browser context, saving the HAR archive when recording, or hand it back to
+        the manager warm, and stop Playwright and Chromium when started by this browser.
         """
 
-        self.browser.close()
+        if self.context is None:
+            return
+
+        for event, handler in self._listeners:
+            self.context.remove_listener(event, handler)
+        self._listeners = []
+        if self.resource_blocker is not None:
+            self.context.unroute('**/*', self.resource_blocker.handle)
+
+        self.manager.release(context=self.context, key=self._context_key)
+        self.context = None
+
+        if self._owns_manager:
+            self.manager.close()
 
     def page_to_dom(self) -> str:
         """
@@ -0,0 +1,193 @@
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import atexit
+import threading
+
+from playwright.sync_api import (
+    Browser,
+    BrowserContext,
+    Playwright,
+    sync_playwright
+)
+
+from twitfetch._profile import BrowserProfile
+
+class BrowserManager:
+    """
+    Starts Playwright and Chromium once, or connects to a long-running Chromium over CDP,
+    and hands out browser contexts, so that each fetcher pays for a context rather than a
+    browser cold start. Contexts released under a key, e.g. the logged in username, are
+    kept warm and handed out again with their cookies.
+
+    Chromium is launched with the headless setting and profile switches of the manager, the
+    fetchers sharing it cannot change them. Requests blocked by a profile are set per context.
+
+    Like every sync Playwright object, a manager can only be used from the thread that
+    started it.
+
+    Args:
+        headless (bool): Whether Chromium is launched headless.
+        profile (Optional[BrowserProfile]): The profile whose switches Chromium is launched with.
+        cdp_url (Optional[str]): The CDP endpoint of a running Chromium to connect to instead
+            of launching one, e.g. 'http://localhost:9222'.
+        max_warm (int): The number of warm contexts kept, the least recently released
+            ones are closed first.
+
+    Attributes:
+        browser (Optional[Browser]): The browser, None until started.
+    """
+    def __init__(
+        self,
+        headless: bool = False,
+        profile: Optional[BrowserProfile] = None,
+        cdp_url: Optional[str] = None,
+        max_warm: int = 4
+    ):
+        self._headless = headless
+        self._profile = profile
+        self._cdp_url = cdp_url
+        self._max_warm = max_warm
+        self._playwright: Optional[Playwright] = None
+        self._warm: 'OrderedDict[str, BrowserContext]' = OrderedDict()
+
+        self.browser: Optional[Browser] = None
+
+    def start(self) -> Browser:
+        """
+        Start Playwright and launch or connect to Chromium, unless already started.
+
+        Returns:
+            Browser: The browser.
+        """
+
+        if self.browser is None:
+            self._playwright = sync_playwright().start()
+
+            if self._cdp_url is not None:
+                self.browser = self._playwright.chromium.connect_over_cdp(self._cdp_url)
+            else:
+                self.browser = self._playwright.chromium.launch(
+                    headless=self._headless,
+                    args=[] if self._profile is None else list(self._profile.launch_args)
+                )
+
+        return self.browser
+
+    def new_context(
+        self,
+        storage_state: Optional[dict] = None,
+        record_har: Optional[str] = None
+    ) -> BrowserContext:
+        """
+        Open a fresh browser context.
+
+        Args:
+            storage_state (Optional[dict]): The cookies and local storage to start with.
+            record_har (Optional[str]): The path of the HAR archive every request is recorded to.
+        """
+
+        return self.start().new_context(storage_state=storage_state, record_har_path=record_har)
+
+    def acquire(self, key: str) -> Optional[BrowserContext]:
+        """
+        Take the warm context released under a key.
+
+        Returns:
+            Optional[BrowserContext]: The context, None if no context is kept under the key.
+        """
+
+        return self._warm.pop(key, None)
+
+    def release(self, context: BrowserContext, key: Optional[str] = None) -> None:
+        """
+        Keep a context warm under a key, closing its pages, or close it without a key.
+
+        Args:
+            context (BrowserContext): A context opened by new_context.
+            key (Optional[str]): The key the context is handed out again under.
+        """
+
+        if key is None:
+            context.close()
+            return
+
+        for page in context.pages:
+            page.close()
+
+        previous = self._warm.pop(key, None)
+        if previous is not None:
+            previous.close()
+        self._warm[key] = context
+
+        while len(self._warm) > self._max_warm:
+            _, oldest = self._warm.popitem(last=False)
+            oldest.close()
+
+    def close(self) -> None:
+        """
+        Close every warm context, the browser, or the connection to it, and stop Playwright.
+        """
+
+        while self._warm:
+            _, context = self._warm.popitem()
+            context.close()
+
+        if self.browser is not None:
+            self.browser.close()
+            self.browser = None
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+
+    def __enter__(self) -> 'BrowserManager':
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+# Managers shared within each thread, keyed by thread and launch options
+# Thread idents are reused once a thread exits, the managers of a thread die with it
+_SHARED = threading.local()
+
+def _thread_managers() -> Dict[Tuple[bool, Optional[str]], BrowserManager]:
+    """
+    The shared managers of the calling thread, keyed by their launch options.
+    """
+
+    managers = getattr(_SHARED, 'managers', None)
+    if managers is None:
+        managers = _SHARED.managers = {}
+    return managers
+
+def shared_browser_manager(headless: bool = False, cdp_url: Optional[str] = None) -> BrowserManager:
+    """
+    Retrieve the browser manager shared by every fetcher of the calling thread, started
+    once and closed when the process exits.
+
+    Args:
+        headless (bool): Whether Chromium is launched headless.
+        cdp_url (Optional[str]): The CDP endpoint of a running Chromium to connect to.
+
+    Returns:
+        BrowserManager: The shared manager.
+    """
+
+    managers = _thread_managers()
+
+    manager = managers.get((headless, cdp_url))
+    if manager is None:
+        manager = managers[(headless, cdp_url)] = BrowserManager(headless=headless, cdp_url=cdp_url)
+    return manager
+
+@atexit.register
+def _close_shared() -> None:
+    # Exit handlers run on the main thread, managers started on other threads can only be
+    # closed by them, their processes go down with the Playwright driver
+    managers = _thread_managers()
+    for manager in list(managers.values()):
+        try:
+            manager.close()
+        except Exception:
+            pass
+    managers.clear()
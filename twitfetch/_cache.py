@@ -0,0 +1,238 @@
+from collections import OrderedDict
+from typing import Callable, Iterator, List, Optional, Set, Tuple
+import hashlib
+import json
+import os
+import threading
+import time
+
+from twitfetch._constants import CACHE_MAX_ENTRIES, CACHE_TTL
+from twitfetch._data_structures import CacheStats
+from twitfetch._json import get_decoder
+from twitfetch._parse import find_next_cursor
+
+CacheKey = Tuple[str, str, Optional[str]]
+
+class ResponseCache:
+    """
+    Caches decoded GraphQL timeline pages keyed by endpoint, source and cursor, in memory
+    with LRU eviction and optionally on disk, both expiring entries after a TTL.
+
+    Args:
+        ttl (float): Seconds a page stays fresh.
+        max_entries (int): The number of pages kept in memory.
+        directory (Optional[str]): Directory where pages are also kept across runs,
+            pages only live in memory if None.
+        max_disk_bytes (Optional[int]): The size cap of the directory, unbounded if None.
+        clock (Callable[[], float]): The epoch seconds clock.
+
+    Attributes:
+        stats (CacheStats): The hit and miss counts.
+    """
+    def __init__(
+        self,
+        ttl: float = CACHE_TTL,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        directory: Optional[str] = None,
+        max_disk_bytes: Optional[int] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._directory = directory
+        self._max_disk_bytes = max_disk_bytes
+        self._clock = clock
+        self._decode = get_decoder()
+        self._lock = threading.Lock()
+        self._memory: 'OrderedDict[CacheKey, Tuple[float, List[dict]]]' = OrderedDict()
+        self._disk_bytes = 0
+
+        self.stats = CacheStats()
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._disk_bytes = sum(size for _, _, size in self._disk_files())
+
+    def _path(self, key: CacheKey) -> str:
+        digest = hashlib.sha1('\0'.join(str(part) for part in key).encode()).hexdigest()
+        return os.path.join(self._directory, f'{digest}.json')
+
+    def _disk_files(self) -> List[Tuple[float, str, int]]:
+        files = []
+        for entry in os.scandir(self._directory):
+            if entry.name.endswith('.json'):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.path, stat.st_size))
+        return files
+
+    def _remove(self, path: str) -> None:
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+            self._disk_bytes -= size
+        except FileNotFoundError:
+            pass
+
+    def get(self, endpoint: str, source: str, cursor: Optional[str]) -> Optional[List[dict]]:
+        """
+        Look up a fresh timeline page.
+
+        Args:
+            endpoint (str): The GraphQL endpoint of the timeline.
+            source (str): The screen name or list ID of the timeline.
+            cursor (Optional[str]): The cursor the page is requested with, None for the first page.
+
+        Returns:
+            Optional[List[dict]]: The GraphQL responses of the page, None if nothing fresh is cached.
+        """
+
+        key = (endpoint, source.lower(), cursor)
+        now = self._clock()
+
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None:
+                if now - cached[0] < self._ttl:
+                    self._memory.move_to_end(key)
+                    self.stats.hits += 1
+                    self.stats.memory_hits += 1
+                    return cached[1]
+
+                del self._memory[key]
+                self.stats.expired += 1
+
+            if self._directory is not None:
+                path = self._path(key=key)
+                try:
+                    stored_at = os.path.getmtime(path)
+                    if now - stored_at < self._ttl:
+                        with open(path, 'rb') as f:
+                            page = self._decode(f.read())
+
+                        self._remember(key=key, stored_at=stored_at, page=page)
+                        self.stats.hits += 1
+                        self.stats.disk_hits += 1
+                        return page
+
+                    self._remove(path=path)
+                    self.stats.expired += 1
+                except (FileNotFoundError, ValueError):
+                    pass
+
+            self.stats.misses += 1
+            return None
+
+    def put(self, endpoint: str, source: str, cursor: Optional[str], page: List[dict]) -> None:
+        """
+        Store a timeline page.
+
+        Args:
+            endpoint (str): The GraphQL endpoint of the timeline.
+            source (str): The screen name or list ID of the timeline.
+            cursor (Optional[str]): The cursor the page was requested with, None for the first page.
+            page (List[dict]): The GraphQL responses of the page.
+        """
+
+        key = (endpoint, source.lower(), cursor)
+        now = self._clock()
+
+        with self._lock:
+            self._remember(key=key, stored_at=now, page=page)
+
+            if self._directory is not None:
+                path = self._path(key=key)
+                self._remove(path=path)
+
+                # Write atomically, concurrent fetches may store the same page
+                temp_path = f'{path}.{threading.get_ident()}.tmp'
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(page, f, separators=(',', ':'))
+                os.utime(temp_path, (now, now))
+                os.replace(temp_path, path)
+                self._disk_bytes += os.path.getsize(path)
+
+                if self._max_disk_bytes is not None and self._disk_bytes > self._max_disk_bytes:
+                    self._evict_disk()
+
+    def _remember(self, key: CacheKey, stored_at: float, page: List[dict]) -> None:
+        self._memory[key] = (stored_at, page)
+        self._memory.move_to_end(key)
+
+        while len(self._memory) > self._max_entries:
+            self._memory.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _evict_disk(self) -> None:
+        """
+        Remove the oldest pages on disk until the directory fits its size cap.
+        """
+
+        for _, path, _ in sorted(self._disk_files()):
+            if self._disk_bytes <= self._max_disk_bytes:
+                return
+            self._remove(path=path)
+            self.stats.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Drop every cached page.
+        """
+
+        with self._lock:
+            self._memory.clear()
+            if self._directory is not None:
+                for _, path, _ in self._disk_files():
+                    self._remove(path=path)
+
+    def pages(
+        self,
+        endpoint: str,
+        source: str,
+        open_pages: Callable[[], Iterator[List[dict]]]
+    ) -> Iterator[List[dict]]:
+        """
+        Walk a timeline from the cache, opening it only once a page is missing or stale.
+
+        Pages are keyed by the bottom cursor of the page before them. When the walk falls
+        back to the timeline, the pages already served from the cache are skipped.
+
+        Args:
+            endpoint (str): The GraphQL endpoint of the timeline.
+            source (str): The screen name or list ID of the timeline.
+            open_pages (Callable[[], Iterator[List[dict]]]): Opens the timeline from its first page.
+
+        Yields:
+            List[dict]: The GraphQL responses of each page.
+        """
+
+        served: Set[Optional[str]] = set()
+        cursor = None
+
+        while True:
+            page = self.get(endpoint=endpoint, source=source, cursor=cursor)
+            if page is None:
+                break
+
+            served.add(cursor)
+            yield page
+
+            cursor = find_next_cursor(response=page[-1], cursor=cursor) if page else None
+            if cursor is None:
+                return
+
+        pages = open_pages()
+        cursor = None
+        keyed = True
+
+        try:
+            for page in pages:
+                if keyed:
+                    self.put(endpoint=endpoint, source=source, cursor=cursor, page=page)
+                if not keyed or cursor not in served:
+                    yield page
+
+                # Pages past one without a next cursor cannot be keyed
+                cursor = find_next_cursor(response=page[-1], cursor=cursor) if page else None
+                keyed = keyed and cursor is not None
+        finally:
+            pages.close()
@@ -0,0 +1,143 @@
+from collections import deque
+from typing import Callable, Deque, List, Optional, Union
+
+from playwright.sync_api import BrowserContext, Error, Page, Response
+
+from twitfetch._constants import CAPTURE_MAX_PENDING, Endpoints, GRAPHQL_ENDPOINT
+from twitfetch._data_structures import CapturedResponse, CaptureStats
+from twitfetch._metrics import Metrics
+from twitfetch._ratelimit import RateLimiter
+
+def operation_name(url: str) -> Optional[str]:
+    """
+    Extract the operation name of a GraphQL request URL without parsing it in full.
+
+    Args:
+        url (str): The URL of a request.
+
+    Returns:
+        Optional[str]: The operation name, None if the URL is not a GraphQL query.
+    """
+
+    if GRAPHQL_ENDPOINT not in url:
+        return None
+    return url.split('?', 1)[0].rstrip('/').rsplit('/', 1)[-1]
+
+def endpoint_matcher(endpoint: Endpoints) -> Callable[[Response], bool]:
+    """
+    Build a predicate detecting the responses of a GraphQL operation, e.g. to wait for one.
+
+    Operations are compared by name rather than by substring, so that UserTweets does not
+    match UserTweetsAndReplies.
+
+    Args:
+        endpoint (Endpoints): The GraphQL endpoint.
+    """
+
+    name = endpoint.value
+    return lambda response: operation_name(url=response.url) == name
+
+class ResponseCapture:
+    """
+    Scoped capture of the responses of a GraphQL operation. While open, a single listener
+    copies the body of every matching response into a bounded queue and lets go of the
+    playwright response, so that memory stays flat however many timelines are captured.
+
+    Use it as a context manager, or call open() and close() when the scope spans calls.
+
+    Args:
+        target (Union[Page, BrowserContext]): The page or browser context to listen to.
+        endpoint (Endpoints): The GraphQL endpoint.
+        rate_limiter (Optional[RateLimiter]): The rate limiter updated with the budget
+            announced by every response of the endpoint.
+        metrics (Optional[Metrics]): The metrics counting every response of the endpoint.
+        max_pending (int): The number of responses queued before the oldest are dropped,
+            consumers check stats.dropped since a dropped page loses its tweets.
+
+    Attributes:
+        stats (CaptureStats): The counters of the capture.
+    """
+    def __init__(
+        self,
+        target: Union[Page, BrowserContext],
+        endpoint: Endpoints,
+        rate_limiter: Optional[RateLimiter] = None,
+        metrics: Optional[Metrics] = None,
+        max_pending: int = CAPTURE_MAX_PENDING
+    ):
+        self._target = target
+        self._endpoint = endpoint
+        self._rate_limiter = rate_limiter
+        self._metrics = metrics
+        self._queue: Deque[CapturedResponse] = deque(maxlen=max_pending)
+        self._open = False
+
+        self.stats = CaptureStats()
+
+    def _on_response(self, response: Response) -> None:
+        """
+        Listener copying the matching responses into the queue.
+
+        Args:
+            response (Response): The response from network request.
+        """
+
+        if operation_name(url=response.url) != self._endpoint.value:
+            self.stats.ignored += 1
+            return
+
+        endpoint = self._endpoint.value
+        self.stats.matched += 1
+
+        if self._rate_limiter is not None:
+            self._rate_limiter.update(endpoint=endpoint, headers=response.headers)
+        if self._metrics is not None:
+            self._metrics.increment('responses', endpoint=endpoint, status=str(response.status))
+
+        content = b''
+        if response.status == 200:
+            try:
+                content = response.body()
+            except Error:
+                self.stats.dropped += 1
+                return
+            self.stats.bytes_received += len(content)
+
+        if len(self._queue) == self._queue.maxlen:
+            self.stats.dropped += 1
+        self._queue.append(CapturedResponse(url=response.url, status=response.status, content=content))
+
+    def drain(self) -> List[CapturedResponse]:
+        """
+        Take every response captured since the last drain, oldest first.
+        """
+
+        captured = list(self._queue)
+        self._queue.clear()
+        return captured
+
+    def open(self) -> 'ResponseCapture':
+        """
+        Start listening to the responses of the target.
+        """
+
+        if not self._open:
+            self._target.on('response', self._on_response)
+            self._open = True
+        return self
+
+    def close(self) -> None:
+        """
+        Stop listening and drop every response not drained yet.
+        """
+
+        if self._open:
+            self._target.remove_listener('response', self._on_response)
+            self._open = False
+        self._queue.clear()
+
+    def __enter__(self) -> 'ResponseCapture':
+        return self.open()
+
+    def __exit__(self, *args) -> None:
+        self.close()
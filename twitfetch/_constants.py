@@ -11,7 +11,91 @@ WHITE = '\033[0m'
 # Twitter URLs
 URL_TWITTER = 'https://twitter.com'
 URL_TWITTER_LOGIN = 'https://twitter.com/i/flow/login'
+URL_TWITTER_HOME = 'https://twitter.com/home'
 URL_TWITTER_LISTS = 'https://twitter.com/i/lists'
+URL_TWITTER_SEARCH = 'https://twitter.com/search'
+URL_GRAPHQL_API = 'https://twitter.com/i/api/graphql'
+
+# Seconds to wait for a new timeline page after scrolling, and how often to scroll
+# again before concluding the timeline has ended
+SCROLL_RESPONSE_TIMEOUT = 5
+SCROLL_RETRIES = 2
+
+# Milliseconds between checks on pages loading concurrently
+POLL_INTERVAL = 100
+
+# Headers announcing the rate limit budget of an endpoint, and the status of rejected requests
+HEADER_RATE_LIMIT = 'x-rate-limit-limit'
+HEADER_RATE_LIMIT_REMAINING = 'x-rate-limit-remaining'
+HEADER_RATE_LIMIT_RESET = 'x-rate-limit-reset'
+STATUS_RATE_LIMITED = 429
+
+# Tweet IDs are snowflakes holding the milliseconds since the Twitter epoch above 22 bits
+SNOWFLAKE_EPOCH_MS = 1288834974657
+SNOWFLAKE_TIMESTAMP_SHIFT = 22
+
+# Month abbreviations of GraphQL creation dates
+MONTHS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
+}
+
+# Files of a recording, the HAR archive replayed to the browser and the directory of saved pages
+HAR_FILE = 'session.har'
+PAGES_DIR = 'pages'
+
+# Prefix of the metric names exported to Prometheus and OpenTelemetry
+METRICS_PREFIX = 'twitfetch_'
+
+# Seconds cached timeline pages stay fresh, and the number kept in memory
+CACHE_TTL = 300
+CACHE_MAX_ENTRIES = 256
+
+# Responses a capture holds before dropping the oldest
+CAPTURE_MAX_PENDING = 64
+
+# Days of tweets each search of a backfill covers
+SEARCH_SLICE_DAYS = 7
+
+# Seconds a worker of a sharded run holds a job before it is handed out again, how often
+# a job is attempted, the seconds before the first retry, doubled on every retry, and the
+# seconds between checks on an empty queue
+LEASE_SECONDS = 600
+JOB_MAX_ATTEMPTS = 3
+JOB_RETRY_DELAY = 30
+QUEUE_POLL_INTERVAL = 1
+
+# Cookie set by Twitter once an account is logged in
+AUTH_COOKIE = 'auth_token'
+
+# Prefixes of timeline cursor entries, the bottom one points to the next page
+CURSOR = 'cursor-'
+CURSOR_BOTTOM = 'cursor-bottom'
+
+# Resource types and hosts a lightweight browser profile blocks or lets through, the
+# allowed hosts serve the app bundles, the GraphQL API and the login challenge. Requests
+# of type 'other' are let through, the app boots and logs in through some of them
+BLOCKED_RESOURCE_TYPES = ('image', 'media', 'font', 'stylesheet', 'texttrack', 'manifest')
+ALLOWED_HOSTS = ('twitter.com', 'x.com', 'twimg.com', 'arkoselabs.com')
+
+# Chromium switches keeping the memory footprint of a worker low
+LOW_MEMORY_ARGS = (
+    '--disable-gpu',
+    '--disable-dev-shm-usage',
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--disable-features=Translate,MediaRouter,OptimizationHints',
+    '--mute-audio',
+    '--no-first-run',
+    '--renderer-process-limit=2',
+    '--js-flags=--max-old-space-size=512'
+)
+
+# Attribute marking the login input typed into, to detect when the step is over
+LOGIN_STEP_MARKER = 'data-twitfetch-step'
 
 # HTML elements
 LOGIN = Element(tag='input', attribute='class')
@@ -23,12 +107,16 @@ class Endpoints(Enum):
     Store GraphQL endpoints.
 
     Attributes:
+        UserByScreenName (str): Endpoint for details of a specific Twitter account
         UserTweets (str): Endpoint for tweets of a specific Twitter account
         ListLatestTweetsTimeline (str): Endpoint for tweets of a specific Twitter list
+        SearchTimeline (str): Endpoint for tweets matching a search query
     """
 
+    UserByScreenName = 'UserByScreenName'
     UserTweets = 'UserTweets'
     ListLatestTweetsTimeline = 'ListLatestTweetsTimeline'
+    SearchTimeline = 'SearchTimeline'
 
 class UserKeys:
     """
@@ -68,6 +156,20 @@ class GeneralKeys:
         INSTRUCTIONS (str): Key for the instructinos.
         ENTRIES (str): Key for the entries.
         RETWEET (str): Key for the retweet.
+        ENTRY (str): Key for a single entry.
+        ENTRY_ID (str): Key for the entry ID.
+        CONTENT (str): Key for the entry content.
+        VALUE (str): Key for the cursor value.
+        TYPE (str): Key for the instruction type.
+        TYPENAME (str): Key for the GraphQL type name.
+        ITEM_CONTENT (str): Key for the content of a timeline item.
+        ITEMS (str): Key for the items of a timeline module.
+        ITEM (str): Key for a single item of a timeline module.
+        TWEET_RESULTS (str): Key for the tweet results.
+        USER_RESULTS (str): Key for the user results.
+        RESULT (str): Key for a single result.
+        CORE (str): Key for the core details of a tweet or user.
+        TWEET (str): Key for the tweet wrapped in visibility results.
     """
 
     LEGACY = 'legacy'
@@ -75,6 +177,34 @@ class GeneralKeys:
     INSTRUCTIONS = 'instructions'
     ENTRIES = 'entries'
     RETWEET = 'retweeted_status_result'
+    ENTRY = 'entry'
+    ENTRY_ID = 'entryId'
+    CONTENT = 'content'
+    VALUE = 'value'
+    TYPE = 'type'
+    TYPENAME = '__typename'
+    ITEM_CONTENT = 'itemContent'
+    ITEMS = 'items'
+    ITEM = 'item'
+    TWEET_RESULTS = 'tweet_results'
+    USER_RESULTS = 'user_results'
+    RESULT = 'result'
+    CORE = 'core'
+    TWEET = 'tweet'
+
+# Instruction adding entries to a timeline, other instructions pin or replace entries
+ADD_ENTRIES = 'TimelineAddEntries'
+
+# Type of tweet results wrapping the tweet with visibility restrictions
+TWEET_WITH_VISIBILITY = 'TweetWithVisibilityResults'
+
+# Known paths from the root of a GraphQL response to the timeline instructions
+TIMELINE_PATHS = [
+    ('data', 'user', 'result', 'timeline_v2', 'timeline', 'instructions'),
+    ('data', 'user', 'result', 'timeline', 'timeline', 'instructions'),
+    ('data', 'list', 'tweets_timeline', 'timeline', 'instructions'),
+    ('data', 'search_by_raw_query', 'search_timeline', 'timeline', 'instructions')
+]
 
 TWEET_COLUMNS = [
     getattr(TweetKeys, attr) for attr in dir(TweetKeys) if not attr.startswith("__")
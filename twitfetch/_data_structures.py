@@ -1,7 +1,8 @@
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
+from enum import Enum
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 @dataclass
 class Element:
@@ -18,21 +19,331 @@ class Element:
     attribute: str
     attribute_value: Optional[str] = None
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Tweet:
     """
-    Tweet details pulled from the GraphQL response.
+    Tweet details pulled from the GraphQL response. Slotted and immutable, so large
+    backfills hold no per-tweet attribute dictionary.
 
     Attributes:
         user_name (str): The user name of a Twitter account.
-        user_id (str): The user ID of a Twitter account.
-        tweet_id (str): The tweet ID.
-        created (datetime): The UTC datetime of tweet creation.
+        user_id (int): The user ID of a Twitter account.
+        tweet_id (int): The tweet ID.
+        created (datetime): The timezone aware UTC datetime of tweet creation.
         content (str): The string content of the tweet.
     """
 
     user_name: str
-    user_id: str
-    tweet_id: str
+    user_id: int
+    tweet_id: int
     created: datetime
-    content: str
\ No newline at end of file
+    content: str
+
+@dataclass
+class GraphQLOperation:
+    """
+    Template of a GraphQL operation captured from a request made by the Twitter app.
+
+    Attributes:
+        name (str): The operation name.
+        query_id (str): The query ID of the operation.
+        variables (dict): The variables sent with the captured request.
+        features (dict): The feature flags sent with the captured request.
+        field_toggles (Optional[dict]): The field toggles sent with the captured request.
+    """
+
+    name: str
+    query_id: str
+    variables: dict
+    features: dict
+    field_toggles: Optional[dict] = None
+
+
+@dataclass
+class FetchResult:
+    """
+    Outcome of fetching the timeline of a single source.
+
+    Attributes:
+        source (str): The screen name or list ID the timeline belongs to.
+        tweets (List[Tweet]): The tweets collected before the fetch finished or failed.
+        error (Optional[Exception]): The error raised while fetching, None if successful.
+    """
+
+    source: str
+    tweets: List[Tweet] = field(default_factory=list)
+    error: Optional[Exception] = None
+
+
+@dataclass
+class HighWaterMark:
+    """
+    Newest tweet seen on a timeline by a previous fetch.
+
+    Attributes:
+        tweet_id (int): The tweet ID.
+        created (Optional[datetime]): The creation datetime of the tweet.
+    """
+
+    tweet_id: int
+    created: Optional[datetime] = None
+
+
+@dataclass
+class Credentials:
+    """
+    Login details of a Twitter account.
+
+    Attributes:
+        username (str): The username, email or phone number used to login.
+        password (str): The password.
+    """
+
+    username: str
+    password: str
+
+
+class SessionState(Enum):
+    """
+    Health of a logged in session within a session pool.
+    """
+
+    ACTIVE = 'active'
+    RATE_LIMITED = 'rate_limited'
+    LOCKED_OUT = 'locked_out'
+    LOGGING_IN = 'logging_in'
+    INVALID = 'invalid'
+
+
+@dataclass
+class SessionHealth:
+    """
+    Health tracked for a session of a session pool.
+
+    Attributes:
+        username (str): The username the session is logged in with.
+        state (SessionState): The current state of the session.
+        available_at (float): The epoch second from which a rate limited or locked out
+            session is used or logged in again.
+        failures (int): The number of consecutive failed fetches or logins.
+        fetches (int): The number of successful fetches.
+        last_error (Optional[Exception]): The latest error raised by the session.
+    """
+
+    username: str
+    state: SessionState = SessionState.LOGGING_IN
+    available_at: float = 0.0
+    failures: int = 0
+    fetches: int = 0
+    last_error: Optional[Exception] = None
+
+
+@dataclass
+class MetricEvent:
+    """
+    Single measurement handed to metric hooks.
+
+    Attributes:
+        kind (str): Either 'counter' for an increment or 'summary' for an observed value.
+        name (str): The metric name, e.g. 'navigation_seconds'.
+        value (float): The increment or observed value.
+        labels (Dict[str, str]): The labels of the metric, e.g. endpoint.
+    """
+
+    kind: str
+    name: str
+    value: float
+    labels: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class MetricSummary:
+    """
+    Running aggregate of the values observed for a metric.
+
+    Attributes:
+        count (int): The number of observations.
+        total (float): The sum of the observations.
+        minimum (Optional[float]): The smallest observation.
+        maximum (Optional[float]): The largest observation.
+    """
+
+    count: int = 0
+    total: float = 0.0
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+
+@dataclass
+class CacheStats:
+    """
+    Hit and miss counts of a response cache.
+
+    Attributes:
+        hits (int): The lookups served from memory or disk.
+        memory_hits (int): The lookups served from memory.
+        disk_hits (int): The lookups served from disk.
+        misses (int): The lookups finding nothing fresh.
+        expired (int): The entries dropped for outliving the TTL.
+        evictions (int): The entries dropped to honor the size caps.
+    """
+
+    hits: int = 0
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass
+class CapturedResponse:
+    """
+    Raw GraphQL response copied out of the browser, holding no live playwright handle.
+
+    Attributes:
+        url (str): The URL of the request.
+        status (int): The status of the response.
+        content (bytes): The body of the response, empty unless the request succeeded.
+    """
+
+    url: str
+    status: int
+    content: bytes = b''
+
+    def body(self) -> bytes:
+        return self.content
+
+
+@dataclass
+class CaptureStats:
+    """
+    Counters of a response capture.
+
+    Attributes:
+        matched (int): The responses of the captured operation.
+        ignored (int): The responses of any other request.
+        dropped (int): The responses dropped because the queue was full or the body
+            could not be read.
+        bytes_received (int): The body bytes of the matched responses.
+    """
+
+    matched: int = 0
+    ignored: int = 0
+    dropped: int = 0
+    bytes_received: int = 0
+
+
+@dataclass
+class SearchSlice:
+    """
+    Slice of a backfill fetched with a search of its own.
+
+    Attributes:
+        query (str): The search query.
+        since (datetime): The start of the slice, inclusive.
+        until (datetime): The end of the slice, exclusive.
+    """
+
+    query: str
+    since: datetime
+    until: datetime
+
+
+class JobKind(Enum):
+    """
+    Timeline fetched by a job of a work queue.
+    """
+
+    USER = 'user'
+    LIST = 'list'
+
+
+class JobState(Enum):
+    """
+    Progress of a job of a work queue.
+    """
+
+    PENDING = 'pending'
+    LEASED = 'leased'
+    DONE = 'done'
+    FAILED = 'failed'
+
+
+@dataclass
+class Job:
+    """
+    Timeline leased to a worker of a sharded run.
+
+    Attributes:
+        job_id (int): The ID of the job within its queue.
+        kind (JobKind): Whether the source is an account or a list.
+        source (str): The screen name or list ID of the timeline.
+        attempts (int): The number of times the job was leased, this lease included.
+        worker (Optional[str]): The name of the worker holding the lease.
+        lease_until (float): The epoch second the lease expires at.
+    """
+
+    job_id: int
+    kind: JobKind
+    source: str
+    attempts: int = 0
+    worker: Optional[str] = None
+    lease_until: float = 0.0
+
+
+@dataclass
+class QueueStats:
+    """
+    Number of jobs of a work queue in each state.
+
+    Attributes:
+        pending (int): The jobs waiting for a worker, retries included.
+        leased (int): The jobs held by a worker.
+        done (int): The jobs completed.
+        failed (int): The jobs given up on after too many attempts.
+    """
+
+    pending: int = 0
+    leased: int = 0
+    done: int = 0
+    failed: int = 0
+
+    @property
+    def outstanding(self) -> int:
+        return self.pending + self.leased
+
+
+@dataclass
+class WorkerStats:
+    """
+    Throughput of a worker of a sharded run.
+
+    Attributes:
+        worker (str): The name of the worker.
+        jobs (int): The jobs completed.
+        failures (int): The jobs that failed.
+        tweets (int): The tweets exported.
+        seconds (float): The seconds spent on jobs.
+    """
+
+    worker: str
+    jobs: int = 0
+    failures: int = 0
+    tweets: int = 0
+    seconds: float = 0.0
+
+    @property
+    def tweets_per_second(self) -> float:
+        return self.tweets / self.seconds if self.seconds else 0.0
@@ -0,0 +1,281 @@
+from typing import Dict, Iterator, Optional
+import itertools
+import json
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from playwright.sync_api import APIRequestContext, APIResponse, Request
+
+from twitfetch.errors import GraphQLRequestError
+from twitfetch._data_structures import GraphQLOperation
+from twitfetch._json import JSONDecoder
+from twitfetch._metrics import Metrics, timed
+from twitfetch._ratelimit import RateLimiter
+from twitfetch._parse import find_next_cursor
+from twitfetch._utils import decode_json
+from twitfetch._constants import (
+    Endpoints,
+    GRAPHQL_ENDPOINT,
+    URL_GRAPHQL_API,
+    UserKeys
+)
+
+def _dump_params(params: dict) -> str:
+    """
+    Serialize GraphQL query parameters the way the Twitter app does.
+    """
+
+    return json.dumps(params, separators=(',', ':'))
+
+def parse_operation(url: str) -> Optional[GraphQLOperation]:
+    """
+    Extract the GraphQL operation template from a request URL.
+
+    Args:
+        url (str): The URL of a GraphQL request.
+
+    Returns:
+        Optional[GraphQLOperation]: The operation, None if the URL is not a GraphQL query.
+    """
+
+    parsed = urlparse(url)
+    path = parsed.path.split('/')
+
+    if GRAPHQL_ENDPOINT.strip('/') not in path:
+        return None
+
+    index = path.index(GRAPHQL_ENDPOINT.strip('/'))
+    if len(path) < index + 3:
+        return None
+
+    query = {key: json.loads(value[0]) for key, value in parse_qs(parsed.query).items()}
+
+    return GraphQLOperation(
+        name=path[index + 2],
+        query_id=path[index + 1],
+        variables=query.get('variables', {}),
+        features=query.get('features', {}),
+        field_toggles=query.get('fieldToggles')
+    )
+
+class GraphQLSession:
+    """
+    Credentials and operation templates captured from the GraphQL requests made by the Twitter app.
+
+    Attributes:
+        bearer_token (Optional[str]): The authorization header sent with GraphQL requests.
+        csrf_token (Optional[str]): The CSRF token sent with GraphQL requests.
+        operations (Dict[str, GraphQLOperation]): The captured operations keyed by name.
+    """
+    def __init__(self):
+        self.bearer_token: Optional[str] = None
+        self.csrf_token: Optional[str] = None
+        self.operations: Dict[str, GraphQLOperation] = {}
+
+    def capture(self, request: Request) -> None:
+        """
+        Callback for interception of GraphQL requests.
+
+        Args:
+            request (Request): The network request.
+        """
+
+        if GRAPHQL_ENDPOINT not in request.url:
+            return
+
+        operation = parse_operation(url=request.url)
+        if operation is None:
+            return
+
+        headers = request.all_headers()
+        self.bearer_token = headers.get('authorization', self.bearer_token)
+        self.csrf_token = headers.get('x-csrf-token', self.csrf_token)
+
+        # Templates must not pin a page, cursors are added per request
+        operation.variables.pop('cursor', None)
+        self.operations.setdefault(operation.name, operation)
+
+    def ready(self, *endpoints: Endpoints) -> bool:
+        """
+        Whether the given endpoints can be requested directly.
+        """
+
+        return (
+            self.bearer_token is not None and
+            self.csrf_token is not None and
+            all(endpoint.value in self.operations for endpoint in endpoints)
+        )
+
+class GraphQLClient:
+    """
+    Requests GraphQL timelines directly, following the cursors of each page.
+
+    Args:
+        request (APIRequestContext): The request context sharing the cookies of the logged in browser.
+        session (GraphQLSession): The captured credentials and operation templates.
+        base_url (str): The GraphQL API URL.
+        timeout (int): Milliseconds to wait for a response.
+        rate_limiter (Optional[RateLimiter]): The rate limiter pacing requests of the session,
+            requests are sent as fast as possible if None.
+        decode (Optional[JSONDecoder]): The function decoding response bodies, the fastest
+            installed JSON backend is used if None.
+        metrics (Optional[Metrics]): The metrics timing requests and counting responses,
+            bytes received and retries, nothing is measured if None.
+    """
+    def __init__(
+        self,
+        request: APIRequestContext,
+        session: GraphQLSession,
+        base_url: str = URL_GRAPHQL_API,
+        timeout: int = 10000,
+        rate_limiter: Optional[RateLimiter] = None,
+        decode: Optional[JSONDecoder] = None,
+        metrics: Optional[Metrics] = None
+    ):
+        self._request = request
+        self._session = session
+        self._base_url = base_url
+        self._timeout = timeout
+        self._rate_limiter = rate_limiter
+        self._decode = decode
+        self._metrics = metrics
+
+    def _headers(self) -> Dict[str, str]:
+        """
+        Generate the headers the Twitter app sends with GraphQL requests.
+        """
+
+        return {
+            'authorization': self._session.bearer_token,
+            'x-csrf-token': self._session.csrf_token,
+            'x-twitter-active-user': 'yes',
+            'x-twitter-auth-type': 'OAuth2Session',
+            'content-type': 'application/json'
+        }
+
+    def get(self, endpoint: Endpoints, variables: dict) -> dict:
+        """
+        Request a GraphQL operation using its captured template.
+
+        Args:
+            endpoint (Endpoints): The GraphQL endpoint.
+            variables (dict): The variables overriding the template variables.
+
+        Returns:
+            dict: The GraphQL response as a dictionary.
+        """
+
+        operation = self._session.operations[endpoint.value]
+
+        params = {
+            'variables': _dump_params({**operation.variables, **variables}),
+            'features': _dump_params(operation.features)
+        }
+        if operation.field_toggles is not None:
+            params['fieldToggles'] = _dump_params(operation.field_toggles)
+
+        url = f'{self._base_url}/{operation.query_id}/{operation.name}?{urlencode(params)}'
+
+        if self._rate_limiter is None:
+            response = self._send(endpoint=endpoint, url=url)
+        else:
+            response = self._paced_get(endpoint=endpoint, url=url)
+
+        if not response.ok:
+            raise GraphQLRequestError(status=response.status, operation=operation.name)
+
+        body = response.body()
+        if self._metrics is not None:
+            self._metrics.increment('bytes_received', len(body), endpoint=endpoint.value)
+
+        with timed(self._metrics, 'decode_seconds', endpoint=endpoint.value):
+            return decode_json(body=body, url=response.url, decode=self._decode)
+
+    def _send(self, endpoint: Endpoints, url: str) -> APIResponse:
+        """
+        Send a single GraphQL request, measuring it when metrics are enabled.
+        """
+
+        if self._metrics is None:
+            return self._request.get(url, headers=self._headers(), timeout=self._timeout)
+
+        with self._metrics.timer('request_seconds', endpoint=endpoint.value):
+            response = self._request.get(url, headers=self._headers(), timeout=self._timeout)
+        self._metrics.increment('responses', endpoint=endpoint.value, status=str(response.status))
+
+        return response
+
+    def _paced_get(self, endpoint: Endpoints, url: str) -> APIResponse:
+        """
+        Request a URL within the rate limit budget of the endpoint, backing off and retrying
+        while Twitter rejects it.
+
+        Args:
+            endpoint (Endpoints): The GraphQL endpoint.
+            url (str): The GraphQL request URL.
+
+        Returns:
+            APIResponse: The first response accepted.
+        """
+
+        limiter = self._rate_limiter
+
+        for attempt in itertools.count():
+            limiter.wait(endpoint=endpoint.value)
+            response = self._send(endpoint=endpoint, url=url)
+
+            backoff = limiter.retry_delay(
+                endpoint=endpoint.value,
+                status=response.status,
+                headers=response.headers,
+                attempt=attempt
+            )
+            if backoff is None:
+                return response
+
+            if self._metrics is not None:
+                self._metrics.increment('retries', endpoint=endpoint.value, reason='rate_limited')
+            limiter.sleep(backoff)
+
+    def user_id(self, screen_name: str) -> str:
+        """
+        Look up the user ID of a Twitter account.
+
+        Args:
+            screen_name (str): The screen name of a Twitter account.
+
+        Returns:
+            str: The user ID.
+        """
+
+        response = self.get(
+            endpoint=Endpoints.UserByScreenName,
+            variables={'screen_name': screen_name}
+        )
+
+        return response['data']['user']['result'][UserKeys.USER_ID]
+
+    def pages(self, endpoint: Endpoints, variables: dict) -> Iterator[dict]:
+        """
+        Iterate through the pages of a timeline, oldest last.
+
+        Args:
+            endpoint (Endpoints): The GraphQL timeline endpoint.
+            variables (dict): The variables identifying the timeline.
+
+        Yields:
+            dict: The GraphQL response of each page.
+        """
+
+        cursor = None
+
+        while True:
+            page_variables = dict(variables)
+            if cursor is not None:
+                page_variables['cursor'] = cursor
+
+            response = self.get(endpoint=endpoint, variables=page_variables)
+            yield response
+
+            cursor = find_next_cursor(response=response, cursor=cursor)
+            if cursor is None:
+                return
@@ -0,0 +1,60 @@
+from typing import Any, Callable, Dict, Optional
+import json
+
+# Decoding functions take raw bytes and raise ValueError on malformed input
+JSONDecoder = Callable[[bytes], Any]
+
+# Backends in order of preference when none is requested
+JSON_BACKENDS = ('orjson', 'msgspec', 'json')
+
+def _orjson() -> JSONDecoder:
+    import orjson
+    return orjson.loads
+
+def _msgspec() -> JSONDecoder:
+    import msgspec
+
+    decoder = msgspec.json.Decoder()
+
+    # Raise ValueError on malformed bodies like the other backends
+    def decode(body: bytes) -> Any:
+        try:
+            return decoder.decode(body)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    return decode
+
+def _stdlib() -> JSONDecoder:
+    return json.loads
+
+_LOADERS: Dict[str, Callable[[], JSONDecoder]] = {
+    'orjson': _orjson,
+    'msgspec': _msgspec,
+    'json': _stdlib
+}
+
+def get_decoder(backend: Optional[str] = None) -> JSONDecoder:
+    """
+    Retrieve a function decoding JSON bodies straight from bytes.
+
+    Args:
+        backend (Optional[str]): One of 'orjson', 'msgspec' or 'json', the fastest
+            installed backend is used if None.
+
+    Returns:
+        JSONDecoder: The decoding function.
+    """
+
+    if backend is not None:
+        if backend not in _LOADERS:
+            raise ValueError(f'unknown JSON backend {backend!r}, expected one of {JSON_BACKENDS}')
+        return _LOADERS[backend]()
+
+    for name in JSON_BACKENDS:
+        try:
+            return _LOADERS[name]()
+        except ImportError:
+            continue
+
+    return json.loads
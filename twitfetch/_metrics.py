@@ -0,0 +1,196 @@
+from contextlib import contextmanager, nullcontext
+from typing import Callable, ContextManager, Dict, Iterator, List, Optional, Tuple
+import threading
+import time
+
+from twitfetch._constants import METRICS_PREFIX
+from twitfetch._data_structures import MetricEvent, MetricSummary
+
+MetricHook = Callable[[MetricEvent], None]
+MetricKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+# Shared no-op timer handed out while metrics are disabled
+_DISABLED = nullcontext()
+
+def _key(name: str, labels: Dict[str, str]) -> MetricKey:
+    return name, tuple(sorted(labels.items()))
+
+class Metrics:
+    """
+    Opt-in collector of counters and timings of the fetch pipeline, forwarding every
+    measurement to the registered hooks.
+
+    Instrumented code receives None instead of a Metrics when metrics are disabled, so
+    disabled metrics cost a single None check per measurement.
+
+    Args:
+        hooks (Optional[List[MetricHook]]): Callbacks receiving every measurement.
+
+    Attributes:
+        counters (Dict[MetricKey, float]): The running total of each counter.
+        summaries (Dict[MetricKey, MetricSummary]): The count, sum, min and max of each
+            observed value, e.g. durations in seconds.
+    """
+    def __init__(self, hooks: Optional[List[MetricHook]] = None):
+        self._hooks: List[MetricHook] = list(hooks or [])
+        self._lock = threading.Lock()
+
+        self.counters: Dict[MetricKey, float] = {}
+        self.summaries: Dict[MetricKey, MetricSummary] = {}
+
+    def add_hook(self, hook: MetricHook) -> None:
+        """
+        Register a callback receiving every measurement.
+        """
+
+        self._hooks.append(hook)
+
+    def _emit(self, kind: str, name: str, value: float, labels: Dict[str, str]) -> None:
+        if self._hooks:
+            event = MetricEvent(kind=kind, name=name, value=value, labels=labels)
+            for hook in self._hooks:
+                hook(event)
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        """
+        Add to a counter.
+
+        Args:
+            name (str): The counter name, e.g. 'responses'.
+            value (float): The amount to add.
+            **labels (str): The labels of the counter, e.g. endpoint.
+        """
+
+        key = _key(name=name, labels=labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+        self._emit(kind='counter', name=name, value=value, labels=labels)
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """
+        Record an observed value.
+
+        Args:
+            name (str): The summary name, e.g. 'navigation_seconds'.
+            value (float): The observed value.
+            **labels (str): The labels of the summary, e.g. endpoint.
+        """
+
+        key = _key(name=name, labels=labels)
+        with self._lock:
+            summary = self.summaries.get(key)
+            if summary is None:
+                summary = self.summaries[key] = MetricSummary()
+            summary.add(value=value)
+
+        self._emit(kind='summary', name=name, value=value, labels=labels)
+
+    @contextmanager
+    def timer(self, name: str, **labels: str) -> Iterator[None]:
+        """
+        Observe the seconds spent within the context.
+        """
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def reset(self) -> None:
+        """
+        Forget every counter and summary.
+        """
+
+        with self._lock:
+            self.counters.clear()
+            self.summaries.clear()
+
+    def to_prometheus(self) -> str:
+        """
+        Render every counter and summary in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition, counters suffixed with _total and summaries exposed
+                through their _count and _sum series.
+        """
+
+        lines = []
+
+        with self._lock:
+            counters = sorted(self.counters.items())
+            summaries = sorted(self.summaries.items())
+
+        for name in sorted({key[0] for key, _ in counters}):
+            lines.append(f'# TYPE {METRICS_PREFIX}{name}_total counter')
+            for (series, labels), value in counters:
+                if series == name:
+                    lines.append(f'{METRICS_PREFIX}{name}_total{_format_labels(labels)} {value:g}')
+
+        for name in sorted({key[0] for key, _ in summaries}):
+            lines.append(f'# TYPE {METRICS_PREFIX}{name} summary')
+            for (series, labels), summary in summaries:
+                if series == name:
+                    lines.append(f'{METRICS_PREFIX}{name}_count{_format_labels(labels)} {summary.count}')
+                    lines.append(f'{METRICS_PREFIX}{name}_sum{_format_labels(labels)} {summary.total:g}')
+
+        return '\n'.join(lines) + '\n'
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ''
+
+    escaped = (
+        f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for name, value in labels
+    )
+    return '{' + ','.join(escaped) + '}'
+
+def timed(metrics: Optional[Metrics], name: str, **labels: str) -> ContextManager[None]:
+    """
+    Time a block when metrics are enabled, doing nothing otherwise.
+
+    Args:
+        metrics (Optional[Metrics]): The metrics, None when disabled.
+        name (str): The summary name.
+        **labels (str): The labels of the summary.
+    """
+
+    if metrics is None:
+        return _DISABLED
+    return metrics.timer(name, **labels)
+
+class OpenTelemetryHook:
+    """
+    Metric hook forwarding measurements to an OpenTelemetry meter, counters as counters and
+    observed values as histograms. The meter is passed in, so opentelemetry stays optional.
+
+    Args:
+        meter: An opentelemetry.metrics.Meter, e.g. metrics.get_meter('twitfetch').
+    """
+    def __init__(self, meter):
+        self._meter = meter
+        self._instruments: Dict[str, object] = {}
+
+    def _instrument(self, event: MetricEvent):
+        instrument = self._instruments.get(event.name)
+
+        if instrument is None:
+            name = f'{METRICS_PREFIX}{event.name}'
+            if event.kind == 'counter':
+                instrument = self._meter.create_counter(name)
+            else:
+                unit = 's' if event.name.endswith('_seconds') else '1'
+                instrument = self._meter.create_histogram(name, unit=unit)
+            self._instruments[event.name] = instrument
+
+        return instrument
+
+    def __call__(self, event: MetricEvent) -> None:
+        instrument = self._instrument(event=event)
+
+        if event.kind == 'counter':
+            instrument.add(event.value, attributes=event.labels)
+        else:
+            instrument.record(event.value, attributes=event.labels)
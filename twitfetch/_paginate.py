@@ -0,0 +1,107 @@
+from typing import List, Optional, Sequence, Set
+from datetime import datetime
+
+from twitfetch._batch import TweetBatch
+from twitfetch._timestamps import TimeWindow
+from twitfetch.typing import Tweets
+
+class TimelinePaginator:
+    """
+    Collects tweets across timeline pages and decides when pagination can stop.
+
+    Timeline entries are served newest first, so once an entry whose newest tweet is
+    older than the start of the time window, or was already seen by a previous fetch,
+    shows up, no later page can contain a relevant tweet.
+
+    Args:
+        tweet_limit (int): The maximum number of tweets to collect.
+        time_start (Optional[datetime]): The oldest creation datetime to accept.
+        time_end (Optional[datetime]): The newest creation datetime to accept.
+        since_id (Optional[int]): The newest tweet ID seen by a previous fetch.
+
+    Attributes:
+        count (int): The number of tweets accepted so far.
+        exhausted (bool): Whether the time window has been passed.
+    """
+    def __init__(
+        self,
+        tweet_limit: int,
+        time_start: Optional[datetime] = None,
+        time_end: Optional[datetime] = None,
+        since_id: Optional[int] = None
+    ):
+        self._tweet_limit = tweet_limit
+        self._window = TimeWindow(time_start=time_start, time_end=time_end, since_id=since_id)
+        self._seen: Set[int] = set()
+
+        self.count = 0
+        self.exhausted = False
+
+    @property
+    def done(self) -> bool:
+        """
+        Whether no further pages need to be requested.
+        """
+
+        return self.exhausted or self.count >= self._tweet_limit
+
+    def feed(self, tweets: Tweets, newest_ids: Optional[Sequence[int]] = None) -> Tweets:
+        """
+        Add the tweets of a newly received page.
+
+        Args:
+            tweets (Tweets): The parsed tweets of a page, in timeline order.
+            newest_ids (Optional[Sequence[int]]): The newest tweet ID of each entry of the
+                page, as found by find_entry_newest_ids, each tweet is taken as an entry
+                of its own if None.
+
+        Returns:
+            Tweets: The tweets of the page that were accepted.
+        """
+
+        indices = self._accept(tweet_ids=[tweet.tweet_id for tweet in tweets], newest_ids=newest_ids)
+        return [tweets[index] for index in indices]
+
+    def feed_batch(self, batch: TweetBatch, newest_ids: Optional[Sequence[int]] = None) -> TweetBatch:
+        """
+        Add the tweets of a newly received page parsed into a batch, without materializing
+        a Tweet per row.
+
+        Args:
+            batch (TweetBatch): The parsed tweets of a page, in timeline order.
+            newest_ids (Optional[Sequence[int]]): The newest tweet ID of each entry of the
+                page, as found by find_entry_newest_ids, each tweet is taken as an entry
+                of its own if None.
+
+        Returns:
+            TweetBatch: The tweets of the page that were accepted.
+        """
+
+        indices = self._accept(tweet_ids=batch.tweet_ids, newest_ids=newest_ids)
+        return batch if len(indices) == len(batch) else batch.take(indices=indices)
+
+    def _accept(self, tweet_ids: Sequence[int], newest_ids: Optional[Sequence[int]]) -> List[int]:
+        """
+        Accept the tweets of a page, returning the indices of the accepted ones.
+        """
+
+        accepted = []
+
+        # Tweet IDs increase over time, so once an entry is older than the window or was
+        # seen by a previous fetch, so is every entry after it
+        selected, passed = self._window.select(tweet_ids=tweet_ids, newest_ids=newest_ids)
+
+        for index in selected:
+            if self.count >= self._tweet_limit:
+                return accepted
+
+            tweet_id = tweet_ids[index]
+            if tweet_id in self._seen:
+                continue
+            self._seen.add(tweet_id)
+
+            accepted.append(index)
+            self.count += 1
+
+        self.exhausted = self.exhausted or passed
+        return accepted
@@ -1,36 +1,285 @@
-from typing import Dict, List
+from typing import Iterator, List, Optional, Tuple
+from dataclasses import replace
 from datetime import datetime
 
 from bs4 import BeautifulSoup
+from playwright.async_api import ElementHandle as AsyncElementHandle, Page as AsyncPage
+from playwright.sync_api import ElementHandle, Page
 
+from twitfetch._batch import TweetBatch
 from twitfetch._data_structures import Tweet
 from twitfetch.typing import Tweets
 from twitfetch._constants import (
+    ADD_ENTRIES,
+    CURSOR,
+    CURSOR_BOTTOM,
     Element,
     GeneralKeys,
-    TweetKeys
-)
-from twitfetch._utils import (
-    find_key_in_dict,
-    remove_from_dict
+    TIMELINE_PATHS,
+    TweetKeys,
+    TWEET_WITH_VISIBILITY
 )
+from twitfetch._timestamps import parse_created_at
+from twitfetch._utils import iter_key_in_dict
+
+def _find_instructions(response: dict) -> List[dict]:
+    """
+    Find the timeline instructions of a GraphQL response, following the known paths first and
+    searching the whole response only if none of them match.
+
+    Args:
+        response (dict): A GraphQL timeline response.
+
+    Returns:
+        List[dict]: The timeline instructions.
+    """
+
+    for path in TIMELINE_PATHS:
+        node = response
+        for key in path:
+            if not isinstance(node, dict):
+                break
+            node = node.get(key)
+
+        if isinstance(node, list):
+            return node
+
+    instructions = []
+    for found in iter_key_in_dict(obj=response, key=GeneralKeys.INSTRUCTIONS):
+        instructions.extend(found)
+    return instructions
+
+def _unwrap_tweet_result(item_content: dict) -> Optional[dict]:
+    """
+    Retrieve the tweet result of a timeline item, unwrapping visibility results.
+    """
+
+    result = item_content.get(GeneralKeys.TWEET_RESULTS, {}).get(GeneralKeys.RESULT)
+    if result and result.get(GeneralKeys.TYPENAME) == TWEET_WITH_VISIBILITY:
+        result = result.get(GeneralKeys.TWEET)
+    return result
+
+def iter_entry_results(response: dict) -> Iterator[List[dict]]:
+    """
+    Iterate through the entries added to a timeline in a single pass over the known schema:
+    instructions, TimelineAddEntries, entries, itemContent and tweet_results. Pinned entries
+    are skipped so that only the chronological timeline is returned.
+
+    Entries come newest first, but the items of a conversation module come oldest first, e.g.
+    a self-thread whose root predates the replies shown with it.
+
+    Falls back to a generic search for tweet results if the response does not follow the
+    schema, each result then being an entry of its own.
+
+    Args:
+        response (dict): A GraphQL timeline response.
+
+    Yields:
+        List[dict]: The tweet results of each entry, holding the legacy and core details.
+    """
+
+    found = False
+
+    for instruction in _find_instructions(response=response):
+        if instruction.get(GeneralKeys.TYPE) != ADD_ENTRIES:
+            continue
+
+        for entry in instruction.get(GeneralKeys.ENTRIES, []):
+            content = entry.get(GeneralKeys.CONTENT, {})
+
+            # Single tweets carry item content, conversations a list of items
+            item_contents = []
+            if GeneralKeys.ITEM_CONTENT in content:
+                item_contents.append(content[GeneralKeys.ITEM_CONTENT])
+            for item in content.get(GeneralKeys.ITEMS, []):
+                item_content = item.get(GeneralKeys.ITEM, {}).get(GeneralKeys.ITEM_CONTENT)
+                if item_content:
+                    item_contents.append(item_content)
+
+            results = []
+            for item_content in item_contents:
+                result = _unwrap_tweet_result(item_content=item_content)
+                if result and GeneralKeys.LEGACY in result:
+                    results.append(result)
+
+            if results:
+                found = True
+                yield results
+
+    if found:
+        return
+
+    for tweet_results in iter_key_in_dict(obj=response, key=GeneralKeys.TWEET_RESULTS):
+        result = _unwrap_tweet_result(item_content={GeneralKeys.TWEET_RESULTS: tweet_results})
+        if result and GeneralKeys.LEGACY in result:
+            yield [result]
+
+def iter_tweet_results(response: dict) -> Iterator[dict]:
+    """
+    Iterate through the tweet results added to a timeline, entry by entry.
+
+    Args:
+        response (dict): A GraphQL timeline response.
+
+    Yields:
+        dict: Each tweet result, holding the legacy and core details.
+    """
+
+    for results in iter_entry_results(response=response):
+        yield from results
+
+def find_entry_newest_ids(responses: List[dict]) -> List[int]:
+    """
+    Find the newest tweet ID of every timeline entry, whichever account posted it, e.g. to
+    tell whether a page reached past the start of a time window.
+
+    Args:
+        responses (List[dict]): The GraphQL timeline responses of a page.
+
+    Returns:
+        List[int]: The newest tweet ID of each entry, in timeline order.
+    """
+
+    newest_ids = []
+
+    for response in responses or []:
+        for results in iter_entry_results(response=response):
+            tweet_ids = [
+                int(result[GeneralKeys.LEGACY][TweetKeys.TWEET_ID])
+                for result in results
+                if result[GeneralKeys.LEGACY].get(TweetKeys.TWEET_ID)
+            ]
+            if tweet_ids:
+                newest_ids.append(max(tweet_ids))
+
+    return newest_ids
+
+def _find_screen_name(result: dict) -> Optional[str]:
+    """
+    Retrieve the screen name of the author of a tweet result.
+    """
+
+    user = result.get(GeneralKeys.CORE, {}).get(GeneralKeys.USER_RESULTS, {}).get(GeneralKeys.RESULT, {})
+
+    for details in (user.get(GeneralKeys.LEGACY, {}), user.get(GeneralKeys.CORE, {})):
+        screen_name = details.get(TweetKeys.USER_NAME)
+        if screen_name:
+            return screen_name
+
+    return None
+
+def find_timeline_entries(response: dict) -> List[dict]:
+    """
+    Collect the timeline entries of a GraphQL response, including entries replaced by a single instruction.
+
+    Args:
+        response (dict): A GraphQL timeline response.
+
+    Returns:
+        List[dict]: The timeline entries.
+    """
+
+    timeline_entries = []
+
+    for instruction in _find_instructions(response=response):
+        entries = instruction.get(GeneralKeys.ENTRIES)
+        if entries:
+            timeline_entries.extend(entries)
+
+        entry = instruction.get(GeneralKeys.ENTRY)
+        if entry:
+            timeline_entries.append(entry)
+
+    return timeline_entries
+
+def find_bottom_cursor(entries: List[dict]) -> Optional[str]:
+    """
+    Find the cursor pointing to the next (older) page of a timeline.
+
+    Args:
+        entries (List[dict]): The timeline entries of a GraphQL response.
+
+    Returns:
+        Optional[str]: The bottom cursor value, None if the page has none.
+    """
+
+    for entry in entries:
+        if entry.get(GeneralKeys.ENTRY_ID, '').startswith(CURSOR_BOTTOM):
+            return entry.get(GeneralKeys.CONTENT, {}).get(GeneralKeys.VALUE)
+
+    return None
 
-def _format_created_at(created: str) -> datetime:
+def find_next_cursor(response: dict, cursor: Optional[str]) -> Optional[str]:
     """
-    Convert created string date provided in GraphQL response to datetime.
+    Find the cursor of the page following a timeline page.
 
     Args:
-        created (str): The string representation of the created date field.
+        response (dict): A GraphQL timeline response.
+        cursor (Optional[str]): The cursor the page was requested with.
 
     Returns:
-        datetime: The converted UTC datetime.
+        Optional[str]: The cursor of the next page, None if the page ends the timeline.
+    """
+
+    # A page holding nothing but cursors marks the end of the timeline
+    entries = find_timeline_entries(response=response)
+    has_content = any(
+        not entry.get(GeneralKeys.ENTRY_ID, '').startswith(CURSOR)
+        for entry in entries
+    )
+
+    next_cursor = find_bottom_cursor(entries=entries)
+    if not has_content or next_cursor == cursor:
+        return None
+    return next_cursor
+
+def _iter_tweet_fields(
+    tweets: List[dict],
+    users: Optional[List[str]],
+    do_remove_retweets: bool
+) -> Iterator[Tuple[str, int, int, datetime, str]]:
+    """
+    Extract the fields of every kept tweet of GraphQL responses, skipping results that
+    lack an ID or creation date.
+
+    Yields:
+        Tuple[str, int, int, datetime, str]: The user name, user ID, tweet ID, creation
+            datetime and content of each tweet.
     """
 
-    return datetime.strptime(created, "%a %b %d %H:%M:%S %z %Y")
+    screen_names = None if users is None else {user.lower() for user in users}
+
+    for response in tweets or []:
+        for result in iter_tweet_results(response=response):
+            legacy = result[GeneralKeys.LEGACY]
+
+            if do_remove_retweets and legacy.get(GeneralKeys.RETWEET):
+                continue
+
+            user_name = _find_screen_name(result=result)
+            if not user_name:
+                continue
+            if screen_names is not None and user_name.lower() not in screen_names:
+                continue
+
+            user_id = legacy.get(TweetKeys.USER_ID)
+            tweet_id = legacy.get(TweetKeys.TWEET_ID)
+            created = legacy.get(TweetKeys.CREATED)
+            if not user_id or not tweet_id or not created:
+                continue
+
+            # Results without a full text get an empty content rather than None
+            yield (
+                user_name,
+                int(user_id),
+                int(tweet_id),
+                parse_created_at(created=created),
+                legacy.get(TweetKeys.CONTENT) or ''
+            )
 
 def parse_tweets_response(
     tweets: List[dict],
-    users: List[str],
+    users: Optional[List[str]] = None,
     do_remove_retweets: bool = False
 ) -> Tweets:
     """
@@ -38,57 +287,62 @@ def parse_tweets_response(
 
     Args:
         tweets (List[dict]): A list of dictionaries corresponding with the GraphQL response.
-        users (Dict[str, str]): A dictionary containing the user IDs and keys and user names as values.
+        users (Optional[List[str]]): The screen names of the accounts to keep tweets from,
+            tweets of every account are kept if None.
         do_remove_retweets (bool): A boolean indicating whether retweets should be removed.
 
     Returns:
-        Tweets: A dictionary or Tweet dataclass containing the relevant tweet details.
+        Tweets: A list of Tweet dataclasses containing the relevant tweet details.
     """
 
-    parsed_tweets = []
-
-    if tweets:
-        for tweet in tweets:
-            instructions = find_key_in_dict(obj=tweet, key=GeneralKeys.INSTRUCTIONS)
-            entries = find_key_in_dict(obj=instructions, key=GeneralKeys.ENTRIES)
-
-            for entry in entries:
-                tweets_parsed = find_key_in_dict(obj=entry, key=GeneralKeys.LEGACY)
-                
-                for parse in tweets_parsed:
-                    if do_remove_retweets:
-                        if parse.get(GeneralKeys.RETWEET):
-                            continue
-
-                    tweet_parsed = remove_from_dict(dictionary=parse)
+    return [
+        Tweet(
+            user_name=user_name,
+            user_id=user_id,
+            tweet_id=tweet_id,
+            created=created,
+            content=content
+        )
+        for user_name, user_id, tweet_id, created, content in _iter_tweet_fields(
+            tweets=tweets, users=users, do_remove_retweets=do_remove_retweets
+        )
+    ]
 
-                    tweet_parsed_user_name = tweet_parsed.get(TweetKeys.USER_NAME)
-                    if tweet_parsed_user_name:
+def parse_tweets_batch(
+    tweets: List[dict],
+    users: Optional[List[str]] = None,
+    do_remove_retweets: bool = False,
+    batch: Optional[TweetBatch] = None
+) -> TweetBatch:
+    """
+    Given the JSON tweet response from GraphQL, parses data into the columns of a batch
+    without creating a Tweet per row.
 
-                        if tweet_parsed_user_name in users:
-                            created = tweet_parsed.get(TweetKeys.CREATED)
-                            if created:
-                                created = _format_created_at(created=created)
+    Args:
+        tweets (List[dict]): A list of dictionaries corresponding with the GraphQL response.
+        users (Optional[List[str]]): The screen names of the accounts to keep tweets from,
+            tweets of every account are kept if None.
+        do_remove_retweets (bool): A boolean indicating whether retweets should be removed.
+        batch (Optional[TweetBatch]): The batch to append to, a new one is created if None.
 
-                                tweet_parsed[TweetKeys.CREATED] = created.isoformat()
+    Returns:
+        TweetBatch: The batch holding the parsed tweets.
+    """
 
-                            user_name = tweet_parsed_user_name
-                            user_id = tweet_parsed.get(TweetKeys.USER_ID)
-                            tweet_id = tweet_parsed.get(TweetKeys.TWEET_ID)
-                            created = tweet_parsed.get(TweetKeys.CREATED)
-                            content = tweet_parsed.get(TweetKeys.CONTENT)
+    batch = TweetBatch() if batch is None else batch
 
-                            parsed_tweets.append(
-                                Tweet(
-                                    user_id=user_id,
-                                    user_name=user_name,
-                                    tweet_id=tweet_id,
-                                    created=created,
-                                    content=content
-                                )
-                            )
+    for user_name, user_id, tweet_id, created, content in _iter_tweet_fields(
+        tweets=tweets, users=users, do_remove_retweets=do_remove_retweets
+    ):
+        batch.append(
+            user_name=user_name,
+            user_id=user_id,
+            tweet_id=tweet_id,
+            created=int(created.timestamp()),
+            content=content
+        )
 
-    return parsed_tweets
+    return batch
 
 class ParseDOM:
     """
@@ -97,7 +351,8 @@ class ParseDOM:
     def __init__(self, page_source: str):
         self._soup = BeautifulSoup(page_source, "html.parser")
 
-    def css_selector(self, element: Element) -> str:
+    @staticmethod
+    def css_selector(element: Element) -> str:
         """
         Generate CSS selector based on attribute information.
         """
@@ -115,8 +370,7 @@ class ParseDOM:
         if isinstance(attribute_value, list):
             attribute_value = ' '.join(attribute_value)
         
-        element.attribute_value = attribute_value
-        return element
+        return replace(element, attribute_value=attribute_value)
     
     def find_element(self, element: Element) -> BeautifulSoup:
         """
@@ -126,4 +380,105 @@ class ParseDOM:
         if element.attribute is not None and element.attribute_value is not None:
             return self._soup.find(element.tag, {element.attribute: element.attribute_value})
         else:
-            return self._soup.find(element.tag)
\ No newline at end of file
+            return self._soup.find(element.tag)
+
+# Read an attribute of the first match, normalizing whitespace separated classes like BeautifulSoup
+_FIND_ATTRIBUTE_SCRIPT = '''([selector, attribute]) => {
+    const found = document.querySelector(selector);
+    const value = found ? found.getAttribute(attribute) : null;
+    return value !== null && attribute === 'class'
+        ? value.split(/\\s+/).filter(Boolean).join(' ')
+        : value;
+}'''
+
+_EXISTS_SCRIPT = 'selector => document.querySelector(selector) !== null'
+
+class PageDOM:
+    """
+    ParseDOM counterpart querying a live page in place, so that looking up an element costs
+    a round trip to the browser rather than serializing and parsing the whole DOM.
+    ParseDOM remains for page sources saved offline, e.g. recorded fixtures.
+
+    Args:
+        page (Page): The page to query.
+    """
+    def __init__(self, page: Page):
+        self._page = page
+
+    css_selector = staticmethod(ParseDOM.css_selector)
+
+    @staticmethod
+    def _selector(element: Element) -> str:
+        """
+        Generate the selector find_element matches, the tag alone unless the attribute
+        value is known.
+        """
+
+        if element.attribute is not None and element.attribute_value is not None:
+            return ParseDOM.css_selector(element=element)
+        return element.tag
+
+    def find_attribute(self, element: Element) -> Element:
+        """
+        Find and load the result for a given attribute and tag, whitespace separated values
+        such as classes being normalized like BeautifulSoup does. The attribute value is
+        None when no element matches.
+        """
+
+        attribute_value = self._page.evaluate(
+            _FIND_ATTRIBUTE_SCRIPT,
+            [self._selector(element=element), element.attribute]
+        )
+        return replace(element, attribute_value=attribute_value)
+
+    def find_element(self, element: Element) -> Optional[ElementHandle]:
+        """
+        Find and return a single element for a given tag.
+        """
+
+        return self._page.query_selector(self._selector(element=element))
+
+    def exists(self, element: Element) -> bool:
+        """
+        Whether an element matching the tag, and the attribute value if known, is on the page.
+        """
+
+        return self._page.evaluate(_EXISTS_SCRIPT, self._selector(element=element))
+
+class AsyncPageDOM:
+    """
+    Asyncio counterpart of PageDOM.
+
+    Args:
+        page (AsyncPage): The page to query.
+    """
+    def __init__(self, page: AsyncPage):
+        self._page = page
+
+    css_selector = staticmethod(ParseDOM.css_selector)
+    _selector = staticmethod(PageDOM._selector)
+
+    async def find_attribute(self, element: Element) -> Element:
+        """
+        Find and load the result for a given attribute and tag, see PageDOM.find_attribute.
+        """
+
+        attribute_value = await self._page.evaluate(
+            _FIND_ATTRIBUTE_SCRIPT,
+            [self._selector(element=element), element.attribute]
+        )
+        return replace(element, attribute_value=attribute_value)
+
+    async def find_element(self, element: Element) -> Optional[AsyncElementHandle]:
+        """
+        Find and return a single element for a given tag.
+        """
+
+        return await self._page.query_selector(self._selector(element=element))
+
+    async def exists(self, element: Element) -> bool:
+        """
+        Whether an element matching the tag, and the attribute value if known, is on the page.
+        """
+
+        return await self._page.evaluate(_EXISTS_SCRIPT, self._selector(element=element))
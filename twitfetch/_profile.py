@@ -0,0 +1,144 @@
+from typing import Dict, Tuple
+from dataclasses import dataclass, field
+from urllib.parse import urlparse
+
+from playwright.sync_api import Request, Route
+
+from twitfetch._constants import (
+    ALLOWED_HOSTS,
+    BLOCKED_RESOURCE_TYPES,
+    LOW_MEMORY_ARGS
+)
+
+@dataclass
+class BrowserProfile:
+    """
+    Browser settings trimming everything but what the Twitter app needs to boot, login and
+    request GraphQL timelines.
+
+    Attributes:
+        blocked_resource_types (Tuple[str, ...]): Resource types aborted on every host.
+        allowed_hosts (Tuple[str, ...]): Hosts, including their subdomains, requests may go to.
+        launch_args (Tuple[str, ...]): Extra Chromium command line switches.
+    """
+
+    blocked_resource_types: Tuple[str, ...] = BLOCKED_RESOURCE_TYPES
+    allowed_hosts: Tuple[str, ...] = ALLOWED_HOSTS
+    launch_args: Tuple[str, ...] = LOW_MEMORY_ARGS
+
+@dataclass
+class ResourceStats:
+    """
+    Requests let through or blocked by a browser profile.
+
+    Attributes:
+        requests_allowed (int): The number of requests let through.
+        requests_blocked (int): The number of requests aborted.
+        blocked_by_type (Dict[str, int]): The number of requests aborted per resource type.
+        bytes_received (int): The body bytes received for requests let through, as
+            transferred rather than as announced by their headers.
+    """
+
+    requests_allowed: int = 0
+    requests_blocked: int = 0
+    blocked_by_type: Dict[str, int] = field(default_factory=dict)
+    bytes_received: int = 0
+
+class ResourceBlocker:
+    """
+    Route handler aborting the requests a browser profile does not need.
+
+    Args:
+        profile (BrowserProfile): The browser profile.
+
+    Attributes:
+        stats (ResourceStats): The requests let through or blocked since the last reset.
+    """
+    def __init__(self, profile: BrowserProfile):
+        self._profile = profile
+        self._blocked_types = frozenset(profile.blocked_resource_types)
+        self.stats = ResourceStats()
+
+    def _host_allowed(self, url: str) -> bool:
+        """
+        Check whether the host of a URL, or one of its parent domains, is allowed.
+        """
+
+        host = urlparse(url).hostname or ''
+        return any(
+            host == allowed or host.endswith(f'.{allowed}')
+            for allowed in self._profile.allowed_hosts
+        )
+
+    def blocks(self, resource_type: str, url: str) -> bool:
+        """
+        Whether a request is aborted, counting it either way.
+
+        Args:
+            resource_type (str): The resource type of the request.
+            url (str): The URL of the request.
+        """
+
+        if resource_type in self._blocked_types or not self._host_allowed(url=url):
+            self.stats.requests_blocked += 1
+            self.stats.blocked_by_type[resource_type] = self.stats.blocked_by_type.get(resource_type, 0) + 1
+            return True
+
+        self.stats.requests_allowed += 1
+        return False
+
+    def handle(self, route: Route) -> None:
+        """
+        Route handler for every request of the browser context.
+
+        Args:
+            route (Route): The intercepted route.
+        """
+
+        # Requests let through fall back to other handlers, e.g. a replayed HAR archive
+        if self.blocks(resource_type=route.request.resource_type, url=route.request.url):
+            route.abort()
+        else:
+            route.fallback()
+
+    async def handle_async(self, route: Route) -> None:
+        """
+        Route handler for every request of an asyncio browser context.
+
+        Args:
+            route (Route): The intercepted route.
+        """
+
+        if self.blocks(resource_type=route.request.resource_type, url=route.request.url):
+            await route.abort()
+        else:
+            await route.fallback()
+
+    def record_request(self, request: Request) -> None:
+        """
+        Callback counting the body bytes received for a finished request. Chunked and
+        compressed responses announce no content-length, so the size is measured instead.
+
+        Args:
+            request (Request): The finished network request.
+        """
+
+        self.stats.bytes_received += request.sizes()['responseBodySize']
+
+    async def record_request_async(self, request: Request) -> None:
+        """
+        Callback counting the body bytes received for a finished request of an asyncio
+        browser context.
+
+        Args:
+            request (Request): The finished network request.
+        """
+
+        self.stats.bytes_received += (await request.sizes())['responseBodySize']
+
+    def reset(self) -> None:
+        """
+        Start counting from zero, typically at the start of a fetch.
+        """
+
+        self.stats = ResourceStats()
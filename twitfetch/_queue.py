@@ -0,0 +1,318 @@
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, List, Optional
+import sqlite3
+import time
+
+from twitfetch._constants import JOB_MAX_ATTEMPTS, JOB_RETRY_DELAY, LEASE_SECONDS
+from twitfetch._data_structures import (
+    Job,
+    JobKind,
+    JobState,
+    QueueStats,
+    WorkerStats
+)
+
+class WorkQueue(ABC):
+    """
+    Durable queue of the timelines of a sharded run. Jobs are leased rather than popped,
+    so that the job of a worker that dies is handed out again once its lease expires, and
+    failed jobs are retried with a growing delay until they run out of attempts.
+
+    Every worker of a run, whichever process or node it runs on, only talks to the queue
+    through these methods, so that spreading workers across nodes takes a queue over a
+    store they share.
+    """
+
+    @abstractmethod
+    def add(self, kind: JobKind, sources: Iterable[str]) -> int:
+        """
+        Queue the timelines of sources, queueing finished ones again and keeping the
+        others once.
+
+        Args:
+            kind (JobKind): Whether the sources are accounts or lists.
+            sources (Iterable[str]): The screen names or list IDs, in any case.
+
+        Returns:
+            int: The number of jobs queued.
+        """
+
+    @abstractmethod
+    def lease(self, worker: str, lease_seconds: float = LEASE_SECONDS) -> Optional[Job]:
+        """
+        Hand out the oldest job due, pending or with an expired lease.
+
+        Args:
+            worker (str): The name of the worker taking the job.
+            lease_seconds (float): The seconds the worker holds the job.
+
+        Returns:
+            Optional[Job]: The job, None if no job is due.
+        """
+
+    @abstractmethod
+    def complete(self, job: Job, tweets: int) -> bool:
+        """
+        Mark a leased job done.
+
+        Args:
+            job (Job): The job.
+            tweets (int): The number of tweets exported.
+
+        Returns:
+            bool: Whether the worker still held the lease.
+        """
+
+    @abstractmethod
+    def fail(self, job: Job, error: str) -> bool:
+        """
+        Put a leased job back for a retry, or give up on it once out of attempts.
+
+        Args:
+            job (Job): The job.
+            error (str): The description of the error.
+
+        Returns:
+            bool: Whether the worker still held the lease.
+        """
+
+    @abstractmethod
+    def release(self, worker: str) -> int:
+        """
+        Put back every job leased to a worker, e.g. once it exited without completing them.
+
+        Returns:
+            int: The number of jobs put back.
+        """
+
+    @abstractmethod
+    def stats(self) -> QueueStats:
+        """
+        Count the jobs in each state.
+        """
+
+    @abstractmethod
+    def record(self, stats: WorkerStats) -> None:
+        """
+        Save the throughput of a worker.
+        """
+
+    @abstractmethod
+    def worker_stats(self) -> List[WorkerStats]:
+        """
+        Retrieve the throughput saved by every worker.
+        """
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> 'WorkQueue':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+class SQLiteWorkQueue(WorkQueue):
+    """
+    Work queue kept in a SQLite database, shared by the worker processes of a machine.
+    Each process opens a queue of its own on the same path, leases are taken within
+    write transactions so that no job is handed out twice.
+
+    Args:
+        path (str): The path of the SQLite database.
+        max_attempts (int): The number of times a job is leased before it is given up on.
+        retry_delay (float): The seconds before a failed job is retried, doubled on every retry.
+        clock (Callable[[], float]): The function returning the current epoch second.
+    """
+    def __init__(
+        self,
+        path: str,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+        retry_delay: float = JOB_RETRY_DELAY,
+        clock: Callable[[], float] = time.time
+    ):
+        self._max_attempts = max_attempts
+        self._retry_delay = retry_delay
+        self._clock = clock
+
+        # Transactions are explicit, concurrent writers wait for each other
+        self._connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.executescript(
+            '''
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id INTEGER PRIMARY KEY,
+                kind TEXT NOT NULL,
+                source TEXT NOT NULL,
+                state TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker TEXT,
+                lease_until REAL NOT NULL DEFAULT 0,
+                available_at REAL NOT NULL DEFAULT 0,
+                tweets INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                UNIQUE (kind, source)
+            );
+            CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, available_at);
+            CREATE TABLE IF NOT EXISTS workers (
+                worker TEXT PRIMARY KEY,
+                jobs INTEGER NOT NULL,
+                failures INTEGER NOT NULL,
+                tweets INTEGER NOT NULL,
+                seconds REAL NOT NULL,
+                updated REAL NOT NULL
+            );
+            '''
+        )
+
+    def add(self, kind: JobKind, sources: Iterable[str]) -> int:
+        # Screen names are case insensitive, like the keys of the response cache
+        sources = [source.lower() for source in sources]
+
+        with self._transaction():
+            before = self._connection.total_changes
+            self._connection.executemany(
+                '''
+                INSERT INTO jobs (kind, source, state) VALUES (?, ?, ?)
+                ON CONFLICT (kind, source) DO UPDATE SET
+                    state = excluded.state,
+                    attempts = 0,
+                    worker = NULL,
+                    available_at = 0,
+                    error = NULL
+                WHERE jobs.state IN (?, ?)
+                ''',
+                (
+                    (kind.value, source, JobState.PENDING.value, JobState.DONE.value, JobState.FAILED.value)
+                    for source in sources
+                )
+            )
+            return self._connection.total_changes - before
+
+    def lease(self, worker: str, lease_seconds: float = LEASE_SECONDS) -> Optional[Job]:
+        now = self._clock()
+
+        with self._transaction():
+            # Jobs whose last lease expired without attempts left are given up on
+            self._connection.execute(
+                '''
+                UPDATE jobs SET state = ?, worker = NULL, error = COALESCE(error, 'lease expired')
+                WHERE state = ? AND lease_until <= ? AND attempts >= ?
+                ''',
+                (JobState.FAILED.value, JobState.LEASED.value, now, self._max_attempts)
+            )
+
+            row = self._connection.execute(
+                '''
+                SELECT job_id, kind, source, attempts FROM jobs
+                WHERE (state = ? AND available_at <= ?) OR (state = ? AND lease_until <= ?)
+                ORDER BY job_id LIMIT 1
+                ''',
+                (JobState.PENDING.value, now, JobState.LEASED.value, now)
+            ).fetchone()
+            if row is None:
+                return None
+
+            job = Job(
+                job_id=row[0],
+                kind=JobKind(row[1]),
+                source=row[2],
+                attempts=row[3] + 1,
+                worker=worker,
+                lease_until=now + lease_seconds
+            )
+            self._connection.execute(
+                'UPDATE jobs SET state = ?, worker = ?, lease_until = ?, attempts = ? WHERE job_id = ?',
+                (JobState.LEASED.value, worker, job.lease_until, job.attempts, job.job_id)
+            )
+            return job
+
+    def complete(self, job: Job, tweets: int) -> bool:
+        return self._settle(
+            job=job,
+            assignments='state = ?, worker = NULL, tweets = ?, error = NULL',
+            values=(JobState.DONE.value, tweets)
+        )
+
+    def fail(self, job: Job, error: str) -> bool:
+        if job.attempts >= self._max_attempts:
+            return self._settle(
+                job=job,
+                assignments='state = ?, worker = NULL, error = ?',
+                values=(JobState.FAILED.value, error)
+            )
+
+        return self._settle(
+            job=job,
+            assignments='state = ?, worker = NULL, available_at = ?, error = ?',
+            values=(
+                JobState.PENDING.value,
+                self._clock() + self._retry_delay * 2 ** (job.attempts - 1),
+                error
+            )
+        )
+
+    def release(self, worker: str) -> int:
+        with self._transaction():
+            return self._connection.execute(
+                'UPDATE jobs SET state = ?, worker = NULL, available_at = 0 WHERE state = ? AND worker = ?',
+                (JobState.PENDING.value, JobState.LEASED.value, worker)
+            ).rowcount
+
+    def stats(self) -> QueueStats:
+        counts = dict(self._connection.execute('SELECT state, COUNT(*) FROM jobs GROUP BY state'))
+        return QueueStats(**{state.value: counts.get(state.value, 0) for state in JobState})
+
+    def record(self, stats: WorkerStats) -> None:
+        with self._transaction():
+            self._connection.execute(
+                '''
+                INSERT INTO workers (worker, jobs, failures, tweets, seconds, updated)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (worker) DO UPDATE SET
+                    jobs = excluded.jobs,
+                    failures = excluded.failures,
+                    tweets = excluded.tweets,
+                    seconds = excluded.seconds,
+                    updated = excluded.updated
+                ''',
+                (stats.worker, stats.jobs, stats.failures, stats.tweets, stats.seconds, self._clock())
+            )
+
+    def worker_stats(self) -> List[WorkerStats]:
+        return [
+            WorkerStats(worker=row[0], jobs=row[1], failures=row[2], tweets=row[3], seconds=row[4])
+            for row in self._connection.execute(
+                'SELECT worker, jobs, failures, tweets, seconds FROM workers ORDER BY worker'
+            )
+        ]
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def _settle(self, job: Job, assignments: str, values: tuple) -> bool:
+        """
+        Update a job the worker still holds the lease of.
+        """
+
+        with self._transaction():
+            return self._connection.execute(
+                f'UPDATE jobs SET {assignments} WHERE job_id = ? AND state = ? AND worker = ?',
+                values + (job.job_id, JobState.LEASED.value, job.worker)
+            ).rowcount == 1
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """
+        Write transaction taking the database lock upfront, so that concurrent workers
+        never read the same pending job.
+        """
+
+        self._connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except BaseException:
+            self._connection.execute('ROLLBACK')
+            raise
+        self._connection.execute('COMMIT')
@@ -0,0 +1,210 @@
+from typing import Callable, Dict, Mapping, Optional
+from dataclasses import dataclass
+import random
+import time
+
+from twitfetch.errors import GraphQLRequestError, RateLimitError
+from twitfetch._constants import (
+    HEADER_RATE_LIMIT,
+    HEADER_RATE_LIMIT_REMAINING,
+    HEADER_RATE_LIMIT_RESET,
+    STATUS_RATE_LIMITED
+)
+
+@dataclass
+class RateLimitBudget:
+    """
+    Rate limit budget of an endpoint as last announced by Twitter.
+
+    Attributes:
+        limit (Optional[int]): The number of requests allowed per window.
+        remaining (Optional[int]): The number of requests left in the current window.
+        reset (Optional[float]): The epoch second at which the window resets.
+    """
+
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset: Optional[float] = None
+
+def _header_int(headers: Mapping[str, str], name: str) -> Optional[int]:
+    """
+    Read an integer header, None if missing or malformed.
+    """
+
+    value = headers.get(name)
+    if value is None or not value.strip().isdigit():
+        return None
+    return int(value)
+
+class RateLimiter:
+    """
+    Tracks the rate limit budget of each endpoint of a session from response headers and
+    paces requests so that throughput stays at the allowed ceiling instead of running into 429s.
+
+    Requests go out freely while the budget is comfortable. Once the remaining requests drop
+    below a fraction of the limit, they are spread evenly over the rest of the window, and
+    once the budget is spent, requests wait for the window to reset.
+
+    Args:
+        pace_below (float): Fraction of the limit below which requests are spread out.
+        max_retries (int): How often a rate limited request is retried.
+        backoff_base (float): Seconds of the first backoff, doubling on every retry.
+        backoff_max (float): Upper bound of a single backoff in seconds.
+        clock (Callable[[], float]): Epoch time source.
+        sleep (Callable[[float], None]): Function used to wait.
+    """
+    def __init__(
+        self,
+        pace_below: float = 0.2,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self._pace_below = pace_below
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._clock = clock
+        self._sleep = sleep
+
+        self.max_retries = max_retries
+        self.budgets: Dict[str, RateLimitBudget] = {}
+
+    def update(self, endpoint: str, headers: Mapping[str, str]) -> None:
+        """
+        Record the budget announced by the headers of a response.
+
+        Args:
+            endpoint (str): The GraphQL endpoint of the response.
+            headers (Mapping[str, str]): The lower-cased response headers.
+        """
+
+        remaining = _header_int(headers=headers, name=HEADER_RATE_LIMIT_REMAINING)
+        if remaining is None:
+            return
+
+        self.budgets[endpoint] = RateLimitBudget(
+            limit=_header_int(headers=headers, name=HEADER_RATE_LIMIT),
+            remaining=remaining,
+            reset=_header_int(headers=headers, name=HEADER_RATE_LIMIT_RESET)
+        )
+
+    def delay(self, endpoint: str) -> float:
+        """
+        Seconds to wait before the next request to an endpoint.
+
+        Args:
+            endpoint (str): The GraphQL endpoint.
+        """
+
+        budget = self.budgets.get(endpoint)
+        if budget is None or budget.remaining is None or budget.reset is None:
+            return 0.0
+
+        window = budget.reset - self._clock()
+        if window <= 0:
+            return 0.0
+
+        if budget.remaining <= 0:
+            return window
+
+        if budget.limit and budget.remaining < budget.limit * self._pace_below:
+            return window / budget.remaining
+
+        return 0.0
+
+    def wait(self, endpoint: str) -> None:
+        """
+        Wait until the next request to an endpoint is allowed, counting it against the budget.
+
+        Args:
+            endpoint (str): The GraphQL endpoint.
+        """
+
+        self.sleep(self.delay(endpoint=endpoint))
+        self.spend(endpoint=endpoint)
+
+    def spend(self, endpoint: str) -> None:
+        """
+        Count a request to an endpoint against its budget, e.g. once an asyncio caller has
+        waited for the delay itself.
+
+        Args:
+            endpoint (str): The GraphQL endpoint.
+        """
+
+        budget = self.budgets.get(endpoint)
+        if budget is not None and budget.remaining:
+            budget.remaining -= 1
+
+    def sleep(self, seconds: float) -> None:
+        """
+        Wait for a number of seconds, returning at once if there is nothing to wait for.
+        """
+
+        if seconds > 0:
+            self._sleep(seconds)
+
+    def backoff(self, endpoint: str, attempt: int) -> float:
+        """
+        Seconds to wait before retrying a rate limited request, with jitter so that
+        sessions do not retry in lockstep.
+
+        Args:
+            endpoint (str): The GraphQL endpoint.
+            attempt (int): The number of retries made so far.
+        """
+
+        backoff = min(self._backoff_max, self._backoff_base * 2 ** attempt)
+        backoff *= random.uniform(0.5, 1.5)
+
+        # Never retry before the announced reset
+        return max(backoff, self.delay(endpoint=endpoint))
+
+    def retry_delay(
+        self,
+        endpoint: str,
+        status: int,
+        headers: Mapping[str, str],
+        attempt: int
+    ) -> Optional[float]:
+        """
+        Record the budget announced by a response and decide whether its request has to be
+        sent again, the status handling shared by every way of requesting a timeline page.
+
+        Args:
+            endpoint (str): The GraphQL endpoint of the response.
+            status (int): The status of the response.
+            headers (Mapping[str, str]): The lower-cased response headers.
+            attempt (int): The number of retries made so far.
+
+        Returns:
+            Optional[float]: None if the response was accepted, otherwise the seconds to back
+                off before sending the request again.
+        """
+
+        self.update(endpoint=endpoint, headers=headers)
+
+        if 200 <= status < 300:
+            return None
+
+        if status != STATUS_RATE_LIMITED:
+            raise GraphQLRequestError(status=status, operation=endpoint)
+
+        if attempt >= self.max_retries:
+            raise RateLimitError(endpoint=endpoint, retries=attempt)
+
+        self.rate_limited(endpoint=endpoint)
+        return self.backoff(endpoint=endpoint, attempt=attempt)
+
+    def rate_limited(self, endpoint: str) -> None:
+        """
+        Record that a request was rejected, spending the rest of the budget.
+
+        Args:
+            endpoint (str): The GraphQL endpoint.
+        """
+
+        budget = self.budgets.setdefault(endpoint, RateLimitBudget())
+        budget.remaining = 0
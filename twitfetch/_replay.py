@@ -0,0 +1,182 @@
+from typing import List, Optional
+import hashlib
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from playwright.sync_api import Response
+
+from twitfetch._constants import GRAPHQL_ENDPOINT, HAR_FILE, PAGES_DIR
+from twitfetch._graphql import parse_operation
+
+def fixture_key(cursor: Optional[str]) -> str:
+    """
+    Generate the file name of a recorded page from its cursor.
+    """
+
+    if cursor is None:
+        return 'initial'
+    return hashlib.sha1(cursor.encode()).hexdigest()[:16]
+
+def har_path(directory: str) -> str:
+    """
+    The path of the HAR archive recorded or replayed within a directory.
+    """
+
+    return os.path.join(directory, HAR_FILE)
+
+class FixtureRecorder:
+    """
+    Saves intercepted GraphQL bodies and login pages as fixtures that StandInServer and the
+    benchmarks replay.
+
+    Fixtures are laid out as <directory>/<OperationName>/<fixture_key(cursor)>.json and
+    <directory>/pages/<name>.html.
+
+    Args:
+        directory (str): The directory to record into.
+
+    Attributes:
+        recorded (List[str]): The paths of every fixture written.
+    """
+    def __init__(self, directory: str):
+        self._directory = directory
+        self.recorded: List[str] = []
+
+        os.makedirs(directory, exist_ok=True)
+
+    def _write(self, path: str, body: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write atomically, the same cursor may be recorded twice
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(body)
+        os.replace(temp_path, path)
+
+        self.recorded.append(path)
+
+    def callback(self, response: Response) -> None:
+        """
+        Callback for interception of GraphQL responses.
+
+        Args:
+            response (Response): The response from network request.
+        """
+
+        if GRAPHQL_ENDPOINT not in response.url or response.status != 200:
+            return
+
+        operation = parse_operation(url=response.url)
+        if operation is None:
+            return
+
+        cursor = operation.variables.get('cursor')
+        self._write(
+            path=os.path.join(self._directory, operation.name, f'{fixture_key(cursor)}.json'),
+            body=response.body()
+        )
+
+    def record_page(self, name: str, page_source: str) -> None:
+        """
+        Save the DOM of a page, e.g. a step of the login flow.
+
+        Args:
+            name (str): The name of the page.
+            page_source (str): The DOM of the page.
+        """
+
+        self._write(
+            path=os.path.join(self._directory, PAGES_DIR, f'{name}.html'),
+            body=page_source.encode()
+        )
+
+class StandInServer:
+    """
+    Local stand-in for the GraphQL API serving recorded responses.
+
+    Fixtures are laid out as <fixtures_dir>/<OperationName>/<fixture_key(cursor)>.json.
+
+    Args:
+        fixtures_dir (str): The directory of recorded responses for one account or list.
+        rate_limited (int): The number of leading requests rejected with a 429.
+        rate_limit (int): The budget announced in the rate limit headers of every response.
+
+    Attributes:
+        requests (List[dict]): The variables of every request served.
+    """
+    def __init__(self, fixtures_dir: str, rate_limited: int = 0, rate_limit: int = 50):
+        self._fixtures_dir = fixtures_dir
+        self._rate_limited = rate_limited
+        self._rate_limit = rate_limit
+        self.requests: List[dict] = []
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server._handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """
+        The base URL to use in place of the GraphQL API URL.
+        """
+
+        host, port = self._server.server_address
+        return f'http://{host}:{port}/i/api/graphql'
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        """
+        Serve the recorded response matching the requested operation and cursor.
+        """
+
+        if not handler.headers.get('authorization') or not handler.headers.get('x-csrf-token'):
+            handler.send_response(403)
+            handler.end_headers()
+            return
+
+        parsed = urlparse(handler.path)
+        operation = parsed.path.rstrip('/').split('/')[-1]
+        variables = json.loads(parse_qs(parsed.query)['variables'][0])
+        self.requests.append({'operation': operation, **variables})
+
+        rejected = len(self.requests) <= self._rate_limited
+        remaining = 0 if rejected else max(0, self._rate_limit - len(self.requests))
+
+        path = os.path.join(
+            self._fixtures_dir, operation, f"{fixture_key(variables.get('cursor'))}.json"
+        )
+        if rejected:
+            status, body = 429, b''
+        elif not os.path.exists(path):
+            status, body = 404, b''
+        else:
+            with open(path, 'rb') as f:
+                status, body = 200, f.read()
+
+        handler.send_response(status)
+        handler.send_header('x-rate-limit-limit', str(self._rate_limit))
+        handler.send_header('x-rate-limit-remaining', str(remaining))
+        handler.send_header('x-rate-limit-reset', str(int(time.time()) + 1))
+        handler.send_header('content-type', 'application/json')
+        handler.send_header('content-length', str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def __enter__(self) -> 'StandInServer':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._server.shutdown()
+        self._server.server_close()
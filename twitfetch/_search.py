@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
+
+from twitfetch._constants import SEARCH_SLICE_DAYS, URL_TWITTER_SEARCH
+from twitfetch._data_structures import SearchSlice, Tweet
+from twitfetch.typing import Tweets
+
+def build_search_query(account: str, since: datetime, until: datetime) -> str:
+    """
+    Build the query searching the tweets of an account within a time range.
+
+    Bounds are given as epoch seconds through since_time and until_time rather than as
+    since and until dates, so that slices need not align with days in any timezone.
+
+    Args:
+        account (str): The screen name of a Twitter account.
+        since (datetime): The start of the range, inclusive.
+        until (datetime): The end of the range, exclusive.
+    """
+
+    return f'from:{account} since_time:{int(since.timestamp())} until_time:{int(until.timestamp())}'
+
+def search_url(query: str) -> str:
+    """
+    Generate the URL of the latest results of a search.
+    """
+
+    return f"{URL_TWITTER_SEARCH}?{urlencode({'q': query, 'src': 'typed_query', 'f': 'live'})}"
+
+def plan_search(
+    account: str,
+    time_start: Optional[datetime],
+    time_end: Optional[datetime] = None,
+    slice_days: float = SEARCH_SLICE_DAYS
+) -> List[SearchSlice]:
+    """
+    Split a backfill window into searches that can be fetched in parallel, newest first.
+
+    Args:
+        account (str): The screen name of a Twitter account.
+        time_start (Optional[datetime]): The oldest creation datetime to fetch.
+        time_end (Optional[datetime]): The newest creation datetime to fetch, now if None.
+        slice_days (float): The days each search covers.
+
+    Returns:
+        List[SearchSlice]: The searches covering the window.
+    """
+
+    if time_start is None:
+        raise ValueError('backfilling through search requires a time_start')
+
+    # The end of the window is inclusive to the second
+    until = datetime.now(tz=timezone.utc) if time_end is None else time_end + timedelta(seconds=1)
+    length = timedelta(days=slice_days)
+
+    slices = []
+    while until > time_start:
+        since = max(time_start, until - length)
+        slices.append(SearchSlice(
+            query=build_search_query(account=account, since=since, until=until),
+            since=since,
+            until=until
+        ))
+        until = since
+
+    return slices
+
+def merge_search_results(results: List[Tweets], tweet_limit: Optional[int] = None) -> Tweets:
+    """
+    Merge the tweets of several searches, dropping tweets found by more than one.
+
+    Args:
+        results (List[Tweets]): The tweets of each search.
+        tweet_limit (Optional[int]): The number of newest tweets kept, every tweet if None.
+
+    Returns:
+        Tweets: The tweets in chronological order, oldest first.
+    """
+
+    merged: Dict[int, Tweet] = {}
+    for tweets in results:
+        for tweet in tweets:
+            merged.setdefault(tweet.tweet_id, tweet)
+
+    # Tweet IDs increase over time
+    tweets = [merged[tweet_id] for tweet_id in sorted(merged)]
+    if tweet_limit is not None and len(tweets) > tweet_limit:
+        tweets = tweets[len(tweets) - tweet_limit:]
+    return tweets
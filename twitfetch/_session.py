@@ -0,0 +1,107 @@
+from typing import Optional
+import hashlib
+import json
+import os
+import time
+
+from twitfetch._constants import AUTH_COOKIE
+
+def is_state_expired(state: dict) -> bool:
+    """
+    Check whether a saved storage state no longer holds a usable authentication cookie.
+
+    Args:
+        state (dict): A Playwright storage state.
+
+    Returns:
+        bool: Whether the state has to be replaced by a fresh login.
+    """
+
+    for cookie in state.get('cookies', []):
+        if cookie.get('name') == AUTH_COOKIE:
+            expires = cookie.get('expires', -1)
+            return expires != -1 and expires < time.time()
+
+    return True
+
+class SessionStore:
+    """
+    Saves the storage state of logged in browser contexts to disk, one file per account,
+    readable by the owner only.
+
+    Args:
+        directory (str): The directory holding the saved states.
+    """
+    def __init__(self, directory: str):
+        self._directory = directory
+        os.makedirs(self._directory, mode=0o700, exist_ok=True)
+
+    def _path(self, username: str) -> str:
+        """
+        Generate the file path of the state saved for an account.
+        """
+
+        key = hashlib.sha1(username.lower().encode()).hexdigest()[:16]
+        return os.path.join(self._directory, f'{key}.json')
+
+    def load(self, username: str) -> Optional[dict]:
+        """
+        Load the state saved for an account.
+
+        Args:
+            username (str): The login username of the account.
+
+        Returns:
+            Optional[dict]: The storage state, None if missing or expired.
+        """
+
+        path = self._path(username=username)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if is_state_expired(state=state):
+            return None
+
+        return state
+
+    def save(self, username: str, state: dict) -> None:
+        """
+        Save the state of an account, replacing any previous state atomically.
+
+        Args:
+            username (str): The login username of the account.
+            state (dict): A Playwright storage state.
+        """
+
+        path = self._path(username=username)
+        temp = f'{path}.tmp'
+
+        # The state holds the authentication cookie, only the owner may read it. A temp file
+        # left over by a crash is removed first, since opening it keeps its permissions
+        try:
+            os.remove(temp)
+        except FileNotFoundError:
+            pass
+
+        descriptor = os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(descriptor, 'w') as f:
+            json.dump(state, f)
+        os.replace(temp, path)
+
+    def delete(self, username: str) -> None:
+        """
+        Remove the state saved for an account.
+
+        Args:
+            username (str): The login username of the account.
+        """
+
+        path = self._path(username=username)
+        if os.path.exists(path):
+            os.remove(path)
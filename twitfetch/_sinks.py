@@ -0,0 +1,264 @@
+from abc import ABC, abstractmethod
+from typing import Iterator, Optional
+import json
+import os
+import sqlite3
+
+from twitfetch._batch import TweetBatch
+
+class TweetSink(ABC):
+    """
+    Writes tweets to disk in batches as timeline pages are parsed, so that exports hold at
+    most one batch in memory. Rows are written straight from the columns of a TweetBatch.
+
+    Args:
+        batch_size (int): The number of tweets buffered before they are written.
+
+    Attributes:
+        written (int): The number of tweets written so far.
+    """
+    def __init__(self, batch_size: int):
+        self._batch_size = batch_size
+        self._buffer = TweetBatch()
+        self.written = 0
+
+    def write(self, batch: TweetBatch) -> None:
+        """
+        Buffer tweets, writing them once the buffer holds a full batch.
+
+        Args:
+            batch (TweetBatch): The accepted tweets of a timeline page.
+        """
+
+        self._buffer.extend(batch)
+        if len(self._buffer) >= self._batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write every buffered tweet.
+        """
+
+        if len(self._buffer):
+            self._write(batch=self._buffer)
+            self.written += len(self._buffer)
+            self._buffer = TweetBatch()
+
+    def close(self) -> None:
+        """
+        Write every buffered tweet and close the output.
+        """
+
+        self.flush()
+        self._close()
+
+    @abstractmethod
+    def _write(self, batch: TweetBatch) -> None:
+        pass
+
+    def _close(self) -> None:
+        pass
+
+    def __enter__(self) -> 'TweetSink':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+class JSONLSink(TweetSink):
+    """
+    Writes one JSON object per line, keyed by Tweet field, creation times being UTC epoch seconds.
+
+    Args:
+        path (str): The path of the JSONL file.
+        append (bool): Whether to append to an existing file rather than overwrite it.
+        batch_size (int): The number of tweets buffered before they are written.
+    """
+    def __init__(self, path: str, append: bool = False, batch_size: int = 1000):
+        super().__init__(batch_size=batch_size)
+        self._file = open(path, 'a' if append else 'w', encoding='utf-8')
+
+    def _write(self, batch: TweetBatch) -> None:
+        self._file.write(''.join(
+            json.dumps(
+                {
+                    'user_name': user_name,
+                    'user_id': user_id,
+                    'tweet_id': tweet_id,
+                    'created': created,
+                    'content': content
+                },
+                ensure_ascii=False
+            ) + '\n'
+            for user_name, user_id, tweet_id, created, content in zip(
+                batch.user_names, batch.user_ids, batch.tweet_ids, batch.created, batch.contents
+            )
+        ))
+
+    def flush(self) -> None:
+        """
+        Write every buffered tweet and sync the file to disk, so that flushed tweets survive
+        a crash of the machine.
+        """
+
+        super().flush()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _close(self) -> None:
+        self._file.close()
+
+def read_jsonl(path: str, batch_size: int = 1000) -> Iterator[TweetBatch]:
+    """
+    Read back the tweets written by a JSONLSink in batches, skipping a line cut short by a
+    writer that died mid-write.
+
+    Args:
+        path (str): The path of the JSONL file.
+        batch_size (int): The number of tweets per batch.
+
+    Yields:
+        TweetBatch: Each batch of tweets, in the order written.
+    """
+
+    batch = TweetBatch()
+
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue
+
+            batch.append(**row)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = TweetBatch()
+
+    if len(batch):
+        yield batch
+
+class ParquetSink(TweetSink):
+    """
+    Writes a Parquet file, one row group per batch, requires pyarrow to be installed.
+
+    The ID and creation time columns are handed to Arrow without copying.
+
+    Args:
+        path (str): The path of the Parquet file.
+        batch_size (int): The number of tweets per row group.
+        compression (str): The compression codec of the file.
+    """
+    def __init__(self, path: str, batch_size: int = 100000, compression: str = 'zstd'):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError('ParquetSink requires pyarrow, install it with `pip install pyarrow`')
+
+        super().__init__(batch_size=batch_size)
+        self._pyarrow = pyarrow
+        self._schema = pyarrow.schema([
+            ('user_name', pyarrow.string()),
+            ('user_id', pyarrow.int64()),
+            ('tweet_id', pyarrow.int64()),
+            ('created', pyarrow.timestamp('s', tz='UTC')),
+            ('content', pyarrow.string())
+        ])
+        self._writer = pyarrow.parquet.ParquetWriter(path, self._schema, compression=compression)
+
+    def _column(self, values, data_type):
+        return self._pyarrow.Array.from_buffers(
+            data_type, len(values), [None, self._pyarrow.py_buffer(values)]
+        )
+
+    def _write(self, batch: TweetBatch) -> None:
+        pyarrow = self._pyarrow
+        self._writer.write_table(pyarrow.Table.from_arrays(
+            [
+                pyarrow.array(batch.user_names, type=pyarrow.string()),
+                self._column(batch.user_ids, pyarrow.int64()),
+                self._column(batch.tweet_ids, pyarrow.int64()),
+                self._column(batch.created, pyarrow.timestamp('s', tz='UTC')),
+                pyarrow.array(batch.contents, type=pyarrow.string())
+            ],
+            schema=self._schema
+        ))
+
+    def _close(self) -> None:
+        self._writer.close()
+
+class SQLiteSink(TweetSink):
+    """
+    Writes tweets to a SQLite table keyed by tweet ID, tweets written again replacing the
+    stored row, so that overlapping exports never duplicate a tweet.
+
+    Args:
+        path (str): The path of the SQLite database.
+        table (str): The name of the table, created if missing.
+        batch_size (int): The number of tweets written per transaction.
+    """
+    def __init__(self, path: str, table: str = 'tweets', batch_size: int = 1000):
+        if not table.isidentifier():
+            raise ValueError(f'invalid table name {table!r}')
+
+        super().__init__(batch_size=batch_size)
+        self._connection = sqlite3.connect(path)
+        self._connection.execute('PRAGMA journal_mode = WAL')
+        self._connection.execute(
+            f'''
+            CREATE TABLE IF NOT EXISTS {table} (
+                tweet_id INTEGER PRIMARY KEY,
+                user_name TEXT NOT NULL,
+                user_id INTEGER NOT NULL,
+                created INTEGER NOT NULL,
+                content TEXT
+            )
+            '''
+        )
+        self._connection.commit()
+
+        self._upsert = f'''
+            INSERT INTO {table} (tweet_id, user_name, user_id, created, content)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (tweet_id) DO UPDATE SET
+                user_name = excluded.user_name,
+                user_id = excluded.user_id,
+                created = excluded.created,
+                content = excluded.content
+        '''
+
+    def _write(self, batch: TweetBatch) -> None:
+        with self._connection:
+            self._connection.executemany(
+                self._upsert,
+                zip(batch.tweet_ids, batch.user_names, batch.user_ids, batch.created, batch.contents)
+            )
+
+    def _close(self) -> None:
+        self._connection.close()
+
+def open_sink(path: str, batch_size: Optional[int] = None) -> TweetSink:
+    """
+    Open the sink matching the extension of a path, .jsonl, .parquet or .db/.sqlite.
+
+    Args:
+        path (str): The path of the output.
+        batch_size (Optional[int]): The number of tweets buffered before they are written,
+            the default of the sink is used if None.
+
+    Returns:
+        TweetSink: The sink writing to the path.
+    """
+
+    options = {} if batch_size is None else {'batch_size': batch_size}
+    extension = path.rsplit('.', 1)[-1].lower()
+
+    if extension in ('jsonl', 'ndjson'):
+        return JSONLSink(path, **options)
+    if extension == 'parquet':
+        return ParquetSink(path, **options)
+    if extension in ('db', 'sqlite', 'sqlite3'):
+        return SQLiteSink(path, **options)
+
+    raise ValueError(f'no sink writes {path!r}, expected a .jsonl, .parquet or .db path')
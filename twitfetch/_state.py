@@ -0,0 +1,94 @@
+from typing import Optional
+from datetime import datetime
+import sqlite3
+import time
+
+from twitfetch._data_structures import HighWaterMark
+
+class HighWaterMarkStore:
+    """
+    Persists the newest tweet seen per timeline in SQLite, so that polls only return new tweets.
+
+    The worker processes of a sharded run share the database, so writers wait for each other
+    rather than failing while another one holds the lock.
+
+    Args:
+        path (str): The path of the SQLite database.
+    """
+    def __init__(self, path: str):
+        self._connection = sqlite3.connect(path, timeout=30)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            '''
+            CREATE TABLE IF NOT EXISTS high_water_marks (
+                endpoint TEXT NOT NULL,
+                source TEXT NOT NULL,
+                tweet_id INTEGER NOT NULL,
+                created TEXT,
+                updated REAL NOT NULL,
+                PRIMARY KEY (endpoint, source)
+            )
+            '''
+        )
+        self._connection.commit()
+
+    def get(self, endpoint: str, source: str) -> Optional[HighWaterMark]:
+        """
+        Retrieve the newest tweet seen on a timeline.
+
+        Args:
+            endpoint (str): The GraphQL endpoint of the timeline.
+            source (str): The screen name or list ID of the timeline.
+
+        Returns:
+            Optional[HighWaterMark]: The newest tweet seen, None if the timeline was never fetched.
+        """
+
+        row = self._connection.execute(
+            'SELECT tweet_id, created FROM high_water_marks WHERE endpoint = ? AND source = ?',
+            (endpoint, source.lower())
+        ).fetchone()
+
+        if row is None:
+            return None
+        return HighWaterMark(
+            tweet_id=row[0],
+            created=None if row[1] is None else datetime.fromisoformat(row[1])
+        )
+
+    def update(self, endpoint: str, source: str, mark: HighWaterMark) -> None:
+        """
+        Advance the newest tweet seen on a timeline, older marks never replace newer ones.
+
+        Args:
+            endpoint (str): The GraphQL endpoint of the timeline.
+            source (str): The screen name or list ID of the timeline.
+            mark (HighWaterMark): The newest tweet returned by the latest fetch.
+        """
+
+        self._connection.execute(
+            '''
+            INSERT INTO high_water_marks (endpoint, source, tweet_id, created, updated)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (endpoint, source) DO UPDATE SET
+                tweet_id = excluded.tweet_id,
+                created = excluded.created,
+                updated = excluded.updated
+            WHERE excluded.tweet_id > high_water_marks.tweet_id
+            ''',
+            (
+                endpoint,
+                source.lower(),
+                mark.tweet_id,
+                None if mark.created is None else mark.created.isoformat(),
+                time.time()
+            )
+        )
+        self._connection.commit()
+
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+
+        self._connection.close()
@@ -0,0 +1,142 @@
+from typing import List, Optional, Sequence, Tuple
+from datetime import datetime, timedelta, timezone
+
+from twitfetch._constants import MONTHS, SNOWFLAKE_EPOCH_MS, SNOWFLAKE_TIMESTAMP_SHIFT
+
+def parse_created_at(created: str) -> datetime:
+    """
+    Convert the fixed format creation date of the GraphQL response, e.g.
+    'Mon Nov 20 18:30:00 +0000 2023', to a UTC datetime without going through strptime.
+
+    Args:
+        created (str): The string representation of the created date field.
+
+    Returns:
+        datetime: The converted timezone aware UTC datetime.
+    """
+
+    _, month, day, clock, offset, year = created.split(' ')
+
+    parsed = datetime(
+        int(year),
+        MONTHS[month],
+        int(day),
+        int(clock[0:2]),
+        int(clock[3:5]),
+        int(clock[6:8]),
+        tzinfo=timezone.utc
+    )
+
+    # Twitter always reports UTC, but honor any other offset
+    if offset != '+0000':
+        minutes = int(offset[1:3]) * 60 + int(offset[3:5])
+        parsed -= timedelta(minutes=minutes if offset[0] == '+' else -minutes)
+
+    return parsed
+
+def snowflake_to_datetime(tweet_id: int) -> datetime:
+    """
+    Decode the creation datetime, to the millisecond, embedded in a tweet ID.
+
+    Args:
+        tweet_id (int): A tweet ID issued since November 2010.
+
+    Returns:
+        datetime: The timezone aware UTC datetime.
+    """
+
+    epoch_ms = (tweet_id >> SNOWFLAKE_TIMESTAMP_SHIFT) + SNOWFLAKE_EPOCH_MS
+    return datetime.fromtimestamp(epoch_ms / 1000, tz=timezone.utc)
+
+def datetime_to_snowflake(moment: datetime) -> int:
+    """
+    Encode a datetime as the smallest tweet ID that can be issued at or after it.
+
+    Args:
+        moment (datetime): A timezone aware datetime.
+
+    Returns:
+        int: The tweet ID, 0 for datetimes before tweet IDs carried a timestamp.
+    """
+
+    epoch_ms = int(moment.timestamp() * 1000)
+    return max(0, epoch_ms - SNOWFLAKE_EPOCH_MS) << SNOWFLAKE_TIMESTAMP_SHIFT
+
+class TimeWindow:
+    """
+    Time window and high-water mark expressed as a range of tweet IDs, so that pages, or the
+    IDs column of a TweetBatch, are filtered without materializing a datetime per tweet.
+
+    Tweet IDs embed their creation time in milliseconds while creation dates are truncated
+    to the second, so the end of the window extends to the end of its second. Tweets from
+    before November 2010 carry no timestamp and always pass a window starting earlier.
+
+    Args:
+        time_start (Optional[datetime]): The oldest creation datetime to accept.
+        time_end (Optional[datetime]): The newest creation datetime to accept.
+        since_id (Optional[int]): The newest tweet ID seen by a previous fetch.
+
+    Attributes:
+        id_low (Optional[int]): The smallest tweet ID accepted.
+        id_high (Optional[int]): The smallest tweet ID past the end of the window.
+    """
+    def __init__(
+        self,
+        time_start: Optional[datetime] = None,
+        time_end: Optional[datetime] = None,
+        since_id: Optional[int] = None
+    ):
+        bounds = []
+        if time_start is not None:
+            bounds.append(datetime_to_snowflake(moment=time_start))
+        if since_id is not None:
+            bounds.append(since_id + 1)
+
+        self.id_low: Optional[int] = max(bounds) if bounds else None
+        self.id_high: Optional[int] = None
+        if time_end is not None:
+            self.id_high = datetime_to_snowflake(
+                moment=time_end.replace(microsecond=0) + timedelta(seconds=1)
+            )
+
+    def select(
+        self,
+        tweet_ids: Sequence[int],
+        newest_ids: Optional[Sequence[int]] = None
+    ) -> Tuple[List[int], bool]:
+        """
+        Select the tweets of a page falling within the window.
+
+        Tweets out of the window are skipped rather than ending the page, since the items of
+        a conversation module come oldest first: a thread root older than the window may
+        precede replies within it. Whether the page reached past the start of the window is
+        decided from the newest tweet of each entry, entries coming newest first.
+
+        Args:
+            tweet_ids (Sequence[int]): The tweet IDs of a page, e.g. the IDs column of a TweetBatch.
+            newest_ids (Optional[Sequence[int]]): The newest tweet ID of each entry of the page,
+                as found by find_entry_newest_ids, each tweet is taken as an entry of its own
+                if None.
+
+        Returns:
+            Tuple[List[int], bool]: The indices of the tweets within the window, and whether
+                the page reached past the start of the window, in which case no later page
+                can hold a tweet within it.
+        """
+
+        id_low, id_high = self.id_low, self.id_high
+
+        if id_low is None and id_high is None:
+            return list(range(len(tweet_ids))), False
+
+        if id_low is None:
+            selected = [index for index, tweet_id in enumerate(tweet_ids) if tweet_id < id_high]
+            return selected, False
+
+        if id_high is None:
+            selected = [index for index, tweet_id in enumerate(tweet_ids) if tweet_id >= id_low]
+        else:
+            selected = [index for index, tweet_id in enumerate(tweet_ids) if id_low <= tweet_id < id_high]
+
+        newest_ids = tweet_ids if newest_ids is None else newest_ids
+        return selected, bool(newest_ids) and min(newest_ids) < id_low
@@ -1,10 +1,18 @@
-from typing import List, Optional, Union
+from typing import Any, Iterator, List, Optional, Union
 from datetime import datetime
+from functools import lru_cache
 
 from playwright.sync_api import Response
 import pytz
 
+from twitfetch.errors import ResponseDecodeError
 from twitfetch._constants import TWEET_COLUMNS
+from twitfetch._json import get_decoder, JSONDecoder
+from twitfetch._metrics import Metrics
+
+@lru_cache(maxsize=None)
+def _default_decoder() -> JSONDecoder:
+    return get_decoder()
 
 def generate_url(url: str, path: str) -> str:
     """
@@ -48,29 +56,46 @@ def convert_string_to_datetime(date: Optional[str]) -> datetime:
         datetime.strptime(date, "%Y-%m-%d")
     )
 
-def find_key_in_dict(obj: Union[dict, list], key: str) -> List[dict]:
+def iter_key_in_dict(obj: Union[dict, list], key: str) -> Iterator[Any]:
     """
-    Find all values of a given key within a nested dict or list of dicts.
+    Lazily find all truthy values of a given key within a nested dict or list of dicts,
+    in depth-first order without recursion.
+
+    Args:
+        obj (dict | list): A nested dict or list of dicts.
+        key (str): The key to search for.
+
+    Yields:
+        Any: Each value found for the key.
     """
 
-    def helper(obj: Union[dict, list], key: str, lst: list) -> list:
-        if not obj:
-            return lst
+    stack = [obj]
 
-        if isinstance(obj, list):
-            for e in obj:
-                lst.extend(helper(e, key, []))
-            return lst
+    while stack:
+        current = stack.pop()
 
-        if isinstance(obj, dict) and obj.get(key):
-            lst.append(obj[key])
+        if isinstance(current, dict):
+            value = current.get(key)
+            if value:
+                yield value
 
-        if isinstance(obj, dict) and obj:
-            for k in obj:
-                lst.extend(helper(obj[k], key, []))
-        return lst
+            children = current.values()
+        elif isinstance(current, list):
+            children = current
+        else:
+            continue
+
+        # Push children reversed so they are visited in their original order
+        stack.extend(
+            child for child in reversed(list(children)) if isinstance(child, (dict, list))
+        )
+
+def find_key_in_dict(obj: Union[dict, list], key: str) -> List[Any]:
+    """
+    Find all values of a given key within a nested dict or list of dicts.
+    """
 
-    return helper(obj, key, [])
+    return list(iter_key_in_dict(obj=obj, key=key))
 
 def _flatten(sequence: Union[list, tuple]) -> list:
     """
@@ -91,12 +116,43 @@ def _flatten(sequence: Union[list, tuple]) -> list:
             flat.append(e)
     return flat
 
-def parse_json(responses: List[Response]) -> list:
+def decode_json(body: bytes, url: str, decode: Optional[JSONDecoder] = None) -> Any:
     """
-    Retrieves and loads JSON from response.
+    Decode a JSON body.
+
+    Args:
+        body (bytes): The raw response body.
+        url (str): The URL the body was received from, reported on failure.
+        decode (Optional[JSONDecoder]): The decoding function, the fastest installed
+            backend is used if None.
+
+    Returns:
+        Any: The decoded JSON.
+    """
+
+    decode = _default_decoder() if decode is None else decode
+
+    try:
+        return decode(body)
+    except ValueError as e:
+        raise ResponseDecodeError(url=url, reason=str(e)) from e
+
+def parse_json(
+    responses: List[Response],
+    decode: Optional[JSONDecoder] = None,
+    metrics: Optional[Metrics] = None,
+    endpoint: Optional[str] = None
+) -> list:
+    """
+    Retrieves and loads JSON from response bodies.
 
     Args:
         responses (list): A list of responses.
+        decode (Optional[JSONDecoder]): The decoding function, the fastest installed
+            backend is used if None.
+        metrics (Optional[Metrics]): The metrics counting the bytes received and timing
+            the decoding, nothing is measured if None.
+        endpoint (Optional[str]): The GraphQL endpoint labelling the measurements.
 
     Returns:
         list: The extracted list of JSON responses.
@@ -105,13 +161,16 @@ def parse_json(responses: List[Response]) -> list:
     temp = responses[:]
     if any(isinstance(r, (list, tuple)) for r in responses):
         temp = _flatten(responses)
-    results = []
 
-    # Iterate through responses
+    if metrics is None:
+        return [decode_json(body=r.body(), url=r.url, decode=decode) for r in temp]
+
+    labels = {} if endpoint is None else {'endpoint': endpoint}
+    decoded = []
     for r in temp:
-        try:
-            data = r.json()
-            results.append(data)
-        except Exception as e:
-            print('Cannot parse JSON response', e)
-    return results
\ No newline at end of file
+        body = r.body()
+        metrics.increment('bytes_received', len(body), **labels)
+        with metrics.timer('decode_seconds', **labels):
+            decoded.append(decode_json(body=body, url=r.url, decode=decode))
+
+    return decoded
@@ -0,0 +1,298 @@
+from typing import List, Optional
+import time
+
+from playwright.sync_api import Page
+
+from twitfetch.errors import (
+    GraphQLRequestError,
+    RateLimitError,
+    ResponseDroppedError,
+    ResponseTimeoutError
+)
+from twitfetch._cache import ResponseCache
+from twitfetch._callback import ResponseCapture
+from twitfetch._constants import Endpoints, STATUS_RATE_LIMITED
+from twitfetch._json import JSONDecoder
+from twitfetch._metrics import Metrics, timed
+from twitfetch._paginate import TimelinePaginator
+from twitfetch._ratelimit import RateLimiter
+from twitfetch._parse import find_entry_newest_ids, find_next_cursor, parse_tweets_response
+from twitfetch._utils import parse_json
+from twitfetch.typing import Tweets
+
+class TimelineWorker:
+    """
+    Walks one timeline at a time on a page of its own without blocking on navigation or
+    scrolling, so that several workers can load timelines concurrently in one browser.
+
+    Args:
+        page (Page): The page the worker navigates.
+        scroll_timeout (float): Seconds to wait for a new timeline page after scrolling.
+        scroll_retries (int): How often to scroll again before concluding the timeline has ended.
+        rate_limiter (Optional[RateLimiter]): The rate limiter shared by the workers of a session,
+            scrolls are deferred rather than slept on while it asks to wait.
+        decode (Optional[JSONDecoder]): The function decoding response bodies, the fastest
+            installed JSON backend is used if None.
+        metrics (Optional[Metrics]): The metrics timing parsing and counting responses, tweets
+            and retries, nothing is measured if None.
+        cache (Optional[ResponseCache]): The cache every page loaded is stored in, keyed like
+            the pages of ResponseCache.pages, nothing is cached if None.
+
+    Attributes:
+        page (Page): The page the worker navigates.
+        source (Optional[str]): The screen name or list ID of the current timeline.
+        paginator (Optional[TimelinePaginator]): The paginator of the current timeline.
+        tweets (Tweets): The tweets accepted from the current timeline.
+        error (Optional[Exception]): The error that ended the current timeline, if any,
+            including pages dropped by the capture because the worker fell behind.
+    """
+    def __init__(
+        self,
+        page: Page,
+        scroll_timeout: float,
+        scroll_retries: int,
+        rate_limiter: Optional[RateLimiter] = None,
+        decode: Optional[JSONDecoder] = None,
+        metrics: Optional[Metrics] = None,
+        cache: Optional[ResponseCache] = None
+    ):
+        self.page = page
+        self._scroll_timeout = scroll_timeout
+        self._scroll_retries = scroll_retries
+        self._rate_limiter = RateLimiter() if rate_limiter is None else rate_limiter
+        self._decode = decode
+        self._metrics = metrics
+        self._cache = cache
+
+        self.source: Optional[str] = None
+        self.paginator: Optional[TimelinePaginator] = None
+        self.tweets: Tweets = []
+        self.error: Optional[Exception] = None
+
+        self._endpoint: Optional[Endpoints] = None
+        self._users: Optional[List[str]] = None
+        self._capture: Optional[ResponseCapture] = None
+        self._url: Optional[str] = None
+        self._retries = 0
+        self._rate_limit_retries = 0
+        self._first_page = True
+        self._timeout = 0.0
+        self._deadline = 0.0
+        self._resume_at: Optional[float] = None
+        self._cursor: Optional[str] = None
+        self._keyed = True
+
+    def start(
+        self,
+        source: str,
+        url: str,
+        endpoint: Endpoints,
+        users: Optional[List[str]],
+        paginator: TimelinePaginator,
+        timeout: float
+    ) -> None:
+        """
+        Start loading a timeline, returning as soon as the navigation has been committed.
+
+        Args:
+            source (str): The screen name or list ID of the timeline.
+            url (str): The url to navigate where tweets will be populated.
+            endpoint (Endpoints): The GraphQL endpoint.
+            users (Optional[List[str]]): The screen names of the accounts to keep tweets from.
+            paginator (TimelinePaginator): The paginator deciding when to stop.
+            timeout (float): Seconds to wait for the first page of the timeline.
+        """
+
+        self.source = source
+        self.paginator = paginator
+        self.tweets = []
+        self.error = None
+
+        self._endpoint = endpoint
+        self._users = users
+        self._url = url
+        self._retries = 0
+        self._rate_limit_retries = 0
+        self._first_page = True
+        self._timeout = timeout
+        self._resume_at = None
+        self._cursor = None
+        self._keyed = True
+
+        self._capture = ResponseCapture(
+            target=self.page,
+            endpoint=endpoint,
+            rate_limiter=self._rate_limiter,
+            metrics=self._metrics
+        ).open()
+        self._navigate()
+
+    def poll(self) -> bool:
+        """
+        Consume the responses received since the last poll and scroll for the next page.
+
+        Returns:
+            bool: Whether the timeline is finished.
+        """
+
+        captured = self._capture.drain()
+        responses = [response for response in captured if response.status == 200]
+
+        # The tweets of a dropped page would be skipped without a trace
+        dropped = self._capture.stats.dropped
+        if dropped:
+            self.error = ResponseDroppedError(endpoint=self._endpoint.value, dropped=dropped)
+            return True
+
+        if responses:
+            endpoint = self._endpoint.value
+
+            page = parse_json(
+                responses=responses,
+                decode=self._decode,
+                metrics=self._metrics,
+                endpoint=endpoint
+            )
+            self._store(page=page)
+
+            with timed(self._metrics, 'parse_seconds', endpoint=endpoint):
+                tweets = parse_tweets_response(
+                    tweets=page,
+                    users=self._users,
+                    do_remove_retweets=True
+                )
+            accepted = self.paginator.feed(
+                tweets=tweets,
+                newest_ids=find_entry_newest_ids(responses=page)
+            )
+            self.tweets.extend(accepted)
+
+            if self._metrics is not None:
+                self._metrics.increment('pages', endpoint=endpoint)
+                self._metrics.increment('tweets', len(accepted), endpoint=endpoint)
+                self._metrics.observe('responses_per_page', len(responses), endpoint=endpoint)
+
+            if self.paginator.done:
+                return True
+
+            self._first_page = False
+            self._retries = 0
+            self._rate_limit_retries = 0
+            self._scroll()
+            return False
+
+        if captured:
+            return self._back_off(status=captured[-1].status)
+
+        # Trigger the page put off while the rate limit budget was spent
+        if self._resume_at is not None:
+            if time.monotonic() < self._resume_at:
+                return False
+
+            self._resume_at = None
+            if self._first_page:
+                self._navigate()
+            else:
+                self._scroll()
+            return False
+
+        if time.monotonic() < self._deadline:
+            return False
+
+        if self._first_page:
+            self.error = ResponseTimeoutError(endpoint=self._endpoint.value, timeout=self._timeout)
+            return True
+
+        # The previous page may not have been rendered yet when scrolling
+        if self._retries < self._scroll_retries:
+            self._retries += 1
+            if self._metrics is not None:
+                self._metrics.increment('retries', endpoint=self._endpoint.value, reason='scroll')
+            self._scroll()
+            return False
+
+        return True
+
+    def stop(self) -> None:
+        """
+        Stop listening to the responses of the current timeline.
+        """
+
+        if self._capture is not None:
+            self._capture.close()
+            self._capture = None
+
+    def _store(self, page: List[dict]) -> None:
+        """
+        Cache a page under the bottom cursor of the page before it.
+        """
+
+        if self._cache is None or not self._keyed:
+            return
+
+        self._cache.put(endpoint=self._endpoint.value, source=self.source, cursor=self._cursor, page=page)
+
+        # Pages past one without a next cursor cannot be keyed
+        self._cursor = find_next_cursor(response=page[-1], cursor=self._cursor)
+        self._keyed = self._cursor is not None
+
+    def _back_off(self, status: int) -> bool:
+        """
+        Put off triggering the rejected timeline page again, giving up once out of retries.
+
+        Args:
+            status (int): The status of the rejected response.
+
+        Returns:
+            bool: Whether the timeline is finished.
+        """
+
+        endpoint = self._endpoint.value
+
+        if status != STATUS_RATE_LIMITED:
+            self.error = GraphQLRequestError(status=status, operation=endpoint)
+            return True
+
+        if self._rate_limit_retries >= self._rate_limiter.max_retries:
+            self.error = RateLimitError(endpoint=endpoint, retries=self._rate_limit_retries)
+            return True
+
+        if self._metrics is not None:
+            self._metrics.increment('retries', endpoint=endpoint, reason='rate_limited')
+
+        self._rate_limiter.rate_limited(endpoint=endpoint)
+        self._resume_at = time.monotonic() + self._rate_limiter.backoff(
+            endpoint=endpoint, attempt=self._rate_limit_retries
+        )
+        self._rate_limit_retries += 1
+        return False
+
+    def _navigate(self) -> None:
+        """
+        Navigate to the timeline, returning as soon as the navigation has been committed, or
+        put it off while the rate limiter asks to wait.
+        """
+
+        delay = self._rate_limiter.delay(endpoint=self._endpoint.value)
+        if delay > 0:
+            self._resume_at = time.monotonic() + delay
+            return
+
+        self._rate_limiter.wait(endpoint=self._endpoint.value)
+        self.page.goto(self._url, wait_until='commit', timeout=self._timeout * 1000)
+        self._deadline = time.monotonic() + self._timeout
+
+    def _scroll(self) -> None:
+        """
+        Scroll to the bottom of the page to trigger the next timeline page, or put it off
+        while the rate limiter asks to wait.
+        """
+
+        delay = self._rate_limiter.delay(endpoint=self._endpoint.value)
+        if delay > 0:
+            self._resume_at = time.monotonic() + delay
+            return
+
+        self._rate_limiter.wait(endpoint=self._endpoint.value)
+        self.page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
+        self._deadline = time.monotonic() + self._scroll_timeout
@@ -0,0 +1,447 @@
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+import asyncio
+import itertools
+import os
+from urllib.parse import urlparse
+
+from playwright.async_api import Page, Response, TimeoutError
+
+from twitfetch.errors import (
+    InvalidLoginError,
+    LoginTimeoutError,
+    PageLoadTimeoutError,
+    ResponseTimeoutError
+)
+from twitfetch._utils import (
+    convert_string_to_datetime,
+    decode_json,
+    generate_url
+)
+from twitfetch._async_browser import AsyncPlaywrightBrowser
+from twitfetch._callback import endpoint_matcher
+from twitfetch._json import get_decoder
+from twitfetch._paginate import TimelinePaginator
+from twitfetch._profile import BrowserProfile
+from twitfetch._ratelimit import RateLimiter
+from twitfetch._replay import har_path
+from twitfetch._session import SessionStore
+from twitfetch._data_structures import FetchResult
+from twitfetch._parse import (
+    AsyncPageDOM,
+    find_entry_newest_ids,
+    ParseDOM,
+    parse_tweets_response
+)
+from twitfetch.typing import FetchResults, Tweets
+from twitfetch._constants import (
+    Endpoints,
+    LOGIN,
+    LOGIN_ERROR,
+    LOGIN_STEP_MARKER,
+    SCROLL_RESPONSE_TIMEOUT,
+    SCROLL_RETRIES,
+    URL_TWITTER,
+    URL_TWITTER_HOME,
+    URL_TWITTER_LISTS,
+    URL_TWITTER_LOGIN
+)
+
+class AsyncTwitFetch:
+    """
+    Asyncio counterpart of TwitFetch built on playwright.async_api. Each timeline is
+    loaded on a page of its own, so many timelines can be fetched concurrently.
+
+    Call start(), or use the instance as an async context manager, before fetching.
+
+    Args:
+        login_username (str): .
+        login_password (str): .
+        time_start (Optional[str]): .
+        time_end (Optional[str]): .
+        tweet_limit (int): .
+        headless (bool): .
+        session_dir (Optional[str]): Directory where logged in sessions are saved and reused,
+            sessions are not saved if None.
+        timeout (float): Seconds to wait for a login step, a page to load or the first page
+            of a timeline.
+        profile (Optional[BrowserProfile]): Lightweight browser profile blocking media, fonts,
+            stylesheets and third party hosts, nothing is blocked if None.
+        rate_limiter (Optional[RateLimiter]): The rate limiter pacing the GraphQL requests of
+            the session, one honoring the rate limit headers is created if None.
+        json_backend (Optional[str]): The JSON backend decoding GraphQL responses, one of
+            'orjson', 'msgspec' or 'json', the fastest installed one is used if None.
+        record_dir (Optional[str]): Directory where every request is recorded to a HAR archive,
+            nothing is recorded if None.
+        replay_dir (Optional[str]): Directory recorded by a previous run whose HAR archive
+            serves every request instead of Twitter, requests go to Twitter if None.
+
+    Attributes:
+        _login_username (str): .
+        _login_password (str): .
+        _tweet_limit (int): .
+        _time_start_datetime (datetime): .
+        _time_end_datetime (datetime): .
+        _headless (bool): .
+        _session_store (Optional[SessionStore]): .
+        _timeout (float): .
+        _profile (Optional[BrowserProfile]): .
+        _rate_limiter (RateLimiter): .
+        _browser (Optional[AsyncPlaywrightBrowser]): .
+        _decode (JSONDecoder): .
+        _record_dir (Optional[str]): .
+        _replay_dir (Optional[str]): .
+    """
+    def __init__(
+        self,
+        login_username: str,
+        login_password: str,
+        time_start: Optional[str] = None,
+        time_end: Optional[str] = None,
+        tweet_limit: int = 10,
+        headless: bool = False,
+        session_dir: Optional[str] = None,
+        timeout: float = 20,
+        profile: Optional[BrowserProfile] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        json_backend: Optional[str] = None,
+        record_dir: Optional[str] = None,
+        replay_dir: Optional[str] = None
+    ):
+        self._login_username = login_username
+        self._login_password = login_password
+        self._tweet_limit = tweet_limit
+        self._headless = headless
+        self._timeout = timeout
+        self._profile = profile
+        self._rate_limiter = RateLimiter() if rate_limiter is None else rate_limiter
+        self._decode = get_decoder(backend=json_backend)
+        self._record_dir = record_dir
+        self._replay_dir = replay_dir
+
+        # Convert times into datetime
+        self._time_start_datetime = convert_string_to_datetime(date=time_start)
+        self._time_end_datetime = convert_string_to_datetime(date=time_end)
+
+        self._session_store = None if session_dir is None else SessionStore(directory=session_dir)
+        self._browser: Optional[AsyncPlaywrightBrowser] = None
+
+    async def __aenter__(self) -> 'AsyncTwitFetch':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        """
+        Launch the browser and login, reusing the saved session when still valid.
+        """
+
+        storage_state = None
+        if self._session_store is not None:
+            storage_state = self._session_store.load(username=self._login_username)
+
+        if self._record_dir is not None:
+            os.makedirs(self._record_dir, exist_ok=True)
+
+        self._browser = AsyncPlaywrightBrowser(
+            headless=self._headless,
+            timeout=int(self._timeout * 1000),
+            storage_state=storage_state,
+            profile=self._profile,
+            record_har=None if self._record_dir is None else har_path(directory=self._record_dir),
+            replay_har=None if self._replay_dir is None else har_path(directory=self._replay_dir)
+        )
+
+        # __aexit__ does not run when __aenter__ fails, the browser is closed again here
+        try:
+            await self._browser.start()
+
+            if storage_state is None or not await self._session_valid():
+                await self._browser.clear_storage_state()
+                await self.twitter_login()
+
+                if self._session_store is not None:
+                    self._session_store.save(
+                        username=self._login_username,
+                        state=await self._browser.storage_state()
+                    )
+        except BaseException:
+            await self.close()
+            raise
+
+    async def close(self) -> None:
+        """
+        Close the browser.
+        """
+
+        if self._browser is not None:
+            await self._browser.exit_browser()
+            self._browser = None
+
+    async def list_latest_tweets(self, list_id: str, users: Optional[List[str]] = None) -> Tweets:
+        """
+        Access the ListLatestTweetsTimeline endpoint to grab latest tweets from a Twitter list.
+
+        Args:
+            list_id (str): A string being the ID of the Twitter list.
+            users (Optional[List[str]]): The screen names of the accounts to keep tweets from,
+                tweets of every list member are kept if None.
+        """
+
+        list_url = generate_url(url=URL_TWITTER_LISTS, path=list_id)
+        tweets = await self._query(
+            url=list_url,
+            endpoint=Endpoints.ListLatestTweetsTimeline,
+            users=users
+        )
+
+        return tweets
+
+    async def user_tweets(self, account: str) -> Tweets:
+        """
+        Access the UserTweets endpoint to grab latest tweets from a Twitter account.
+
+        Args:
+            account (str): A string being the screen name of a Twitter account.
+        """
+
+        account_url = generate_url(url=URL_TWITTER, path=account)
+        tweets = await self._query(
+            url=account_url,
+            endpoint=Endpoints.UserTweets,
+            users=[account]
+        )
+
+        return tweets
+
+    async def user_tweets_many(self, accounts: List[str], concurrency: int = 4) -> FetchResults:
+        """
+        Grab latest tweets from many Twitter accounts concurrently.
+
+        Args:
+            accounts (List[str]): The screen names of the Twitter accounts.
+            concurrency (int): The maximum number of timelines loaded at the same time.
+
+        Returns:
+            FetchResults: The tweets or the error of each account, in the order given.
+        """
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def fetch(account: str) -> FetchResult:
+            async with semaphore:
+                try:
+                    return FetchResult(source=account, tweets=await self.user_tweets(account=account))
+                except Exception as e:
+                    return FetchResult(source=account, error=e)
+
+        return list(await asyncio.gather(*(fetch(account) for account in accounts)))
+
+    async def _session_valid(self) -> bool:
+        """
+        Check whether the browser is logged in by visiting the home timeline.
+
+        Returns:
+            bool: Whether Twitter kept the browser on the home timeline.
+        """
+
+        # Logged out browsers are redirected to the login flow
+        await self._browser.go_to_page(url=URL_TWITTER_HOME)
+        return urlparse(self._browser.page.url).path == urlparse(URL_TWITTER_HOME).path
+
+    async def twitter_login(self) -> None:
+        """
+        Login to Twitter account using information provided in config file.
+        """
+
+        login_pipeline = [
+            self._login_username,
+            self._login_password
+        ]
+
+        timeout = self._timeout * 1000
+        alert_selector = ParseDOM.css_selector(element=LOGIN_ERROR)
+
+        # Go to Twitter login page
+        await self._browser.go_to_page(url=URL_TWITTER_LOGIN)
+
+        # Iterate through login pipeline
+        for step, info in enumerate(login_pipeline):
+            step_name = 'username' if step == 0 else 'password'
+
+            # Wait for the input of this step to render
+            try:
+                await self._browser.wait_for_element(selector=LOGIN.tag, timeout=timeout)
+            except TimeoutError:
+                raise LoginTimeoutError(step=step_name, timeout=self._timeout)
+
+            # Find label within the page, the input may be gone again by now
+            dom = AsyncPageDOM(page=self._browser.page)
+            element = await dom.find_attribute(element=LOGIN)
+
+            if element.attribute_value is None:
+                raise LoginTimeoutError(step=step_name, timeout=self._timeout)
+
+            # Generate CSS selector and mark the input
+            selector = dom.css_selector(element=element)
+            await self._browser.mark_element(selector=selector, marker=LOGIN_STEP_MARKER)
+
+            # Submit, then wait until the input is replaced by the next step or an alert shows up
+            try:
+                await self._browser.type_input(text=info, selector=selector)
+                await self._browser.wait_for_change(
+                    gone=f'[{LOGIN_STEP_MARKER}]',
+                    present=alert_selector,
+                    timeout=timeout
+                )
+            except (TimeoutError, PageLoadTimeoutError):
+                raise LoginTimeoutError(step=step_name, timeout=self._timeout)
+
+            # Check for error element within the page
+            if await AsyncPageDOM(page=self._browser.page).exists(element=LOGIN_ERROR):
+                raise InvalidLoginError()
+
+    async def _browser_pages(self, page: Page, url: str, endpoint: Endpoints) -> AsyncIterator[List[dict]]:
+        """
+        Navigate a page to a timeline and scroll through it, yielding each new GraphQL page.
+
+        Args:
+            page (Page): The page to load the timeline on.
+            url (str): The url to navigate where tweets will be populated.
+            endpoint (Endpoints): The GraphQL endpoint.
+
+        Yields:
+            List[dict]: The GraphQL responses received since the previous page.
+        """
+
+        matches = endpoint_matcher(endpoint=endpoint)
+
+        # Go to account page, the first page of the timeline must arrive
+        try:
+            response = await self._expect_page(
+                page=page,
+                matches=matches,
+                endpoint=endpoint,
+                action=lambda: self._browser.go_to_page(url=url, page=page, wait_for_tweet=True),
+                timeout=self._timeout
+            )
+        except TimeoutError:
+            raise ResponseTimeoutError(endpoint=endpoint.value, timeout=self._timeout)
+
+        while True:
+            yield [decode_json(body=await response.body(), url=response.url, decode=self._decode)]
+
+            # Scroll to the bottom to trigger the next timeline page, retrying in case
+            # the previous page was not rendered yet when scrolling
+            for _ in range(SCROLL_RETRIES + 1):
+                try:
+                    response = await self._expect_page(
+                        page=page,
+                        matches=matches,
+                        endpoint=endpoint,
+                        action=lambda: self._browser.scroll_down(page=page, to_bottom=True),
+                        timeout=SCROLL_RESPONSE_TIMEOUT
+                    )
+                    break
+                except TimeoutError:
+                    continue
+            else:
+                return
+
+    async def _expect_page(
+        self,
+        page: Page,
+        matches: Callable[[Response], bool],
+        endpoint: Endpoints,
+        action: Callable[[], Awaitable[None]],
+        timeout: float
+    ) -> Response:
+        """
+        Trigger a timeline page within the rate limit budget of the endpoint, backing off
+        and triggering it again while Twitter rejects it.
+
+        Args:
+            page (Page): The page the timeline is loaded on.
+            matches (Callable[[Response], bool]): The predicate detecting responses of the endpoint.
+            endpoint (Endpoints): The GraphQL endpoint.
+            action (Callable[[], Awaitable[None]]): The navigation or scroll requesting the page.
+            timeout (float): Seconds to wait for the response.
+
+        Returns:
+            Response: The response holding the timeline page.
+        """
+
+        limiter = self._rate_limiter
+
+        for attempt in itertools.count():
+            # Wait without blocking the timelines loaded on other pages
+            await asyncio.sleep(limiter.delay(endpoint=endpoint.value))
+            limiter.spend(endpoint=endpoint.value)
+
+            async with page.expect_response(matches, timeout=timeout * 1000) as response_info:
+                await action()
+            response = await response_info.value
+
+            backoff = limiter.retry_delay(
+                endpoint=endpoint.value,
+                status=response.status,
+                headers=response.headers,
+                attempt=attempt
+            )
+            if backoff is None:
+                return response
+
+            await asyncio.sleep(backoff)
+
+    def _paginator(self) -> TimelinePaginator:
+        """
+        Create a paginator honoring the tweet limit and time window.
+        """
+
+        return TimelinePaginator(
+            tweet_limit=self._tweet_limit,
+            time_start=self._time_start_datetime,
+            time_end=self._time_end_datetime
+        )
+
+    async def _query(self, url: str, endpoint: Endpoints, users: Optional[List[str]]) -> Tweets:
+        """
+        Given an endpoint, will query GraphQL on a new page and scroll through the timeline
+        until either the tweet limit is reached or the timeline passes the start of the time window.
+
+        Args:
+            url (str): The url to navigate where tweets will be populated.
+            endpoint (Endpoints): The GraphQL endpoint.
+            users (Optional[List[str]]): The screen names of the accounts to keep tweets from.
+
+        Returns:
+            Tweets: The tweets collected across all timeline pages.
+        """
+
+        collected = []
+        paginator = self._paginator()
+        page = await self._browser.new_page()
+
+        try:
+            pages = self._browser_pages(page=page, url=url, endpoint=endpoint)
+            try:
+                async for responses in pages:
+                    tweets = parse_tweets_response(
+                        tweets=responses,
+                        users=users,
+                        do_remove_retweets=True
+                    )
+                    collected.extend(paginator.feed(
+                        tweets=tweets,
+                        newest_ids=find_entry_newest_ids(responses=responses)
+                    ))
+
+                    if paginator.done:
+                        break
+            finally:
+                await pages.aclose()
+        finally:
+            await self._browser.close_page(page=page)
+
+        return collected
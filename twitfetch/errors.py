@@ -2,4 +2,52 @@ class InvalidLoginError(Exception):
     def __init__(self, message: str = 'invalid login info'):
         super().__init__(message)
         self.error_code = 404
-        self.additional_data = "invalid username or password"
\ No newline at end of file
+        self.additional_data = "invalid username or password"
+
+class GraphQLRequestError(Exception):
+    def __init__(self, status: int, operation: str, message: str = 'GraphQL request failed'):
+        super().__init__(f'{message}: {operation} returned {status}')
+        self.error_code = status
+        self.additional_data = operation
+
+class RateLimitError(Exception):
+    def __init__(self, endpoint: str, retries: int, message: str = 'rate limited'):
+        super().__init__(f'{message}: {endpoint} still rejected after {retries} retries')
+        self.error_code = 429
+        self.additional_data = endpoint
+
+class NoSessionAvailableError(Exception):
+    def __init__(self, sessions: int, message: str = 'no session available'):
+        super().__init__(f'{message}: all {sessions} sessions of the pool were evicted')
+        self.error_code = 503
+        self.additional_data = sessions
+
+class ResponseDecodeError(Exception):
+    def __init__(self, url: str, reason: str, message: str = 'response could not be decoded'):
+        super().__init__(f'{message}: {url} ({reason})')
+        self.error_code = 502
+        self.additional_data = url
+
+class LoginTimeoutError(Exception):
+    def __init__(self, step: str, timeout: float, message: str = 'login timed out'):
+        super().__init__(f'{message}: {step} step did not complete within {timeout}s')
+        self.error_code = 408
+        self.additional_data = step
+
+class ResponseTimeoutError(Exception):
+    def __init__(self, endpoint: str, timeout: float, message: str = 'response timed out'):
+        super().__init__(f'{message}: no {endpoint} response within {timeout}s')
+        self.error_code = 408
+        self.additional_data = endpoint
+
+class PageLoadTimeoutError(Exception):
+    def __init__(self, url: str, timeout: float, message: str = 'page load timed out'):
+        super().__init__(f'{message}: {url} did not load within {timeout}s')
+        self.error_code = 408
+        self.additional_data = url
+
+class ResponseDroppedError(Exception):
+    def __init__(self, endpoint: str, dropped: int, message: str = 'responses dropped'):
+        super().__init__(f'{message}: {dropped} {endpoint} responses were lost before being parsed')
+        self.error_code = 500
+        self.additional_data = endpoint
@@ -1,53 +1,65 @@
-from typing import List, Optional
+from collections import deque
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+import itertools
+import sys
 import time
 
-from playwright.sync_api import Response
+from playwright.sync_api import Response, TimeoutError
 
-from twitfetch.errors import InvalidLoginError
+from twitfetch.errors import (
+    InvalidLoginError,
+    LoginTimeoutError,
+    PageLoadTimeoutError,
+    ResponseTimeoutError
+)
 from twitfetch._utils import (
     convert_string_to_datetime,
     generate_url,
     parse_json
 )
+from twitfetch._batch import TweetBatch
 from twitfetch._browser import PlaywrightBrowser
+from twitfetch._browser_manager import BrowserManager
+from twitfetch._cache import ResponseCache
+from twitfetch._callback import endpoint_matcher
+from twitfetch._graphql import GraphQLClient, GraphQLSession
+from twitfetch._json import get_decoder
+from twitfetch._metrics import Metrics, timed
+from twitfetch._paginate import TimelinePaginator
+from twitfetch._profile import BrowserProfile, ResourceStats
+from twitfetch._ratelimit import RateLimiter
+from twitfetch._replay import FixtureRecorder, har_path
+from twitfetch._search import merge_search_results, plan_search, search_url
+from twitfetch._session import SessionStore
+from twitfetch._sinks import TweetSink
+from twitfetch._state import HighWaterMarkStore
+from twitfetch._worker import TimelineWorker
+from twitfetch._data_structures import FetchResult, HighWaterMark, SearchSlice, Tweet
 from twitfetch._parse import (
+    find_entry_newest_ids,
+    find_next_cursor,
+    PageDOM,
     ParseDOM,
+    parse_tweets_batch,
     parse_tweets_response
 )
-from twitfetch.typing import Tweets
+from twitfetch.typing import FetchResults, Tweets
 from twitfetch._constants import (
     Endpoints,
-    GRAPHQL_ENDPOINT,
     LOGIN,
     LOGIN_ERROR,
+    LOGIN_STEP_MARKER,
+    POLL_INTERVAL,
+    SCROLL_RESPONSE_TIMEOUT,
+    SCROLL_RETRIES,
+    SEARCH_SLICE_DAYS,
     URL_TWITTER,
+    URL_TWITTER_HOME,
     URL_TWITTER_LISTS,
     URL_TWITTER_LOGIN
 )
 
-class ResponseCallback:
-    """
-    Callback functionality for detecting GraphQL response.
-    
-    Args:
-        endpoint (Endpoints): The GraphQL endpoint.
-    """
-    def __init__(self, endpoint: Endpoints):
-        self._endpoint = endpoint
-        self.responses: List[Response] = []
-
-    def callback(self, response: Response) -> None:
-        """
-        Callback for interception of GraphQL response.
-
-        Args:
-            response (Response): The response from network request.
-        """
-
-        if GRAPHQL_ENDPOINT in response.url and self._endpoint.value in response.url:
-            if response.status == 200:
-                self.responses.append(response)
-
 class TwitFetch:
     """
     Given a Twitter account, finds and returns all tweets within a specified time period.
@@ -59,6 +71,39 @@ class TwitFetch:
         time_end (Optional[str]): .
         tweet_limit (int): .
         headless (bool): .
+        direct (bool): Whether timelines are requested directly from GraphQL once the
+            operations have been captured from a rendered page.
+        session_dir (Optional[str]): Directory where logged in sessions are saved and reused,
+            sessions are not saved if None.
+        timeout (float): Seconds to wait for a login step, a page to load or the first page
+            of a timeline.
+        state_path (Optional[str]): Path of the SQLite database holding the newest tweet seen
+            per timeline, required by incremental fetches. Once a timeline has been fetched,
+            incremental fetches return every newer tweet regardless of tweet_limit.
+        profile (Optional[BrowserProfile]): Lightweight browser profile blocking media, fonts,
+            stylesheets and third party hosts, nothing is blocked if None.
+        rate_limiter (Optional[RateLimiter]): The rate limiter pacing the GraphQL requests of
+            the session, one honoring the rate limit headers is created if None.
+        json_backend (Optional[str]): The JSON backend decoding GraphQL responses, one of
+            'orjson', 'msgspec' or 'json', the fastest installed one is used if None.
+        record_dir (Optional[str]): Directory where every request is recorded to a HAR archive,
+            and GraphQL bodies and login pages to fixtures, nothing is recorded if None.
+        replay_dir (Optional[str]): Directory recorded by a previous run whose HAR archive
+            serves every request instead of Twitter, requests go to Twitter if None.
+        metrics (Optional[Metrics]): The metrics timing navigation, waits, scrolls, decoding
+            and parsing, and counting responses, bytes, tweets and retries, nothing is
+            measured if None.
+        cache (Optional[ResponseCache]): The cache of decoded timeline pages, repeated reads
+            within its TTL are served without loading the timeline, nothing is cached if None.
+        browser_manager (Optional[BrowserManager]): The manager sharing one Chromium between
+            fetchers and keeping their logged in contexts warm across instances, a browser
+            of its own is started and stopped if None. Chromium is launched with the headless
+            setting and profile switches of the manager, headless is then ignored, while the
+            requests blocked by profile still apply to the context of this instance.
+        recycle_after (Optional[int]): The number of timelines after which the page is
+            replaced by a fresh one, the page is never replaced for this reason if None.
+        max_page_memory (Optional[int]): The bytes of JavaScript heap above which the page
+            is replaced by a fresh one before the next timeline, unbounded if None.
 
     Attributes:
         _login_username (str): .
@@ -70,6 +115,17 @@ class TwitFetch:
         _time_start_datetime (datetime): .
         _time_end_datetime (datetime): .
         _browser (PlaywrightBrowser): .
+        _direct (bool): .
+        _graphql_session (GraphQLSession): .
+        _graphql_client (GraphQLClient): .
+        _session_store (Optional[SessionStore]): .
+        _timeout (float): .
+        _state_store (Optional[HighWaterMarkStore]): .
+        _rate_limiter (RateLimiter): .
+        _decode (JSONDecoder): .
+        _recorder (Optional[FixtureRecorder]): .
+        metrics (Optional[Metrics]): .
+        cache (Optional[ResponseCache]): .
     """
     def __init__(
         self, 
@@ -78,55 +134,489 @@ class TwitFetch:
         time_start: Optional[str] = None,
         time_end: Optional[str] = None,
         tweet_limit: int = 10,
-        headless: bool = False
+        headless: bool = False,
+        direct: bool = False,
+        session_dir: Optional[str] = None,
+        timeout: float = 20,
+        state_path: Optional[str] = None,
+        profile: Optional[BrowserProfile] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        json_backend: Optional[str] = None,
+        record_dir: Optional[str] = None,
+        replay_dir: Optional[str] = None,
+        metrics: Optional[Metrics] = None,
+        cache: Optional[ResponseCache] = None,
+        browser_manager: Optional[BrowserManager] = None,
+        recycle_after: Optional[int] = None,
+        max_page_memory: Optional[int] = None
     ):
         self._login_username = login_username
         self._login_password = login_password
         self._time_start = time_start
         self._time_end = time_end
         self._tweet_limit = tweet_limit
+        self._direct = direct
+        self._timeout = timeout
+        self._rate_limiter = RateLimiter() if rate_limiter is None else rate_limiter
+        self._decode = get_decoder(backend=json_backend)
+        self.metrics = metrics
+        self.cache = cache
 
         # Convert times into datetime
         self._time_start_datetime = convert_string_to_datetime(date=self._time_start)
         self._time_end_datetime = convert_string_to_datetime(date=self._time_end)
 
+        self._state_store = None if state_path is None else HighWaterMarkStore(path=state_path)
+
+        # Load the session saved by a previous run, if any
+        self._session_store = None if session_dir is None else SessionStore(directory=session_dir)
+        storage_state = None
+        if self._session_store is not None:
+            storage_state = self._session_store.load(username=self._login_username)
+
         # Instantiate playwright browser
-        self._browser = PlaywrightBrowser(headless=headless)
+        self._recorder = None if record_dir is None else FixtureRecorder(directory=record_dir)
+        self._browser = PlaywrightBrowser(
+            headless=headless,
+            timeout=int(timeout * 1000),
+            storage_state=storage_state,
+            profile=profile,
+            record_har=None if record_dir is None else har_path(directory=record_dir),
+            replay_har=None if replay_dir is None else har_path(directory=replay_dir),
+            metrics=self.metrics,
+            manager=browser_manager,
+            context_key=self._login_username,
+            recycle_after=recycle_after,
+            max_page_memory=max_page_memory
+        )
+        if self._recorder is not None:
+            self._browser.listen(event='response', handler=self._recorder.callback)
 
-        # Login using account into Twitter
-        self.twitter_login()
+        # Capture credentials and operations from requests made by the Twitter app
+        self._graphql_session = GraphQLSession()
+        self._graphql_client = GraphQLClient(
+            request=self._browser.context.request,
+            session=self._graphql_session,
+            rate_limiter=self._rate_limiter,
+            decode=self._decode,
+            metrics=self.metrics
+        )
+        if self._direct:
+            self._browser.listen(event='request', handler=self._graphql_session.capture)
 
-    def list_latest_tweets(self, list_id: str) -> None:
+        # Login using account into Twitter unless the saved or warm session is still valid,
+        # the browser and state store are closed again if that fails
+        try:
+            if (storage_state is None and not self._browser.warm) or not self._session_valid():
+                self._browser.clear_storage_state()
+                self.twitter_login()
+
+                if self._session_store is not None:
+                    self._session_store.save(
+                        username=self._login_username,
+                        state=self._browser.storage_state()
+                    )
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        """
+        Close the browser, saving the HAR archive when recording, or hand the logged in
+        context back to the browser manager. Closing twice does nothing.
+        """
+
+        self._browser.exit_browser()
+
+        if self._state_store is not None:
+            self._state_store.close()
+            self._state_store = None
+
+    def __enter__(self) -> 'TwitFetch':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def resource_stats(self) -> Optional[ResourceStats]:
+        """
+        Requests let through or blocked by the browser profile since the latest fetch started,
+        None without a profile.
+        """
+
+        blocker = self._browser.resource_blocker
+        return None if blocker is None else blocker.stats
+
+    def list_latest_tweets(
+        self,
+        list_id: str,
+        users: Optional[List[str]] = None,
+        incremental: bool = False
+    ) -> Tweets:
         """
         Access the ListLatestTweetsTimeline endpoint to grab latest tweets from a Twitter list.
         
         Args:
             list_id (str): A string being the ID of the Twitter list.
+            users (Optional[List[str]]): The screen names of the accounts to keep tweets from,
+                tweets of every list member are kept if None.
+            incremental (bool): Whether to only return tweets newer than the previous fetch.
         """
 
-        list_url = generate_url(url=URL_TWITTER_LISTS, path=list_id)
-        response = self._query(url=list_url, endpoint=Endpoints.ListLatestTweetsTimeline)
+        tweets = list(self.iter_list_tweets(list_id=list_id, users=users, incremental=incremental))
+        return tweets
 
-    def user_tweets(self, account: str) -> Tweets:
+    def iter_list_tweets(
+        self,
+        list_id: str,
+        users: Optional[List[str]] = None,
+        incremental: bool = False
+    ) -> Iterator[Tweet]:
+        """
+        Lazily grab latest tweets from a Twitter list, parsing each timeline page as it arrives.
+        No further pages are requested once iteration stops.
+
+        Args:
+            list_id (str): A string being the ID of the Twitter list.
+            users (Optional[List[str]]): The screen names of the accounts to keep tweets from,
+                tweets of every list member are kept if None.
+            incremental (bool): Whether to only return tweets newer than the previous fetch.
+
+        Yields:
+            Tweet: Each tweet, newest first.
+        """
+
+        yield from self._iter_tweets(
+            pages=self._timeline_pages(
+                endpoint=Endpoints.ListLatestTweetsTimeline,
+                source=list_id,
+                open_pages=lambda: self._list_pages(list_id=list_id)
+            ),
+            endpoint=Endpoints.ListLatestTweetsTimeline,
+            users=users,
+            mark_key=(Endpoints.ListLatestTweetsTimeline, list_id) if incremental else None
+        )
+
+    def export_list_tweets(
+        self,
+        list_id: str,
+        sinks: List[TweetSink],
+        users: Optional[List[str]] = None,
+        incremental: bool = False
+    ) -> int:
+        """
+        Stream latest tweets from a Twitter list to sinks, page by page, without holding
+        the whole timeline in memory. The sinks are flushed but left open.
+
+        Args:
+            list_id (str): A string being the ID of the Twitter list.
+            sinks (List[TweetSink]): The sinks every accepted tweet is written to.
+            users (Optional[List[str]]): The screen names of the accounts to keep tweets from,
+                tweets of every list member are kept if None.
+            incremental (bool): Whether to only export tweets newer than the previous fetch.
+
+        Returns:
+            int: The number of tweets exported.
+        """
+
+        return self._export(
+            pages=self._timeline_pages(
+                endpoint=Endpoints.ListLatestTweetsTimeline,
+                source=list_id,
+                open_pages=lambda: self._list_pages(list_id=list_id)
+            ),
+            endpoint=Endpoints.ListLatestTweetsTimeline,
+            users=users,
+            sinks=sinks,
+            mark_key=(Endpoints.ListLatestTweetsTimeline, list_id) if incremental else None
+        )
+
+    def user_tweets(self, account: str, incremental: bool = False) -> Tweets:
         """
         Access the UserTweets endpoint to grab latest tweets from a Twitter account.
 
         Args:
             account (str): A string being the screen name of a Twitter account.
+            incremental (bool): Whether to only return tweets newer than the previous fetch.
         """
 
-        account_url = generate_url(url=URL_TWITTER, path=account)
-        response = self._query(url=account_url, endpoint=Endpoints.UserTweets)
+        tweets = list(self.iter_user_tweets(account=account, incremental=incremental))
+        return tweets
+
+    def iter_user_tweets(self, account: str, incremental: bool = False) -> Iterator[Tweet]:
+        """
+        Lazily grab latest tweets from a Twitter account, parsing each timeline page as it
+        arrives. No further pages are requested once iteration stops.
 
-        # Parse response to extract tweets and details
-        tweets = parse_tweets_response(
-            tweets=response,
+        Args:
+            account (str): A string being the screen name of a Twitter account.
+            incremental (bool): Whether to only return tweets newer than the previous fetch.
+
+        Yields:
+            Tweet: Each tweet, newest first.
+        """
+
+        yield from self._iter_tweets(
+            pages=self._timeline_pages(
+                endpoint=Endpoints.UserTweets,
+                source=account,
+                open_pages=lambda: self._user_pages(account=account)
+            ),
+            endpoint=Endpoints.UserTweets,
             users=[account],
-            do_remove_retweets=True
+            mark_key=(Endpoints.UserTweets, account) if incremental else None
         )
 
-        return tweets
+    def export_user_tweets(self, account: str, sinks: List[TweetSink], incremental: bool = False) -> int:
+        """
+        Stream latest tweets from a Twitter account to sinks, page by page, without holding
+        the whole timeline in memory. The sinks are flushed but left open.
+
+        Args:
+            account (str): A string being the screen name of a Twitter account.
+            sinks (List[TweetSink]): The sinks every accepted tweet is written to.
+            incremental (bool): Whether to only export tweets newer than the previous fetch.
+
+        Returns:
+            int: The number of tweets exported.
+        """
+
+        return self._export(
+            pages=self._timeline_pages(
+                endpoint=Endpoints.UserTweets,
+                source=account,
+                open_pages=lambda: self._user_pages(account=account)
+            ),
+            endpoint=Endpoints.UserTweets,
+            users=[account],
+            sinks=sinks,
+            mark_key=(Endpoints.UserTweets, account) if incremental else None
+        )
     
+    def user_tweets_many(self, accounts: List[str], concurrency: int = 4) -> FetchResults:
+        """
+        Grab latest tweets from many Twitter accounts at once, each on a page of its own
+        within the logged in browser context.
+
+        Args:
+            accounts (List[str]): The screen names of the Twitter accounts.
+            concurrency (int): The maximum number of timelines loaded at the same time.
+
+        Returns:
+            FetchResults: The tweets or the error of each account, in the order given.
+        """
+
+        jobs = [
+            (account, generate_url(url=URL_TWITTER, path=account), Endpoints.UserTweets, [account])
+            for account in accounts
+        ]
+        return self._run_workers(jobs=jobs, concurrency=concurrency)
+
+    def search_tweets(
+        self,
+        account: str,
+        slice_days: float = SEARCH_SLICE_DAYS,
+        concurrency: int = 4
+    ) -> Tweets:
+        """
+        Backfill the tweets of a Twitter account over the time window through the
+        SearchTimeline endpoint, splitting the window into searches loaded at the same time,
+        each on a page of its own.
+
+        Args:
+            account (str): A string being the screen name of a Twitter account.
+            slice_days (float): The days each search covers.
+            concurrency (int): The maximum number of searches loaded at the same time.
+
+        Returns:
+            Tweets: The newest tweets up to the tweet limit, oldest first.
+        """
+
+        slices = plan_search(
+            account=account,
+            time_start=self._time_start_datetime,
+            time_end=self._time_end_datetime,
+            slice_days=slice_days
+        )
+
+        results = self._run_workers(
+            jobs=[
+                (search.query, search_url(query=search.query), Endpoints.SearchTimeline, [account])
+                for search in slices
+            ],
+            concurrency=concurrency
+        )
+
+        # A missing slice would leave a silent gap in the backfill
+        for result in results:
+            if result.error is not None:
+                raise result.error
+
+        return merge_search_results(
+            results=[result.tweets for result in results],
+            tweet_limit=self._tweet_limit
+        )
+
+    def search_slice(self, search: SearchSlice, account: str) -> Tweets:
+        """
+        Grab the tweets of a single search of a backfill planned by plan_search.
+
+        Args:
+            search (SearchSlice): The search.
+            account (str): A string being the screen name of the Twitter account searched.
+
+        Returns:
+            Tweets: The tweets found, newest first.
+        """
+
+        url = search_url(query=search.query)
+        pages = self._timeline_pages(
+            endpoint=Endpoints.SearchTimeline,
+            source=search.query,
+            open_pages=lambda: self._browser_pages(url=url, endpoint=Endpoints.SearchTimeline)
+        )
+        return list(self._iter_tweets(pages=pages, endpoint=Endpoints.SearchTimeline, users=[account]))
+
+    def _run_workers(
+        self,
+        jobs: List[Tuple[str, str, Endpoints, Optional[List[str]]]],
+        concurrency: int
+    ) -> FetchResults:
+        """
+        Load timelines at the same time, each on a page of its own within the logged in
+        browser context. Timelines whose pages are all fresh in the cache are served from it,
+        and the pages the workers load are cached.
+
+        Args:
+            jobs (List[Tuple[str, str, Endpoints, Optional[List[str]]]]): The source, url,
+                GraphQL endpoint and accounts to keep tweets from of each timeline.
+            concurrency (int): The maximum number of timelines loaded at the same time.
+
+        Returns:
+            FetchResults: The tweets or the error of each timeline, in the order given.
+        """
+
+        # Results are kept per job, the same source may be given twice
+        results = [FetchResult(source=source) for source, _, _, _ in jobs]
+        pending = deque()
+        assigned: Dict[TimelineWorker, int] = {}
+
+        for index, (source, url, endpoint, users) in enumerate(jobs):
+            tweets = self._cached_tweets(endpoint=endpoint, source=source, users=users)
+            if tweets is None:
+                pending.append((index, (source, url, endpoint, users)))
+            else:
+                results[index].tweets = tweets
+
+        workers = [
+            TimelineWorker(
+                page=self._browser.new_page(),
+                scroll_timeout=SCROLL_RESPONSE_TIMEOUT,
+                scroll_retries=SCROLL_RETRIES,
+                rate_limiter=self._rate_limiter,
+                decode=self._decode,
+                metrics=self.metrics,
+                cache=self.cache
+            )
+            for _ in range(min(max(1, concurrency), len(pending)))
+        ]
+        active: List[TimelineWorker] = []
+
+        try:
+            while pending or active:
+                # Hand out timelines to idle pages
+                for worker in workers:
+                    if worker in active or not pending:
+                        continue
+
+                    index, (source, url, endpoint, users) = pending.popleft()
+                    try:
+                        worker.start(
+                            source=source,
+                            url=url,
+                            endpoint=endpoint,
+                            users=users,
+                            paginator=self._paginator(),
+                            timeout=self._timeout
+                        )
+                        assigned[worker] = index
+                        active.append(worker)
+                    except Exception as e:
+                        worker.stop()
+                        results[index].error = e
+
+                # Let playwright dispatch the responses of every page
+                self._browser.page.wait_for_timeout(POLL_INTERVAL)
+
+                for worker in active[:]:
+                    try:
+                        finished = worker.poll()
+                    except Exception as e:
+                        worker.error = e
+                        finished = True
+
+                    if finished:
+                        worker.stop()
+                        active.remove(worker)
+                        result = results[assigned.pop(worker)]
+                        result.tweets = worker.tweets
+                        result.error = worker.error
+        finally:
+            for worker in workers:
+                self._browser.close_page(page=worker.page)
+
+        return results
+
+    def _cached_tweets(
+        self,
+        endpoint: Endpoints,
+        source: str,
+        users: Optional[List[str]]
+    ) -> Optional[Tweets]:
+        """
+        Walk a timeline from the cache alone, as far as the paginator needs.
+
+        Args:
+            endpoint (Endpoints): The GraphQL endpoint of the timeline.
+            source (str): The screen name, list ID or search query of the timeline.
+            users (Optional[List[str]]): The screen names of the accounts to keep tweets from.
+
+        Returns:
+            Optional[Tweets]: The accepted tweets, None if a page needed is missing or stale.
+        """
+
+        if self.cache is None:
+            return None
+
+        paginator = self._paginator()
+        tweets = []
+        cursor = None
+
+        while True:
+            page = self.cache.get(endpoint=endpoint.value, source=source, cursor=cursor)
+            if page is None:
+                return None
+
+            parsed = parse_tweets_response(tweets=page, users=users, do_remove_retweets=True)
+            tweets.extend(paginator.feed(tweets=parsed, newest_ids=find_entry_newest_ids(responses=page)))
+
+            cursor = find_next_cursor(response=page[-1], cursor=cursor) if page else None
+            if paginator.done or cursor is None:
+                return tweets
+
+    def _session_valid(self) -> bool:
+        """
+        Check whether the browser is logged in by visiting the home timeline.
+
+        Returns:
+            bool: Whether Twitter kept the browser on the home timeline.
+        """
+
+        # Logged out browsers are redirected to the login flow
+        self._browser.go_to_page(url=URL_TWITTER_HOME)
+        return urlparse(self._browser.page.url).path == urlparse(URL_TWITTER_HOME).path
+
     def twitter_login(self) -> None:
         """
         Login to Twitter account using information provided in config file.
@@ -137,59 +627,418 @@ class TwitFetch:
             self._login_password
         ]
 
-        # Go to Twitter login page and wait some time
+        timeout = self._timeout * 1000
+        alert_selector = ParseDOM.css_selector(element=LOGIN_ERROR)
+
+        # Go to Twitter login page
         self._browser.go_to_page(url=URL_TWITTER_LOGIN)
-        time.sleep(2)
 
         # Iterate through login pipeline
-        for info in login_pipeline:
-            page_source = self._browser.page_to_dom()
-
-            # Parse and find label
-            parser = ParseDOM(page_source=page_source)
-            element = parser.find_attribute(element=LOGIN)
-            time.sleep(2)
-
-            # Generate CSS selector and type in input text
-            selector = parser.css_selector(element=element)
-            self._browser.type_input(text=info, selector=selector)
-            time.sleep(1)
-
-            # Retrieve page source for comparisons
-            time.sleep(3)
-            page_source_new = self._browser.page_to_dom()
-
-            # Check for error element in new page source
-            alerts = ParseDOM(page_source=page_source_new).find_element(
-                element=LOGIN_ERROR
-            )
+        for step, info in enumerate(login_pipeline):
+            step_name = 'username' if step == 0 else 'password'
+
+            # Wait for the input of this step to render
+            try:
+                self._browser.wait_for_element(selector=LOGIN.tag, timeout=timeout)
+            except TimeoutError:
+                raise LoginTimeoutError(step=step_name, timeout=self._timeout)
+
+            # Only serialize the DOM when it has to be saved
+            if self._recorder is not None:
+                self._recorder.record_page(
+                    name=f'login_{step_name}',
+                    page_source=self._browser.page_to_dom()
+                )
+
+            # Find label within the page, the input may be gone again by now
+            dom = PageDOM(page=self._browser.page)
+            element = dom.find_attribute(element=LOGIN)
+
+            if element.attribute_value is None:
+                raise LoginTimeoutError(step=step_name, timeout=self._timeout)
+
+            # Generate CSS selector and mark the input
+            selector = dom.css_selector(element=element)
+            self._browser.mark_element(selector=selector, marker=LOGIN_STEP_MARKER)
+
+            # Submit, then wait until the input is replaced by the next step or an alert shows up
+            try:
+                self._browser.type_input(text=info, selector=selector)
+                self._browser.wait_for_change(
+                    gone=f'[{LOGIN_STEP_MARKER}]',
+                    present=alert_selector,
+                    timeout=timeout
+                )
+            except (TimeoutError, PageLoadTimeoutError):
+                raise LoginTimeoutError(step=step_name, timeout=self._timeout)
 
-            if alerts:
+            # Check for error element within the page
+            if PageDOM(page=self._browser.page).exists(element=LOGIN_ERROR):
                 raise InvalidLoginError()
 
-    def _query(self, url: str, endpoint: Endpoints) -> List[Response]:
+    def _browser_pages(self, url: str, endpoint: Endpoints) -> Iterator[List[dict]]:
         """
-        Given an endpoint, will query and retrieve response from GraphQL.
+        Navigate to a timeline and scroll through it, yielding each new GraphQL page.
 
         Args:
             url (str): The url to navigate where tweets will be populated.
             endpoint (Endpoints): The GraphQL endpoint.
 
+        Yields:
+            List[dict]: The GraphQL responses received since the previous page.
+        """
+
+        matches = endpoint_matcher(endpoint=endpoint)
+        self._browser.recycle_if_needed()
+
+        # Go to account page, the first page of the timeline must arrive
+        try:
+            response = self._expect_page(
+                matches=matches,
+                endpoint=endpoint,
+                action=lambda: self._browser.go_to_page(url=url, wait_for_tweet=True),
+                timeout=self._timeout
+            )
+        except TimeoutError:
+            raise ResponseTimeoutError(endpoint=endpoint.value, timeout=self._timeout)
+
+        while True:
+            yield parse_json(
+                responses=[response],
+                decode=self._decode,
+                metrics=self.metrics,
+                endpoint=endpoint.value
+            )
+
+            # Scroll to the bottom to trigger the next timeline page, retrying in case
+            # the previous page was not rendered yet when scrolling
+            for _ in range(SCROLL_RETRIES + 1):
+                try:
+                    response = self._expect_page(
+                        matches=matches,
+                        endpoint=endpoint,
+                        action=lambda: self._browser.scroll_down(to_bottom=True),
+                        timeout=SCROLL_RESPONSE_TIMEOUT
+                    )
+                    break
+                except TimeoutError:
+                    if self.metrics is not None:
+                        self.metrics.increment('retries', endpoint=endpoint.value, reason='scroll')
+                    continue
+            else:
+                return
+
+    def _expect_page(
+        self,
+        matches: Callable[[Response], bool],
+        endpoint: Endpoints,
+        action: Callable[[], None],
+        timeout: float
+    ) -> Response:
+        """
+        Trigger a timeline page within the rate limit budget of the endpoint, backing off
+        and triggering it again while Twitter rejects it.
+
+        Args:
+            matches (Callable[[Response], bool]): The predicate detecting responses of the endpoint.
+            endpoint (Endpoints): The GraphQL endpoint.
+            action (Callable[[], None]): The navigation or scroll requesting the page.
+            timeout (float): Seconds to wait for the response.
+
         Returns:
-            dict: The GraphQL response as a dictionary.
+            Response: The response holding the timeline page.
+        """
+
+        limiter = self._rate_limiter
+
+        for attempt in itertools.count():
+            limiter.wait(endpoint=endpoint.value)
+
+            with timed(self.metrics, 'response_wait_seconds', endpoint=endpoint.value):
+                with self._browser.page.expect_response(
+                    matches, timeout=timeout * 1000
+                ) as response_info:
+                    action()
+
+            response = response_info.value
+            if self.metrics is not None:
+                self.metrics.increment('responses', endpoint=endpoint.value, status=str(response.status))
+
+            backoff = limiter.retry_delay(
+                endpoint=endpoint.value,
+                status=response.status,
+                headers=response.headers,
+                attempt=attempt
+            )
+            if backoff is None:
+                return response
+
+            if self.metrics is not None:
+                self.metrics.increment('retries', endpoint=endpoint.value, reason='rate_limited')
+            limiter.sleep(backoff)
+
+    def _timeline_pages(
+        self,
+        endpoint: Endpoints,
+        source: str,
+        open_pages: Callable[[], Iterator[List[dict]]]
+    ) -> Iterator[List[dict]]:
         """
+        Open a timeline, through the cache when one is set.
+
+        Args:
+            endpoint (Endpoints): The GraphQL endpoint of the timeline.
+            source (str): The screen name or list ID of the timeline.
+            open_pages (Callable[[], Iterator[List[dict]]]): Opens the timeline from its first page.
+        """
+
+        if self.cache is None:
+            return open_pages()
+        return self.cache.pages(endpoint=endpoint.value, source=source, open_pages=open_pages)
+
+    def _list_pages(self, list_id: str) -> Iterator[List[dict]]:
+        """
+        Open the timeline of a Twitter list, directly from GraphQL when possible.
+        """
+
+        if self._direct and self._graphql_session.ready(Endpoints.ListLatestTweetsTimeline):
+            return self._direct_pages(
+                endpoint=Endpoints.ListLatestTweetsTimeline,
+                variables={'listId': list_id}
+            )
+
+        list_url = generate_url(url=URL_TWITTER_LISTS, path=list_id)
+        return self._browser_pages(url=list_url, endpoint=Endpoints.ListLatestTweetsTimeline)
+
+    def _user_pages(self, account: str) -> Iterator[List[dict]]:
+        """
+        Open the timeline of a Twitter account, directly from GraphQL when possible.
+        """
+
+        if self._direct and self._graphql_session.ready(
+            Endpoints.UserByScreenName, Endpoints.UserTweets
+        ):
+            user_id = self._graphql_client.user_id(screen_name=account)
+            return self._direct_pages(
+                endpoint=Endpoints.UserTweets,
+                variables={'userId': user_id}
+            )
+
+        account_url = generate_url(url=URL_TWITTER, path=account)
+        return self._browser_pages(url=account_url, endpoint=Endpoints.UserTweets)
+
+    def _direct_pages(self, endpoint: Endpoints, variables: dict) -> Iterator[List[dict]]:
+        """
+        Request a timeline directly from GraphQL, yielding each page.
+
+        Args:
+            endpoint (Endpoints): The GraphQL endpoint.
+            variables (dict): The variables identifying the timeline.
+
+        Yields:
+            List[dict]: The GraphQL response of each page.
+        """
+
+        for response in self._graphql_client.pages(endpoint=endpoint, variables=variables):
+            yield [response]
+
+    def _paginator(self, since_id: Optional[int] = None) -> TimelinePaginator:
+        """
+        Create a paginator honoring the tweet limit and time window.
+        """
+
+        # The mark advances to the newest tweet handed out, so a timeline cut short by the
+        # limit would skip the newer tweets past the limit for good
+        return TimelinePaginator(
+            tweet_limit=self._tweet_limit if since_id is None else sys.maxsize,
+            time_start=self._time_start_datetime,
+            time_end=self._time_end_datetime,
+            since_id=since_id
+        )
+
+    def _since_id(self, mark_key: Optional[Tuple[Endpoints, str]]) -> Optional[int]:
+        """
+        Retrieve the newest tweet ID seen by the previous fetch of an incremental timeline.
+        """
+
+        if mark_key is None:
+            return None
+
+        if self._state_store is None:
+            raise ValueError('incremental fetching requires a state_path')
+
+        mark = self._state_store.get(endpoint=mark_key[0].value, source=mark_key[1])
+        return None if mark is None else mark.tweet_id
+
+    def _advance_mark(self, mark_key: Optional[Tuple[Endpoints, str]], newest: Optional[Tweet]) -> None:
+        """
+        Record the newest tweet handed out by an incremental fetch.
+        """
+
+        if mark_key is not None and newest is not None:
+            self._state_store.update(
+                endpoint=mark_key[0].value,
+                source=mark_key[1],
+                mark=HighWaterMark(tweet_id=newest.tweet_id, created=newest.created)
+            )
+
+    def _iter_pages(
+        self,
+        pages: Iterator[List[dict]],
+        endpoint: Endpoints,
+        users: Optional[List[str]],
+        since_id: Optional[int] = None,
+        batches: bool = False
+    ) -> Iterator[Union[Tweets, TweetBatch]]:
+        """
+        Consume timeline pages until either the tweet limit is reached or the timeline
+        passes the start of the time window, yielding the accepted tweets of each page.
+
+        Args:
+            pages (Iterator[List[dict]]): The GraphQL responses of each timeline page.
+            endpoint (Endpoints): The GraphQL endpoint of the timeline.
+            users (Optional[List[str]]): The screen names of the accounts to keep tweets from.
+            since_id (Optional[int]): The newest tweet ID of the previous fetch, when fetching
+                incrementally.
+            batches (bool): Whether pages are parsed into TweetBatch columns rather than Tweets.
+
+        Yields:
+            Union[Tweets, TweetBatch]: The accepted tweets of each page, in timeline order.
+        """
+
+        paginator = self._paginator(since_id=since_id)
+
+        if self._browser.resource_blocker is not None:
+            self._browser.resource_blocker.reset()
+
+        metrics = self.metrics
+        started = time.perf_counter()
+
+        try:
+            for page in pages:
+                # Parse new pages and extract tweets
+                with timed(metrics, 'parse_seconds', endpoint=endpoint.value):
+                    parse = parse_tweets_batch if batches else parse_tweets_response
+                    tweets = parse(tweets=page, users=users, do_remove_retweets=True)
+                    newest_ids = find_entry_newest_ids(responses=page)
+
+                if batches:
+                    accepted = paginator.feed_batch(batch=tweets, newest_ids=newest_ids)
+                else:
+                    accepted = paginator.feed(tweets=tweets, newest_ids=newest_ids)
+
+                if metrics is not None:
+                    metrics.increment('pages', endpoint=endpoint.value)
+                    metrics.increment('tweets', len(accepted), endpoint=endpoint.value)
+                    metrics.observe('responses_per_page', len(page), endpoint=endpoint.value)
+
+                if accepted:
+                    yield accepted
+
+                if paginator.done:
+                    break
+        finally:
+            # Stop navigating or requesting further pages
+            pages.close()
+
+            if metrics is not None:
+                elapsed = time.perf_counter() - started
+                metrics.observe('fetch_seconds', elapsed, endpoint=endpoint.value)
+                if elapsed > 0:
+                    metrics.observe('tweets_per_second', paginator.count / elapsed, endpoint=endpoint.value)
+
+    def _iter_tweets(
+        self,
+        pages: Iterator[List[dict]],
+        endpoint: Endpoints,
+        users: Optional[List[str]],
+        mark_key: Optional[Tuple[Endpoints, str]] = None
+    ) -> Iterator[Tweet]:
+        """
+        Yield the accepted tweets of a timeline one by one.
+
+        Args:
+            pages (Iterator[List[dict]]): The GraphQL responses of each timeline page.
+            endpoint (Endpoints): The GraphQL endpoint of the timeline.
+            users (Optional[List[str]]): The screen names of the accounts to keep tweets from.
+            mark_key (Optional[Tuple[Endpoints, str]]): The endpoint and source of the timeline
+                when fetching incrementally, stopping at the newest tweet of the previous fetch.
+
+        Yields:
+            Tweet: Each accepted tweet.
+        """
+
+        accepted_pages = self._iter_pages(
+            pages=pages,
+            endpoint=endpoint,
+            users=users,
+            since_id=self._since_id(mark_key=mark_key)
+        )
+        newest: Optional[Tweet] = None
+
+        try:
+            for accepted in accepted_pages:
+                for tweet in accepted:
+                    if newest is None or tweet.tweet_id > newest.tweet_id:
+                        newest = tweet
+                    yield tweet
+        finally:
+            accepted_pages.close()
+
+        # Only advance once the whole timeline has been handed out, a timeline cut short by
+        # an error or by the caller is fetched again from the previous mark
+        self._advance_mark(mark_key=mark_key, newest=newest)
+
+    def _export(
+        self,
+        pages: Iterator[List[dict]],
+        endpoint: Endpoints,
+        users: Optional[List[str]],
+        sinks: List[TweetSink],
+        mark_key: Optional[Tuple[Endpoints, str]] = None
+    ) -> int:
+        """
+        Write the accepted tweets of a timeline to sinks as each page is parsed.
+
+        Args:
+            pages (Iterator[List[dict]]): The GraphQL responses of each timeline page.
+            endpoint (Endpoints): The GraphQL endpoint of the timeline.
+            users (Optional[List[str]]): The screen names of the accounts to keep tweets from.
+            sinks (List[TweetSink]): The sinks every accepted tweet is written to.
+            mark_key (Optional[Tuple[Endpoints, str]]): The endpoint and source of the timeline
+                when fetching incrementally, stopping at the newest tweet of the previous fetch.
+
+        Returns:
+            int: The number of tweets written.
+        """
+
+        accepted_pages = self._iter_pages(
+            pages=pages,
+            endpoint=endpoint,
+            users=users,
+            since_id=self._since_id(mark_key=mark_key),
+            batches=True
+        )
+        newest: Optional[Tweet] = None
+        exported = 0
+
+        try:
+            for batch in accepted_pages:
+                for sink in sinks:
+                    sink.write(batch=batch)
 
-        response_callback = ResponseCallback(endpoint=endpoint)
-        self._browser.page.on('response', response_callback.callback)
+                exported += len(batch)
 
-        # Go to account page
-        self._browser.go_to_page(url=url, wait_for_tweet=True)
+                # Only the newest row of the page is materialized
+                index = max(range(len(batch)), key=batch.tweet_ids.__getitem__)
+                if newest is None or batch.tweet_ids[index] > newest.tweet_id:
+                    newest = batch[index]
 
-        # Loop until the response is found
-        while not response_callback.responses:
-            time.sleep(0.2)
+            for sink in sinks:
+                sink.flush()
+        finally:
+            accepted_pages.close()
 
-        # Parse response and extract JSON
-        response = parse_json(responses=response_callback.responses)
-        return response
-        
\ No newline at end of file
+        # Only advance once every tweet has left the sink buffers
+        self._advance_mark(mark_key=mark_key, newest=newest)
+        return exported
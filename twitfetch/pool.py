@@ -0,0 +1,423 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional, TypeVar
+import threading
+import time
+
+from twitfetch.errors import (
+    GraphQLRequestError,
+    InvalidLoginError,
+    LoginTimeoutError,
+    NoSessionAvailableError,
+    RateLimitError
+)
+from twitfetch.fetch import TwitFetch
+from twitfetch._browser_manager import BrowserManager
+from twitfetch._constants import SEARCH_SLICE_DAYS
+from twitfetch._ratelimit import RateLimiter
+from twitfetch._search import merge_search_results, plan_search
+from twitfetch._utils import convert_string_to_datetime
+from twitfetch._data_structures import (
+    Credentials,
+    FetchResult,
+    SessionHealth,
+    SessionState
+)
+from twitfetch.typing import FetchResults, Tweets
+
+T = TypeVar('T')
+
+# Statuses of GraphQL responses rejecting a session that is no longer logged in
+LOCKED_OUT_STATUSES = (401, 403)
+
+# TwitFetch options the pool sets for every session itself
+POOLED_OPTIONS = ('rate_limiter', 'browser_manager')
+
+class _PooledSession:
+    """
+    A TwitFetch session of a pool, owned by a thread of its own since playwright objects
+    can only be used from the thread that created them. The thread keeps its browser
+    running between logins, so that logging in again costs a context rather than a
+    Chromium cold start.
+
+    Args:
+        credentials (Credentials): The login details of the session.
+        options (dict): The keyword arguments passed on to TwitFetch.
+    """
+    def __init__(self, credentials: Credentials, options: dict):
+        self.credentials = credentials
+        self.health = SessionHealth(username=credentials.username)
+        self.rate_limiter = RateLimiter()
+        self.fetch: Optional[TwitFetch] = None
+
+        self._options = options
+        self._browser_manager: Optional[BrowserManager] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='twitfetch-session')
+
+    def submit(self, call: Callable[[TwitFetch], T]) -> 'Future[T]':
+        """
+        Run a call against the TwitFetch instance on the thread of the session.
+        """
+
+        return self._executor.submit(lambda: call(self.fetch))
+
+    def login(self) -> 'Future[None]':
+        """
+        Close the current browser, if any, and login again on the thread of the session.
+        """
+
+        return self._executor.submit(self._login)
+
+    def _login(self) -> None:
+        self._close_fetch()
+
+        if self._browser_manager is None:
+            self._browser_manager = BrowserManager(
+                headless=self._options.get('headless', False),
+                profile=self._options.get('profile')
+            )
+
+        self.fetch = TwitFetch(
+            login_username=self.credentials.username,
+            login_password=self.credentials.password,
+            rate_limiter=self.rate_limiter,
+            browser_manager=self._browser_manager,
+            **self._options
+        )
+
+    def _close_fetch(self) -> None:
+        if self.fetch is not None:
+            self.fetch.close()
+            self.fetch = None
+
+    def _exit_browser(self) -> None:
+        self._close_fetch()
+
+        if self._browser_manager is not None:
+            self._browser_manager.close()
+            self._browser_manager = None
+
+    def close(self) -> None:
+        """
+        Close the browser and stop the thread of the session.
+        """
+
+        self._executor.submit(self._exit_browser).result()
+        self._executor.shutdown()
+
+class TwitFetchPool:
+    """
+    Spreads fetches round-robin across several logged in Twitter accounts, so that throughput
+    is no longer capped by the rate limit budget of a single account.
+
+    Every session logs in, or reuses its saved state, on a thread of its own. Rate limited
+    sessions sit out until their budget resets, sessions that were logged out or locked out
+    are logged in again in the background once the cooldown has passed, and sessions with
+    invalid credentials or too many failures are evicted.
+
+    Args:
+        credentials (List[Credentials]): The login details of each session.
+        cooldown (float): Seconds a locked out session sits out before logging in again.
+        max_failures (int): The number of consecutive failures after which a session is
+            logged in again, or evicted if logging in keeps failing.
+        **options: Keyword arguments passed on to every TwitFetch session, e.g. time_start,
+            tweet_limit, headless, direct, session_dir, state_path or profile. Every session
+            gets a rate limiter and a browser manager of its own, so rate_limiter and
+            browser_manager cannot be passed.
+
+    Attributes:
+        _sessions (List[_PooledSession]): .
+        _cooldown (float): .
+        _max_failures (int): .
+        _next (int): .
+        _condition (threading.Condition): .
+        _options (dict): .
+    """
+    def __init__(
+        self,
+        credentials: List[Credentials],
+        cooldown: float = 900,
+        max_failures: int = 3,
+        **options
+    ):
+        pooled = [option for option in POOLED_OPTIONS if option in options]
+        if pooled:
+            raise ValueError(f"{', '.join(pooled)} cannot be shared by the sessions of a pool")
+
+        self._sessions = [_PooledSession(credentials=creds, options=options) for creds in credentials]
+        self._cooldown = cooldown
+        self._max_failures = max_failures
+        self._next = 0
+        self._condition = threading.Condition()
+        self._options = options
+
+        # Login every session at once and wait for all of them
+        with self._condition:
+            for session in self._sessions:
+                self._login(session=session)
+
+            self._condition.wait_for(lambda: all(
+                session.health.state is not SessionState.LOGGING_IN for session in self._sessions
+            ))
+
+        if not any(session.health.state is SessionState.ACTIVE for session in self._sessions):
+            self.close()
+            raise NoSessionAvailableError(sessions=len(self._sessions))
+
+    def __enter__(self) -> 'TwitFetchPool':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def health(self) -> List[SessionHealth]:
+        """
+        The health of every session of the pool.
+        """
+
+        with self._condition:
+            return [session.health for session in self._sessions]
+
+    def list_latest_tweets(
+        self,
+        list_id: str,
+        users: Optional[List[str]] = None,
+        incremental: bool = False
+    ) -> Tweets:
+        """
+        Grab latest tweets from a Twitter list using the next available session.
+
+        Args:
+            list_id (str): A string being the ID of the Twitter list.
+            users (Optional[List[str]]): The screen names of the accounts to keep tweets from,
+                tweets of every list member are kept if None.
+            incremental (bool): Whether to only return tweets newer than the previous fetch.
+        """
+
+        return self._run(lambda fetch: fetch.list_latest_tweets(
+            list_id=list_id, users=users, incremental=incremental
+        ))
+
+    def user_tweets(self, account: str, incremental: bool = False) -> Tweets:
+        """
+        Grab latest tweets from a Twitter account using the next available session.
+
+        Args:
+            account (str): A string being the screen name of a Twitter account.
+            incremental (bool): Whether to only return tweets newer than the previous fetch.
+        """
+
+        return self._run(lambda fetch: fetch.user_tweets(account=account, incremental=incremental))
+
+    def user_tweets_many(self, accounts: List[str], incremental: bool = False) -> FetchResults:
+        """
+        Grab latest tweets from many Twitter accounts, fetching with every session at once.
+
+        Args:
+            accounts (List[str]): The screen names of the Twitter accounts.
+            incremental (bool): Whether to only return tweets newer than the previous fetch.
+
+        Returns:
+            FetchResults: The tweets or the error of each account, in the order given.
+        """
+
+        def fetch(account: str) -> FetchResult:
+            try:
+                return FetchResult(
+                    source=account,
+                    tweets=self.user_tweets(account=account, incremental=incremental)
+                )
+            except Exception as e:
+                return FetchResult(source=account, error=e)
+
+        with ThreadPoolExecutor(max_workers=max(1, len(self._sessions))) as executor:
+            return list(executor.map(fetch, accounts))
+
+    def search_tweets(self, account: str, slice_days: float = SEARCH_SLICE_DAYS) -> Tweets:
+        """
+        Backfill the tweets of a Twitter account over the time window through the
+        SearchTimeline endpoint, spreading the searches of the window across every session.
+
+        Args:
+            account (str): A string being the screen name of a Twitter account.
+            slice_days (float): The days each search covers.
+
+        Returns:
+            Tweets: The newest tweets up to the tweet limit, oldest first.
+        """
+
+        slices = plan_search(
+            account=account,
+            time_start=convert_string_to_datetime(date=self._options.get('time_start')),
+            time_end=convert_string_to_datetime(date=self._options.get('time_end')),
+            slice_days=slice_days
+        )
+
+        with ThreadPoolExecutor(max_workers=max(1, len(self._sessions))) as executor:
+            results = list(executor.map(
+                lambda search: self._run(lambda fetch: fetch.search_slice(search=search, account=account)),
+                slices
+            ))
+
+        return merge_search_results(results=results, tweet_limit=self._options.get('tweet_limit', 10))
+
+    def close(self) -> None:
+        """
+        Close the browsers of every session.
+        """
+
+        for session in self._sessions:
+            session.close()
+
+    def _run(self, call: Callable[[TwitFetch], T]) -> T:
+        """
+        Run a fetch on the next available session, moving on to another session when the
+        session itself rather than the fetch failed.
+        """
+
+        while True:
+            session = self._acquire()
+
+            try:
+                result = session.submit(call).result()
+            except Exception as e:
+                if not self._record_failure(session=session, error=e):
+                    raise
+                continue
+
+            with self._condition:
+                session.health.failures = 0
+                session.health.fetches += 1
+
+            return result
+
+    def _acquire(self) -> _PooledSession:
+        """
+        Pick the next active session round-robin, waiting while every session sits out.
+        """
+
+        with self._condition:
+            while True:
+                self._recover()
+
+                count = len(self._sessions)
+                for offset in range(count):
+                    session = self._sessions[(self._next + offset) % count]
+                    if session.health.state is SessionState.ACTIVE:
+                        self._next = (self._next + offset + 1) % count
+                        return session
+
+                waiting = [
+                    session.health for session in self._sessions
+                    if session.health.state is not SessionState.INVALID
+                ]
+                if not waiting:
+                    raise NoSessionAvailableError(sessions=count)
+
+                # Sleep until the first session is back, or a login completes
+                available_at = [
+                    health.available_at for health in waiting
+                    if health.state is not SessionState.LOGGING_IN
+                ]
+                timeout = max(0.0, min(available_at) - time.time()) if available_at else None
+                self._condition.wait(timeout=timeout)
+
+    def _recover(self) -> None:
+        """
+        Put back rate limited sessions whose budget has reset and login again locked out
+        sessions whose cooldown has passed. Called with the condition held.
+        """
+
+        now = time.time()
+
+        for session in self._sessions:
+            if session.health.available_at > now:
+                continue
+
+            if session.health.state is SessionState.RATE_LIMITED:
+                session.health.state = SessionState.ACTIVE
+            elif session.health.state is SessionState.LOCKED_OUT:
+                self._login(session=session)
+
+    def _login(self, session: _PooledSession) -> None:
+        """
+        Login a session in the background, updating its health once done. Called with the
+        condition held.
+        """
+
+        session.health.state = SessionState.LOGGING_IN
+        session.login().add_done_callback(
+            lambda future: self._logged_in(session=session, future=future)
+        )
+
+    def _logged_in(self, session: _PooledSession, future: 'Future[None]') -> None:
+        """
+        Record the outcome of logging in a session.
+        """
+
+        error = future.exception()
+
+        with self._condition:
+            health = session.health
+
+            if error is None:
+                health.state = SessionState.ACTIVE
+                health.failures = 0
+            else:
+                health.last_error = error
+                health.failures += 1
+
+                if isinstance(error, InvalidLoginError) or health.failures >= self._max_failures:
+                    health.state = SessionState.INVALID
+                else:
+                    health.state = SessionState.LOCKED_OUT
+                    health.available_at = time.time() + self._cooldown
+
+            self._condition.notify_all()
+
+    def _record_failure(self, session: _PooledSession, error: Exception) -> bool:
+        """
+        Update the health of a session after a failed fetch.
+
+        Args:
+            session (_PooledSession): The session the fetch ran on.
+            error (Exception): The error raised by the fetch.
+
+        Returns:
+            bool: Whether the fetch failed because of the session and should be retried on
+                another session.
+        """
+
+        with self._condition:
+            health = session.health
+            health.last_error = error
+            now = time.time()
+
+            if isinstance(error, RateLimitError):
+                health.state = SessionState.RATE_LIMITED
+                health.available_at = now + max(
+                    session.rate_limiter.delay(endpoint=error.additional_data),
+                    session.rate_limiter.backoff(endpoint=error.additional_data, attempt=0)
+                )
+                return True
+
+            if isinstance(error, InvalidLoginError):
+                health.state = SessionState.INVALID
+                return True
+
+            if isinstance(error, LoginTimeoutError) or (
+                isinstance(error, GraphQLRequestError) and error.error_code in LOCKED_OUT_STATUSES
+            ):
+                health.state = SessionState.LOCKED_OUT
+                health.available_at = now + self._cooldown
+                return True
+
+            # Repeated failures of an otherwise healthy session, e.g. timelines never
+            # loading, usually mean the session was logged out
+            health.failures += 1
+            if health.failures >= self._max_failures:
+                health.failures = 0
+                health.state = SessionState.LOCKED_OUT
+                health.available_at = now
+
+            return False
@@ -0,0 +1,335 @@
+from typing import Iterable, Iterator, List, Optional
+import glob
+import multiprocessing
+import os
+import socket
+import time
+
+from twitfetch.errors import InvalidLoginError, LoginTimeoutError
+from twitfetch.fetch import TwitFetch
+from twitfetch._batch import TweetBatch
+from twitfetch._constants import (
+    JOB_MAX_ATTEMPTS,
+    JOB_RETRY_DELAY,
+    LEASE_SECONDS,
+    QUEUE_POLL_INTERVAL
+)
+from twitfetch._data_structures import (
+    Credentials,
+    Job,
+    JobKind,
+    QueueStats,
+    Tweet,
+    WorkerStats
+)
+from twitfetch._queue import SQLiteWorkQueue, WorkQueue
+from twitfetch._sinks import JSONLSink, TweetSink, read_jsonl
+
+# Errors of the session rather than of a timeline, no further job can succeed after them
+SESSION_ERRORS = (InvalidLoginError, LoginTimeoutError)
+
+def run_worker(
+    queue: WorkQueue,
+    fetch: TwitFetch,
+    sinks: List[TweetSink],
+    worker: str,
+    lease_seconds: float = LEASE_SECONDS,
+    incremental: bool = False,
+    poll_interval: float = QUEUE_POLL_INTERVAL
+) -> WorkerStats:
+    """
+    Export the timelines leased from a work queue until none is left, the loop every worker
+    of a sharded run goes through, whichever process or node it runs on. Jobs are only
+    completed once their tweets have been flushed, so that a job handed out again after a
+    crash loses no tweet, though it may export some twice.
+
+    Args:
+        queue (WorkQueue): The queue of the run.
+        fetch (TwitFetch): The logged in session of the worker.
+        sinks (List[TweetSink]): The sinks every exported tweet is written to.
+        worker (str): The name of the worker, unique within the run.
+        lease_seconds (float): The seconds the worker holds a job, longer than any timeline
+            takes to export.
+        incremental (bool): Whether to only export tweets newer than the previous fetch.
+        poll_interval (float): Seconds to wait while every job left is leased or waiting
+            for a retry.
+
+    Returns:
+        WorkerStats: The throughput of the worker.
+    """
+
+    stats = WorkerStats(worker=worker)
+
+    while True:
+        job = queue.lease(worker=worker, lease_seconds=lease_seconds)
+
+        if job is None:
+            # Jobs leased to other workers come back if those workers die
+            if not queue.stats().outstanding:
+                return stats
+            time.sleep(poll_interval)
+            continue
+
+        started = time.monotonic()
+        try:
+            tweets = _export(fetch=fetch, job=job, sinks=sinks, incremental=incremental)
+        except Exception as e:
+            queue.fail(job=job, error=repr(e))
+            stats.failures += 1
+            if isinstance(e, SESSION_ERRORS):
+                raise
+        else:
+            queue.complete(job=job, tweets=tweets)
+            stats.jobs += 1
+            stats.tweets += tweets
+        finally:
+            stats.seconds += time.monotonic() - started
+            queue.record(stats=stats)
+
+def _export(fetch: TwitFetch, job: Job, sinks: List[TweetSink], incremental: bool) -> int:
+    """
+    Export the timeline of a job, returning the number of tweets exported.
+    """
+
+    if job.kind is JobKind.LIST:
+        return fetch.export_list_tweets(list_id=job.source, sinks=sinks, incremental=incremental)
+    return fetch.export_user_tweets(account=job.source, sinks=sinks, incremental=incremental)
+
+def _work(
+    queue_path: str,
+    worker: str,
+    shard: str,
+    credentials: Credentials,
+    options: dict,
+    lease_seconds: float,
+    incremental: bool,
+    max_attempts: int,
+    retry_delay: float
+) -> None:
+    """
+    Entry point of a worker process, logging in and exporting to a shard of its own.
+    """
+
+    fetch = TwitFetch(
+        login_username=credentials.username,
+        login_password=credentials.password,
+        **options
+    )
+
+    # The queue is only opened once logged in, a failed login leaves nothing open
+    try:
+        with SQLiteWorkQueue(path=queue_path, max_attempts=max_attempts, retry_delay=retry_delay) as queue, \
+                JSONLSink(shard, append=True) as sink:
+            run_worker(
+                queue=queue,
+                fetch=fetch,
+                sinks=[sink],
+                worker=worker,
+                lease_seconds=lease_seconds,
+                incremental=incremental
+            )
+    finally:
+        fetch.close()
+
+class ShardedRunner:
+    """
+    Shards the timelines of a manifest of accounts and lists across worker processes, each
+    logging in with a browser and session of its own, so that ingestion scales past the
+    single core and browser a TwitFetch instance is bound to.
+
+    Workers coordinate through a durable SQLite work queue, so that a run stopped halfway
+    picks up where it left off. Each worker appends the tweets it exports to a JSONL shard
+    of the output directory, read back merged by tweets() and export(). Workers on other
+    nodes run run_worker against a WorkQueue over a store they share.
+
+    Args:
+        queue_path (str): The path of the SQLite database of the work queue.
+        output_dir (str): The directory the shard of every worker is written to.
+        credentials (List[Credentials]): The login details the workers take in turn.
+        workers (Optional[int]): The number of worker processes, one per credentials if None.
+        lease_seconds (float): The seconds a worker holds a job before it is handed out again.
+        max_attempts (int): The number of times a job is leased before it is given up on.
+        retry_delay (float): The seconds before a failed job is retried, doubled on every retry.
+        incremental (bool): Whether to only export tweets newer than the previous fetch.
+        **options: Keyword arguments passed on to the TwitFetch session of every worker,
+            e.g. time_start, tweet_limit, headless or state_path. They are sent to the
+            worker processes, so must be picklable.
+
+    Attributes:
+        queue (SQLiteWorkQueue): The work queue of the run.
+        _queue_path (str): .
+        _output_dir (str): .
+        _credentials (List[Credentials]): .
+        _workers (int): .
+        _lease_seconds (float): .
+        _max_attempts (int): .
+        _retry_delay (float): .
+        _incremental (bool): .
+        _options (dict): .
+    """
+    def __init__(
+        self,
+        queue_path: str,
+        output_dir: str,
+        credentials: List[Credentials],
+        workers: Optional[int] = None,
+        lease_seconds: float = LEASE_SECONDS,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+        retry_delay: float = JOB_RETRY_DELAY,
+        incremental: bool = False,
+        **options
+    ):
+        if not credentials:
+            raise ValueError('a sharded run requires credentials for at least one worker')
+
+        self._queue_path = queue_path
+        self._output_dir = output_dir
+        self._credentials = credentials
+        self._workers = len(credentials) if workers is None else workers
+        self._lease_seconds = lease_seconds
+        self._max_attempts = max_attempts
+        self._retry_delay = retry_delay
+        self._incremental = incremental
+        self._options = options
+
+        os.makedirs(output_dir, exist_ok=True)
+        self.queue = SQLiteWorkQueue(path=queue_path, max_attempts=max_attempts, retry_delay=retry_delay)
+
+    def __enter__(self) -> 'ShardedRunner':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def stats(self) -> QueueStats:
+        """
+        The number of jobs of the run in each state.
+        """
+
+        return self.queue.stats()
+
+    def add(self, accounts: Iterable[str] = (), lists: Iterable[str] = ()) -> int:
+        """
+        Queue the timelines of accounts and lists, queueing finished ones again.
+
+        Args:
+            accounts (Iterable[str]): The screen names of the Twitter accounts.
+            lists (Iterable[str]): The IDs of the Twitter lists.
+
+        Returns:
+            int: The number of jobs queued.
+        """
+
+        queued = self.queue.add(kind=JobKind.USER, sources=accounts)
+        queued += self.queue.add(kind=JobKind.LIST, sources=lists)
+        return queued
+
+    def run(self) -> List[WorkerStats]:
+        """
+        Start the worker processes and wait until every job is done or given up on, or
+        every worker has exited.
+
+        Returns:
+            List[WorkerStats]: The throughput of every worker.
+        """
+
+        # Playwright cannot survive a fork, every worker starts a fresh interpreter
+        context = multiprocessing.get_context('spawn')
+        host = socket.gethostname()
+
+        processes = {}
+        for index in range(self._workers):
+            worker = f'{host}-{index}'
+            processes[worker] = context.Process(
+                target=_work,
+                name=worker,
+                kwargs={
+                    'queue_path': self._queue_path,
+                    'worker': worker,
+                    'shard': os.path.join(self._output_dir, f'{worker}.jsonl'),
+                    'credentials': self._credentials[index % len(self._credentials)],
+                    'options': self._options,
+                    'lease_seconds': self._lease_seconds,
+                    'incremental': self._incremental,
+                    'max_attempts': self._max_attempts,
+                    'retry_delay': self._retry_delay
+                }
+            )
+
+        for process in processes.values():
+            process.start()
+        for process in processes.values():
+            process.join()
+
+        # Hand the jobs of crashed workers to the next run right away
+        for worker, process in processes.items():
+            if process.exitcode != 0:
+                self.queue.release(worker=worker)
+
+        return self.queue.worker_stats()
+
+    def shards(self) -> List[str]:
+        """
+        The paths of the shards of the output directory.
+        """
+
+        return sorted(glob.glob(os.path.join(self._output_dir, '*.jsonl')))
+
+    def tweets(self) -> Iterator[Tweet]:
+        """
+        Lazily read the tweets of every shard, keeping tweets exported twice once.
+
+        Yields:
+            Tweet: Each tweet, shard by shard.
+        """
+
+        for batch in self._batches():
+            yield from batch
+
+    def export(self, sinks: List[TweetSink]) -> int:
+        """
+        Write the tweets of every shard to sinks, keeping tweets exported twice once.
+        The sinks are flushed but left open.
+
+        Args:
+            sinks (List[TweetSink]): The sinks every tweet is written to.
+
+        Returns:
+            int: The number of tweets written.
+        """
+
+        written = 0
+        for batch in self._batches():
+            for sink in sinks:
+                sink.write(batch=batch)
+            written += len(batch)
+
+        for sink in sinks:
+            sink.flush()
+        return written
+
+    def close(self) -> None:
+        """
+        Close the work queue.
+        """
+
+        self.queue.close()
+
+    def _batches(self) -> Iterator[TweetBatch]:
+        """
+        Read the shards in batches, dropping tweets already read.
+        """
+
+        seen = set()
+
+        for shard in self.shards():
+            for batch in read_jsonl(path=shard):
+                indices = []
+                for index, tweet_id in enumerate(batch.tweet_ids):
+                    if tweet_id not in seen:
+                        seen.add(tweet_id)
+                        indices.append(index)
+
+                if indices:
+                    yield batch if len(indices) == len(batch) else batch.take(indices=indices)
@@ -1,5 +1,6 @@
 from typing import List
 
-from twitfetch._data_structures import Tweet
+from twitfetch._data_structures import FetchResult, Tweet
 
-Tweets = List[Tweet]
\ No newline at end of file
+Tweets = List[Tweet]
+FetchResults = List[FetchResult]